@@ -0,0 +1,81 @@
+"""
+Import-time profile of the login screen and the role dashboards (python -X importtime).
+
+Run from the project root:
+
+    python -m benchmarks.import_profile [--runs 5] [--top 15]
+
+Every target is imported in a fresh interpreter, so each figure is a cold import. "Login
+screen" is what main.py needs before the login form can paint; the dashboard rows show what
+each role's dashboard adds on top of it when it is loaded on demand or by the warm-up.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# name -> statement run under -X importtime
+TARGETS = {
+    "Login screen": "import pages.login",
+    "Doctor dashboard": "import pages.login, pages.dashboards.dr",
+    "HR dashboard": "import pages.login, pages.dashboards.hr",
+    "Admin dashboard": "import pages.login, pages.dashboards.admin",
+}
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_import(statement: str) -> list:
+    """Run `statement` in a fresh interpreter; return [(module, self_us, cumulative_us)] in import order"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed")
+    modules = []
+    for line in result.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def total_ms(modules: list) -> float:
+    # Top-level imports are the entries without indentation; their cumulative times add up to the total
+    return sum(cumulative for name, _, cumulative in modules if not name.startswith("  ")) / 1000
+
+
+def run(runs: int = 5, top: int = 15) -> dict:
+    results = {}
+    for name, statement in TARGETS.items():
+        try:
+            samples = [profile_import(statement) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"\n{name}: {e}")
+            continue
+        totals = [total_ms(modules) for modules in samples]
+        results[name] = {"median_ms": statistics.median(totals), "min_ms": min(totals), "modules": samples[0]}
+        print(f"\n{name}  ({statement})")
+        print(f"  total: {results[name]['median_ms']:8.1f} ms median, {results[name]['min_ms']:.1f} ms best of {runs}")
+
+    login = results.get("Login screen")
+    if login:
+        print("\nSlowest modules for the login screen (cumulative, first run):")
+        for module, self_us, cumulative_us in sorted(login["modules"], key=lambda m: -m[2])[:top]:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:7.1f} ms self  {module.strip()}")
+        for name, result in results.items():
+            if name != "Login screen":
+                print(f"{name} adds {result['median_ms'] - login['median_ms']:.1f} ms when loaded")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile cold import time of the login screen and dashboards")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per target (default: 5)")
+    parser.add_argument("--top", type=int, default=15, help="slowest login-screen modules to list (default: 15)")
+    args = parser.parse_args()
+    run(args.runs, args.top)
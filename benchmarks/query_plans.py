@@ -0,0 +1,141 @@
+"""
+EXPLAIN plans and timings for the hot queries, with and without their secondary index.
+
+Run from the project root against a populated database:
+
+    python -m benchmarks.query_plans [--runs 20]
+
+"Before" forces the optimizer to ignore the index (IGNORE INDEX), "after" lets it choose,
+so both columns are measured on the same data without dropping anything.
+"""
+import argparse
+import statistics
+import time
+
+from database import get_connection
+
+# Each case: the index under test, and a query whose {hint} follows the indexed table alias
+CASES = [
+    {
+        "name": "Doctor's appointments, newest first",
+        "index": "idx_appointments_doctor_date",
+        "sql": """
+            SELECT a.id, a.appointment_date, a.status FROM appointments a {hint}
+            WHERE a.doctor_id = %s ORDER BY a.appointment_date DESC
+        """,
+        "params": lambda s: (s["doctor_id"],),
+    },
+    {
+        "name": "Appointments from today onwards",
+        "index": "idx_appointments_date",
+        "sql": """
+            SELECT a.id, a.appointment_date FROM appointments a {hint}
+            WHERE a.appointment_date >= CURDATE() ORDER BY a.appointment_date LIMIT 50
+        """,
+        "params": lambda s: (),
+    },
+    {
+        "name": "Patients by status, newest first",
+        "index": "idx_patients_status_created",
+        "sql": """
+            SELECT p.id, p.full_name, p.created_at FROM patients p {hint}
+            WHERE p.status = %s ORDER BY p.created_at DESC LIMIT 24
+        """,
+        "params": lambda s: (s["status"],),
+    },
+    {
+        "name": "Doctor's patients by status",
+        "index": "idx_patients_doctor_status",
+        "sql": """
+            SELECT p.id, p.full_name FROM patients p {hint}
+            WHERE p.assigned_doctor = %s AND p.status = %s
+        """,
+        "params": lambda s: (s["doctor_id"], s["status"]),
+    },
+]
+
+
+def sample_values(cursor) -> dict:
+    """Pick realistic filter values from the data: the busiest doctor and most common status"""
+    cursor.execute("SELECT doctor_id FROM appointments GROUP BY doctor_id ORDER BY COUNT(*) DESC LIMIT 1")
+    row = cursor.fetchone()
+    doctor_id = row[0] if row else ""
+    cursor.execute("SELECT status FROM patients GROUP BY status ORDER BY COUNT(*) DESC LIMIT 1")
+    row = cursor.fetchone()
+    status = row[0] if row else "Pending"
+    return {"doctor_id": doctor_id, "status": status}
+
+
+def index_exists(cursor, index_name: str) -> bool:
+    cursor.execute("""
+    SELECT COUNT(*) FROM information_schema.statistics
+    WHERE table_schema = DATABASE() AND index_name = %s
+    """, (index_name,))
+    return cursor.fetchone()[0] > 0
+
+
+def explain(cursor, sql: str, params) -> list:
+    cursor.execute("EXPLAIN " + sql, params)
+    columns = [c[0] for c in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def time_query(cursor, sql: str, params, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+
+
+def format_plan(plan: list) -> str:
+    return "; ".join(
+        f"{row.get('table')}: type={row.get('type')} key={row.get('key')} rows={row.get('rows')} {row.get('Extra') or ''}".strip()
+        for row in plan
+    )
+
+
+def run(runs: int = 20) -> list:
+    """Measure every case. Returns one result dict per case (also printed as a report)."""
+    conn = get_connection()
+    if conn is None:
+        print("Database connection failed")
+        return []
+    cursor = conn.cursor()
+    results = []
+    try:
+        samples = sample_values(cursor)
+        for case in CASES:
+            params = case["params"](samples)
+            after_sql = case["sql"].format(hint="")
+            result = {"name": case["name"], "index": case["index"]}
+            if index_exists(cursor, case["index"]):
+                before_sql = case["sql"].format(hint=f"IGNORE INDEX ({case['index']})")
+                result["before_plan"] = explain(cursor, before_sql, params)
+                result["before"] = time_query(cursor, before_sql, params, runs)
+            else:
+                # Index not created yet: the default plan is the "before" picture
+                before_sql = None
+            result["after_plan"] = explain(cursor, after_sql, params)
+            result["after"] = time_query(cursor, after_sql, params, runs)
+            results.append(result)
+
+            print(f"\n{case['name']}  [{case['index']}]")
+            if before_sql is None:
+                print("  index missing - run the migrations to compare")
+            else:
+                print(f"  before: {result['before']['median_ms']:8.2f} ms  {format_plan(result['before_plan'])}")
+            print(f"  after:  {result['after']['median_ms']:8.2f} ms  {format_plan(result['after_plan'])}")
+    finally:
+        cursor.close()
+        conn.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare query plans with and without secondary indexes")
+    parser.add_argument("--runs", type=int, default=20, help="timed executions per query (default: 20)")
+    args = parser.parse_args()
+    run(args.runs)
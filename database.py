@@ -1,117 +1,91 @@
+import re
+import threading
 import mysql.connector
 from mysql.connector import Error
+from utils.db_pool import ConnectionPool, PoolTimeoutError
+from utils.cache import TTLCache
+from migrations import run_migrations
+
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",
+    "password": "",
+    "database": "nexacare_db",
+}
+
+# Connection pool settings (see configure_pool)
+POOL_CONFIG = {
+    "size": 5,                 # connections kept open between requests
+    "max_overflow": 5,         # extra connections allowed under burst load
+    "idle_timeout": 300,       # seconds before an idle connection is closed
+    "health_check_after": 30,  # idle seconds before a connection is pinged on checkout
+    "timeout": 10,             # seconds to wait for a free connection
+}
+
+# Allowed values of the patients.status / patients.visit_type ENUM columns
+PATIENT_STATUSES = ['Pending', 'Scheduled', 'Completed', 'Cancelled', 'No Show']
+VISIT_TYPES = ['New Patient', 'Follow-up', 'Walk-in']
+
+# Reference data (doctors, HR staff, enum values) is cached in-process for this many seconds;
+# writes through this module and models.user invalidate it immediately
+REFERENCE_CACHE_TTL = 60
+reference_cache = TTLCache(ttl=REFERENCE_CACHE_TTL)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _open_connection():
+    return mysql.connector.connect(**DB_CONFIG)
+
+def configure_pool(**settings):
+    """
+    Override pool settings (size, max_overflow, idle_timeout, health_check_after, timeout).
+    Must be called before the first get_connection(); an existing pool is disposed.
+    """
+    global _pool
+    unknown = set(settings) - set(POOL_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown pool settings: {', '.join(sorted(unknown))}")
+    with _pool_lock:
+        POOL_CONFIG.update(settings)
+        if _pool is not None:
+            _pool.dispose()
+            _pool = None
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(_open_connection, **POOL_CONFIG)
+    return _pool
+
+def get_pool_stats() -> dict:
+    """Pool counters: checkouts, in_use, peak_in_use, wait times, created/discarded connections"""
+    return _get_pool().stats()
 
 def get_connection():
+    # Borrow a pooled connection; conn.close() returns it to the pool
     try:
-        connection = mysql.connector.connect(
-            host="localhost",
-            user="root",
-            password="",  
-            database="nexacare_db"
-        )
-        return connection
-    except Error as e:
+        return _get_pool().acquire()
+    except (Error, PoolTimeoutError) as e:
         print(f"Error connecting to MariaDB: {e}")
         return None
 
 def init_db():
-    # Create the database and tables with correct schema
+    # Bring the schema up to date and seed the initial accounts
     try:
         conn = get_connection()
         if conn is None:
             print("Database connection failed")
             return
-        cursor = conn.cursor()
-
-        # Create doctors table (minimal example, expand as needed)
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS doctors (
-            user_id VARCHAR(16) PRIMARY KEY,
-            first_name VARCHAR(100),
-            last_name VARCHAR(100)
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-        """)
-
-        # Create hrs table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS hrs (
-            user_id VARCHAR(16) PRIMARY KEY,
-            first_name VARCHAR(100) NOT NULL,
-            last_name VARCHAR(100) NOT NULL,
-            email VARCHAR(100) NOT NULL UNIQUE,
-            password VARCHAR(255) NOT NULL,
-            is_verified BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            CONSTRAINT chk_hr_names CHECK (LENGTH(first_name) >= 2 AND LENGTH(last_name) >= 2),
-            CONSTRAINT chk_hr_email CHECK (email LIKE '%@nexacare.med'),
-            CONSTRAINT chk_hr_password CHECK (LENGTH(password) >= 8)
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-        """)
-
-        # Create patients table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS patients (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            patient_code VARCHAR(20) UNIQUE,
-            full_name VARCHAR(100) NOT NULL,
-            birthdate DATE NOT NULL,
-            gender ENUM('Male', 'Female', 'Other', 'Prefer not to say') NOT NULL,
-            civil_status ENUM('Single', 'Married', 'Separated', 'Divorced', 'Widowed', 'Other') NOT NULL,
-            phone VARCHAR(20) NOT NULL,
-            address TEXT NOT NULL,
-            emergency_contact_name VARCHAR(100) NOT NULL,
-            emergency_contact_phone VARCHAR(20) NOT NULL,
-            visit_type ENUM('New Patient', 'Follow-up', 'Walk-in') NOT NULL DEFAULT 'New Patient',
-            assigned_doctor VARCHAR(16),
-            visit_date DATETIME,
-            insurance_provider VARCHAR(100),
-            referral_source ENUM('Walk-in', 'Friend', 'Facebook', 'Other'),
-            allergies JSON,
-            chronic_illnesses JSON,
-            current_medications JSON,
-            remarks TEXT,
-            status ENUM('Pending', 'Scheduled', 'Completed', 'Cancelled', 'No Show') NOT NULL DEFAULT 'Pending',
-            photo_path VARCHAR(255),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            CONSTRAINT chk_patient_name CHECK (LENGTH(full_name) >= 2),
-            CONSTRAINT chk_patient_phone CHECK (LENGTH(phone) >= 7),
-            CONSTRAINT fk_patient_doctor FOREIGN KEY (assigned_doctor) REFERENCES doctors(user_id) ON DELETE SET NULL ON UPDATE CASCADE
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-        """)
 
-        # Create appointments table with ON DELETE CASCADE
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS appointments (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            patient_id INT NOT NULL,
-            doctor_id VARCHAR(16) NOT NULL,
-            appointment_date DATETIME NOT NULL,
-            consultation_type VARCHAR(50) NOT NULL,
-            status VARCHAR(20) NOT NULL DEFAULT 'Scheduled',
-            notes TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (patient_id) REFERENCES patients(id) ON DELETE CASCADE ON UPDATE CASCADE,
-            FOREIGN KEY (doctor_id) REFERENCES doctors(user_id) ON DELETE CASCADE ON UPDATE CASCADE
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-        """)
-
-        # Create admins table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS admins (
-            user_id VARCHAR(16) PRIMARY KEY,
-            first_name VARCHAR(100) NOT NULL,
-            last_name VARCHAR(100) NOT NULL,
-            email VARCHAR(100) NOT NULL UNIQUE,
-            password VARCHAR(255) NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            CONSTRAINT chk_admin_names CHECK (LENGTH(first_name) >= 2 AND LENGTH(last_name) >= 2),
-            CONSTRAINT chk_admin_email CHECK (email LIKE '%@nexacare.med'),
-            CONSTRAINT chk_admin_password CHECK (LENGTH(password) >= 8)
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
-        """)
-
-        conn.commit()
-        print("Database and tables created successfully.")
+        # Apply pending schema migrations (a single version check when already current)
+        version, applied = run_migrations(conn)
+        if applied:
+            print(f"Database schema migrated to version {version}.")
+        else:
+            print(f"Database schema is up to date (version {version}).")
 
         # Create initial admin and HR accounts
         admin_success, admin_msg = create_initial_admin()
@@ -122,37 +96,23 @@ def init_db():
         print(f"Error initializing database: {e}")
     finally:
         if conn and conn.is_connected():
-            cursor.close()
             conn.close()
 
-def generate_user_id(role: str) -> str:
-    try:
-        conn = get_connection()
-        if conn is None:
-            return None
-        cursor = conn.cursor()
-        prefix = "D" if role == "Doctor" else ("H" if role == "HR" else "A")
-        year = "2025"
-        table = "doctors" if role == "Doctor" else ("hrs" if role == "HR" else "admins")
-        cursor.execute(f"SELECT user_id FROM {table} ORDER BY user_id DESC LIMIT 1")
-        row = cursor.fetchone()
-        next_num = 1
-        if row and row[0]:
-            # Extract the numeric part from the user_id
-            try:
-                last_num = int(row[0][5:])
-                next_num = last_num + 1
-            except Exception:
-                next_num = 1
-        user_id = f"{year}{prefix}{next_num:04d}"
-        return user_id
-    except Exception as e:
-        print(f"Error generating user ID: {e}")
-        return None
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+STAFF_ID_PREFIXES = {"Doctor": "D", "HR": "H", "Admin": "A"}
+STAFF_TABLES = {"Doctor": "doctors", "HR": "hrs", "Admin": "admins"}
+
+def next_staff_id(cursor, role: str, year: int = None) -> str:
+    """
+    Allocate the next staff ID for `role` in `year` (default: current year), e.g. 2026D0007.
+    Runs on the caller's cursor so the allocation commits or rolls back with the insert.
+    Counters of IDs issued before counters existed are seeded by migration m0010; a role/year
+    without one starts at 1, which the upsert in next_counter_value creates.
+    """
+    import datetime
+    prefix = STAFF_ID_PREFIXES.get(role, "A")
+    year = year or datetime.date.today().year
+    id_prefix = f"{year}{prefix}"
+    return f"{id_prefix}{next_counter_value(cursor, f'staff_{id_prefix}'):04d}"
 
 def create_user(first_name: str, last_name: str, email: str, password: str, role: str, 
                 maiden_name: str = None, nickname: str = None, 
@@ -180,11 +140,10 @@ def create_user(first_name: str, last_name: str, email: str, password: str, role
         if role not in ['Doctor', 'HR', 'Admin']:
             return False, "Invalid role selected", None
 
-        user_id = generate_user_id(role)
-        if not user_id:
-            return False, "Failed to generate user ID", None
-
         try:
+            # Allocate the ID in the same transaction as the insert
+            user_id = next_staff_id(cursor, role)
+
             # Insert new user into the correct table
             cursor.execute(f"""
             INSERT INTO {table} (user_id, first_name, last_name, email, password)
@@ -203,6 +162,7 @@ def create_user(first_name: str, last_name: str, email: str, password: str, role
                     # Continue even if security questions fail - they're optional
             
             conn.commit()
+            invalidate_staff_cache(role)
             return True, "Account created successfully", user_id
             
         except Error as e:
@@ -294,6 +254,7 @@ def verify_doctor(user_id: str) -> tuple[bool, str]:
         """, (user_id,))
         
         conn.commit()
+        invalidate_staff_cache("Doctor")
         return True, "Doctor verified successfully"
         
     except Error as e:
@@ -312,13 +273,15 @@ def delete_doctor(user_id: str) -> tuple[bool, str]:
             
         cursor = conn.cursor()
         
-        # Delete doctor from database
+        # Delete doctor from database; its appointments cascade and its patients become unassigned
+        _drop_doctor_rollups(cursor, user_id)
         cursor.execute("""
         DELETE FROM doctors 
         WHERE user_id = %s
         """, (user_id,))
         
         conn.commit()
+        invalidate_staff_cache("Doctor")
         return True, "Doctor deleted successfully"
         
     except Error as e:
@@ -329,15 +292,22 @@ def delete_doctor(user_id: str) -> tuple[bool, str]:
             cursor.close()
             conn.close()
 
+# Columns of doctor / HR list rows; updated_at is the row version used by change polling
+STAFF_COLUMNS = "user_id, first_name, last_name, email, is_verified, updated_at"
+
 def get_all_doctors():
+    """All doctors (STAFF_COLUMNS), newest first. Cached; see REFERENCE_CACHE_TTL"""
+    return reference_cache.get("doctors", _load_doctors)
+
+def _load_doctors():
     try:
         conn = get_connection()
         if conn is None:
             return []
             
         cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-        SELECT user_id, first_name, last_name, email, is_verified
+        cursor.execute(f"""
+        SELECT {STAFF_COLUMNS}
         FROM doctors
         ORDER BY created_at DESC
         """)
@@ -352,14 +322,18 @@ def get_all_doctors():
             conn.close()
 
 def get_all_hrs():
+    """All HR staff (STAFF_COLUMNS), newest first. Cached; see REFERENCE_CACHE_TTL"""
+    return reference_cache.get("hrs", _load_hrs)
+
+def _load_hrs():
     try:
         conn = get_connection()
         if conn is None:
             return []
             
         cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-        SELECT user_id, first_name, last_name, email, is_verified
+        cursor.execute(f"""
+        SELECT {STAFF_COLUMNS}
         FROM hrs
         ORDER BY created_at DESC
         """)
@@ -373,78 +347,454 @@ def get_all_hrs():
             cursor.close()
             conn.close()
 
+def invalidate_staff_cache(role: str = None):
+    """Drop cached doctor and/or HR lists after a write ("Doctor", "HR", or None for both)"""
+    if role == "Doctor":
+        reference_cache.invalidate("doctors")
+    elif role == "HR":
+        reference_cache.invalidate("hrs")
+    elif role is None:
+        reference_cache.invalidate("doctors", "hrs")
+
+# Tables with an indexed updated_at watermark (migration 0008)
+CHANGE_TRACKED_TABLES = ("doctors", "hrs", "patients", "appointments")
+
+def get_change_probe(table: str):
+    """
+    Cheap change check for a tracked table: (MAX(updated_at), COUNT(*)).
+    Any insert or update moves the watermark and a delete changes the count.
+    Returns None if the probe could not run.
+    """
+    if table not in CHANGE_TRACKED_TABLES:
+        raise ValueError(f"{table} has no updated_at watermark")
+    try:
+        conn = get_connection()
+        if conn is None:
+            return None
+
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT MAX(updated_at), COUNT(*) FROM {table}")
+        return tuple(cursor.fetchone())
+    except Error as e:
+        print(f"Error probing {table}: {e}")
+        return None
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+def get_staff_changes(role: str, since) -> list:
+    """
+    Doctor or HR rows (STAFF_COLUMNS) changed at or after the `since` watermark, newest first;
+    `since` None returns every row, uncached. Inclusive, so rows written in the watermark's own
+    microsecond are not missed; callers merge rows by user_id.
+    """
+    table = STAFF_TABLES.get(role)
+    if table not in ("doctors", "hrs"):
+        return []
+    try:
+        conn = get_connection()
+        if conn is None:
+            return []
+
+        cursor = conn.cursor(dictionary=True)
+        if since is None:
+            cursor.execute(f"SELECT {STAFF_COLUMNS} FROM {table} ORDER BY created_at DESC")
+        else:
+            cursor.execute(f"""
+            SELECT {STAFF_COLUMNS}
+            FROM {table}
+            WHERE updated_at >= %s
+            ORDER BY created_at DESC
+            """, (since,))
+        return cursor.fetchall()
+    except Error as e:
+        print(f"Error getting changed {table}: {e}")
+        return []
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+def get_staff_ids(role: str):
+    """
+    Current user_ids of the Doctor or HR table (read from the primary key), used to spot deleted
+    rows. Returns None if the query could not run.
+    """
+    table = STAFF_TABLES.get(role)
+    if table not in ("doctors", "hrs"):
+        return None
+    try:
+        conn = get_connection()
+        if conn is None:
+            return None
+
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT user_id FROM {table}")
+        return {user_id for (user_id,) in cursor.fetchall()}
+    except Error as e:
+        print(f"Error getting {table} ids: {e}")
+        return None
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+def get_enum_values(table: str, column: str) -> list:
+    """Allowed values of an ENUM column, read from information_schema and cached"""
+    import re
+
+    def load():
+        try:
+            conn = get_connection()
+            if conn is None:
+                return []
+
+            cursor = conn.cursor()
+            cursor.execute("""
+            SELECT COLUMN_TYPE FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+            """, (table, column))
+            row = cursor.fetchone()
+            if not row or not str(row[0]).lower().startswith("enum("):
+                return []
+            # enum('A','B','It''s') -> ['A', 'B', "It's"]
+            body = str(row[0])[5:-1]
+            return [v[1:-1].replace("''", "'") for v in re.findall(r"'(?:[^']|'')*'", body)]
+        except Error as e:
+            print(f"Error getting enum values: {e}")
+            return []
+        finally:
+            if conn and conn.is_connected():
+                cursor.close()
+                conn.close()
+
+    return reference_cache.get(f"enum:{table}.{column}", load)
+
+def get_reference_cache_stats() -> dict:
+    """Hit/miss counters of the reference data cache"""
+    return reference_cache.stats()
+
+PATIENT_CODE_COUNTER = "patient_code"
+
+def next_counter_value(cursor, name: str, count: int = 1) -> int:
+    """
+    Atomically advance counter `name` by `count` and return its new value, i.e. the last
+    number of the reserved block. Runs on the caller's cursor/transaction: the counter row
+    stays locked until the caller commits, and a rollback gives the numbers back.
+    """
+    # LAST_INSERT_ID(expr) hands the new value back to this connection only, so concurrent
+    # callers never see each other's numbers; the upsert also creates a missing counter
+    cursor.execute("""
+    INSERT INTO id_counters (name, value) VALUES (%s, LAST_INSERT_ID(%s))
+    ON DUPLICATE KEY UPDATE value = LAST_INSERT_ID(value + %s)
+    """, (name, count, count))
+    # The OK packet already carries the LAST_INSERT_ID(expr) value, so no second round trip
+    if cursor.lastrowid:
+        return cursor.lastrowid
+    cursor.execute("SELECT LAST_INSERT_ID()")
+    return cursor.fetchone()[0]
+
+PATIENT_CODE_PATTERN = re.compile(r"^NXCP(\d+)$")
+
+def format_patient_code(number: int) -> str:
+    return f"NXCP{str(number).zfill(4)}"
+
+def claim_patient_codes(cursor, codes: list) -> None:
+    """
+    Move the patient_code counter past explicitly given codes (validate_patient only lets NXCP#### through),
+    so a later allocation never hands one of them out again. Runs on the caller's cursor/transaction.
+    """
+    numbers = [int(match.group(1)) for match in map(PATIENT_CODE_PATTERN.match, codes) if match]
+    if not numbers:
+        return
+    cursor.execute("""
+    INSERT INTO id_counters (name, value) VALUES (%s, %s)
+    ON DUPLICATE KEY UPDATE value = GREATEST(value, VALUES(value))
+    """, (PATIENT_CODE_COUNTER, max(numbers)))
+
+def reserve_patient_codes(count: int) -> list:
+    """
+    Reserve a block of `count` consecutive patient codes for a bulk import.
+    The reservation is committed immediately, so the counter row is not held locked
+    while the import runs. Unused codes are simply skipped.
+    Returns: list of patient codes (empty on failure)
+    """
+    if count < 1:
+        return []
+    try:
+        conn = get_connection()
+        if conn is None:
+            return []
+
+        cursor = conn.cursor()
+        last = next_counter_value(cursor, PATIENT_CODE_COUNTER, count)
+        conn.commit()
+        return [format_patient_code(n) for n in range(last - count + 1, last + 1)]
+    except Error as e:
+        print(f"Error reserving patient codes: {e}")
+        return []
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+# Medical info column -> (medical_terms.kind, link table)
+MEDICAL_TERM_LINKS = {
+    "allergies": ("allergy", "patient_allergies"),
+    "chronic_illnesses": ("condition", "patient_conditions"),
+    "current_medications": ("medication", "patient_medications"),
+}
+
+def medical_list(val) -> list:
+    """Ensure a medical info field is a list (form input arrives as comma/newline separated text)"""
+    if isinstance(val, str):
+        return [x.strip() for x in val.replace("\n", ",").split(",") if x.strip()]
+    return val if isinstance(val, list) else []
+
+def normalize_medical_term(name: str) -> str:
+    """Dictionary key for a term: collapsed whitespace, lower case"""
+    return " ".join(name.split()).lower()[:100]
+
+def _link_medical_terms(cursor, patient_terms: dict):
+    """
+    Replace the allergy/condition/medication links of the given patients, on the caller's transaction.
+    patient_terms maps patient id -> {medical info column: list of names}; omitted columns are left alone.
+    Numeric entries are skipped, as in the UI.
+    """
+    terms = {}
+    for columns in patient_terms.values():
+        for column, names in columns.items():
+            kind = MEDICAL_TERM_LINKS[column][0]
+            for name in names:
+                if isinstance(name, str) and name.strip() and not name.strip().isdigit():
+                    terms.setdefault((kind, normalize_medical_term(name)), " ".join(name.split())[:100])
+    if terms:
+        cursor.executemany(
+            "INSERT IGNORE INTO medical_terms (kind, name, normalized_name) VALUES (%s, %s, %s)",
+            [(kind, name, normalized) for (kind, normalized), name in terms.items()]
+        )
+
+    term_ids = {}
+    for kind in {kind for kind, _ in terms}:
+        names = [normalized for k, normalized in terms if k == kind]
+        cursor.execute(f"""
+        SELECT id, normalized_name FROM medical_terms
+        WHERE kind = %s AND normalized_name IN ({", ".join(["%s"] * len(names))})
+        """, [kind] + names)
+        for term_id, normalized in cursor.fetchall():
+            term_ids[(kind, normalized)] = term_id
+
+    for column, (kind, table) in MEDICAL_TERM_LINKS.items():
+        patient_ids = [pid for pid, columns in patient_terms.items() if column in columns]
+        if not patient_ids:
+            continue
+        cursor.execute(
+            f"DELETE FROM {table} WHERE patient_id IN ({', '.join(['%s'] * len(patient_ids))})",
+            patient_ids
+        )
+        pairs = set()
+        for pid in patient_ids:
+            for name in patient_terms[pid][column]:
+                term_id = term_ids.get((kind, normalize_medical_term(name))) if isinstance(name, str) else None
+                if term_id:
+                    pairs.add((pid, term_id))
+        if pairs:
+            cursor.executemany(f"INSERT IGNORE INTO {table} (patient_id, term_id) VALUES (%s, %s)", list(pairs))
+
+def get_patient_terms(patient_id: int) -> dict:
+    """
+    Allergies, chronic illnesses and medications of one patient from the normalised tables.
+    Returns: {"allergies": [...], "chronic_illnesses": [...], "current_medications": [...]}
+    """
+    result = {column: [] for column in MEDICAL_TERM_LINKS}
+    try:
+        conn = get_connection()
+        if conn is None:
+            return result
+
+        cursor = conn.cursor()
+        cursor.execute(" UNION ALL ".join(
+            f"SELECT '{column}', t.name FROM {table} l JOIN medical_terms t ON t.id = l.term_id WHERE l.patient_id = %s"
+            for column, (_, table) in MEDICAL_TERM_LINKS.items()
+        ), [patient_id] * len(MEDICAL_TERM_LINKS))
+        for column, name in cursor.fetchall():
+            result[column].append(name)
+        return result
+    except Error as e:
+        print(f"Error getting patient terms: {e}")
+        return result
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+def get_patients_with_term(column: str, term: str, limit: int = 200) -> list:
+    """
+    Patients linked to a medical term, e.g. get_patients_with_term("allergies", "Penicillin").
+    column is one of MEDICAL_TERM_LINKS; the lookup is an index seek on the term dictionary and link table.
+    Returns: list of patient dicts (id, patient_code, full_name, phone, status, doctor_name)
+    """
+    if column not in MEDICAL_TERM_LINKS:
+        return []
+    kind, table = MEDICAL_TERM_LINKS[column]
+    try:
+        conn = get_connection()
+        if conn is None:
+            return []
+
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(f"""
+        SELECT p.id, p.patient_code, p.full_name, p.phone, p.status,
+               CONCAT(d.first_name, ' ', d.last_name) as doctor_name
+        FROM medical_terms t
+        JOIN {table} l ON l.term_id = t.id
+        JOIN patients p ON p.id = l.patient_id
+        LEFT JOIN doctors d ON p.assigned_doctor = d.user_id
+        WHERE t.kind = %s AND t.normalized_name = %s
+        ORDER BY p.full_name
+        LIMIT %s
+        """, (kind, normalize_medical_term(term), limit))
+        return cursor.fetchall()
+    except Error as e:
+        print(f"Error getting patients by term: {e}")
+        return []
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+def search_medical_terms(column: str, prefix: str, limit: int = 20) -> list:
+    """Dictionary lookup for autocomplete: term names of one kind starting with prefix"""
+    if column not in MEDICAL_TERM_LINKS or not prefix or not prefix.strip():
+        return []
+    try:
+        conn = get_connection()
+        if conn is None:
+            return []
+
+        cursor = conn.cursor()
+        cursor.execute("""
+        SELECT name FROM medical_terms
+        WHERE kind = %s AND normalized_name LIKE %s
+        ORDER BY normalized_name
+        LIMIT %s
+        """, (MEDICAL_TERM_LINKS[column][0], _escape_like(normalize_medical_term(prefix)) + "%", limit))
+        return [row[0] for row in cursor.fetchall()]
+    except Error as e:
+        print(f"Error searching medical terms: {e}")
+        return []
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+# Columns written by add_patient / bulk_insert_patients, in VALUES order (created_at is set by the server)
+PATIENT_INSERT_COLUMNS = [
+    "patient_code", "full_name", "birthdate", "gender", "civil_status", "phone", "phone_digits", "address",
+    "emergency_contact_name", "emergency_contact_phone",
+    "visit_type", "assigned_doctor", "visit_date", "insurance_provider", "referral_source",
+    "allergies", "chronic_illnesses", "current_medications", "remarks",
+    "status", "photo_path",
+]
+
+PATIENT_INSERT_SQL = f"""
+INSERT INTO patients ({", ".join(PATIENT_INSERT_COLUMNS)}, created_at)
+VALUES ({", ".join(["%s"] * len(PATIENT_INSERT_COLUMNS))}, CURRENT_TIMESTAMP)
+"""
+
+def validate_patient(full_name: str, birthdate: str, gender: str, civil_status: str, phone: str, address: str = None,
+                     emergency_contact_name: str = None, emergency_contact_phone: str = None,
+                     patient_id: str = None, visit_type: str = "New Patient", assigned_doctor: str = None,
+                     visit_date: str = None, insurance_provider: str = None, referral_source: str = None,
+                     allergies: list = None, chronic_illnesses: list = None, current_medications: list = None,
+                     remarks: str = None, status: str = "Pending", photo_path: str = None) -> tuple[bool, str, dict]:
+    """
+    Validate new-patient fields and convert them to column values (shared by add_patient and bulk imports).
+    Returns: (valid: bool, message: str, record: dict keyed by PATIENT_INSERT_COLUMNS or None)
+    """
+    # Basic validation
+    if not full_name:
+        return False, "Full name is required", None
+    if not birthdate:
+        return False, "Birthdate is required", None
+    if not gender or gender not in ['Male', 'Female', 'Other', 'Prefer not to say']:
+        return False, "Valid gender is required", None
+    if not civil_status or civil_status not in ['Single', 'Married', 'Separated', 'Divorced', 'Widowed', 'Other']:
+        return False, "Valid civil status is required", None
+    if not status or status not in PATIENT_STATUSES:
+        return False, "Valid status is required", None
+    if visit_type and visit_type not in VISIT_TYPES:
+        return False, "Invalid visit type", None
+    if patient_id and not PATIENT_CODE_PATTERN.match(patient_id):
+        return False, "Patient code must look like NXCP0001", None
+
+    # Convert list fields to JSON strings
+    import json
+    record = {
+        "patient_code": patient_id or None,
+        "full_name": full_name,
+        "birthdate": birthdate,
+        "gender": gender,
+        "civil_status": civil_status,
+        "phone": phone,
+        "phone_digits": phone_digits(phone),
+        "address": address,
+        "emergency_contact_name": emergency_contact_name,
+        "emergency_contact_phone": emergency_contact_phone,
+        "visit_type": visit_type,
+        # Convert empty string to None for assigned_doctor
+        "assigned_doctor": assigned_doctor if assigned_doctor else None,
+        "visit_date": visit_date,
+        "insurance_provider": insurance_provider,
+        "referral_source": referral_source,
+        "allergies": json.dumps(medical_list(allergies)),
+        "chronic_illnesses": json.dumps(medical_list(chronic_illnesses)),
+        "current_medications": json.dumps(medical_list(current_medications)),
+        "remarks": remarks,
+        "status": status,
+        "photo_path": photo_path,
+    }
+    return True, "Valid", record
+
 def add_patient(full_name: str, birthdate: str, gender: str, civil_status: str, phone: str, address: str = None,
                 emergency_contact_name: str = None, emergency_contact_phone: str = None,
                 patient_id: str = None, visit_type: str = "New Patient", assigned_doctor: str = None,
                 visit_date: str = None, insurance_provider: str = None, referral_source: str = None,
                 allergies: list = None, chronic_illnesses: list = None, current_medications: list = None,
                 remarks: str = None, status: str = "Pending", photo_path: str = None) -> tuple[bool, str, str]:
+    valid, message, record = validate_patient(
+        full_name, birthdate, gender, civil_status, phone, address,
+        emergency_contact_name, emergency_contact_phone,
+        patient_id, visit_type, assigned_doctor,
+        visit_date, insurance_provider, referral_source,
+        allergies, chronic_illnesses, current_medications,
+        remarks, status, photo_path
+    )
+    if not valid:
+        return False, message, None
+
     try:
         conn = get_connection()
         if conn is None:
             return False, "Database connection failed", None
             
         cursor = conn.cursor()
-        
-        # Basic validation
-        if not full_name:
-            return False, "Full name is required", None
-        if not birthdate:
-            return False, "Birthdate is required", None
-        if not gender or gender not in ['Male', 'Female', 'Other', 'Prefer not to say']:
-            return False, "Valid gender is required", None
-        if not civil_status or civil_status not in ['Single', 'Married', 'Separated', 'Divorced', 'Widowed', 'Other']:
-            return False, "Valid civil status is required", None
-        if not status or status not in ['Pending', 'Scheduled', 'Completed', 'Cancelled', 'No Show']:
-            return False, "Valid status is required", None
-        if visit_type and visit_type not in ['New Patient', 'Follow-up', 'Walk-in']:
-            return False, "Invalid visit type", None
 
         try:
-            # Generate patient_code if not provided
-            if not patient_id:
-                cursor.execute("SELECT MAX(CAST(SUBSTRING(patient_code, 5) AS UNSIGNED)) FROM patients")
-                max_num = cursor.fetchone()[0]
-                next_num = (max_num or 0) + 1
-                patient_id = f"NXCP{str(next_num).zfill(4)}"
-            
-            # Ensure all medical info fields are lists
-            def ensure_list(val):
-                if isinstance(val, str):
-                    return [x.strip() for x in val.replace("\n", ",").split(",") if x.strip()]
-                return val if isinstance(val, list) else []
-            allergies = ensure_list(allergies)
-            chronic_illnesses = ensure_list(chronic_illnesses)
-            current_medications = ensure_list(current_medications)
-
-            # Convert list fields to JSON strings
-            import json
-            allergies_json = json.dumps(allergies) if allergies else json.dumps([])
-            chronic_illnesses_json = json.dumps(chronic_illnesses) if chronic_illnesses else json.dumps([])
-            current_medications_json = json.dumps(current_medications) if current_medications else json.dumps([])
-            
-            # Convert empty string to None for assigned_doctor
-            doctor_id = assigned_doctor if assigned_doctor else None
+            # Allocate patient_code if not provided, or keep the counter past an explicit one (same transaction as the insert)
+            if not record["patient_code"]:
+                record["patient_code"] = format_patient_code(next_counter_value(cursor, PATIENT_CODE_COUNTER))
+            else:
+                claim_patient_codes(cursor, [record["patient_code"]])
             
             # Insert new patient
-            cursor.execute("""
-            INSERT INTO patients (
-                patient_code, full_name, birthdate, gender, civil_status, phone, address,
-                emergency_contact_name, emergency_contact_phone,
-                visit_type, assigned_doctor, visit_date, insurance_provider, referral_source,
-                allergies, chronic_illnesses, current_medications, remarks,
-                status, photo_path, created_at
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
-            """, (
-                patient_id, full_name, birthdate, gender, civil_status, phone, address,
-                emergency_contact_name, emergency_contact_phone,
-                visit_type, doctor_id, visit_date, insurance_provider, referral_source,
-                allergies_json, chronic_illnesses_json, current_medications_json, remarks,
-                status, photo_path
-            ))
+            cursor.execute(PATIENT_INSERT_SQL, [record[c] for c in PATIENT_INSERT_COLUMNS])
+            _link_medical_terms(cursor, {cursor.lastrowid: _record_terms(record)})
+            _bump_rollups(cursor, "patients", [record])
             
             conn.commit()
-            return True, "Patient added successfully", patient_id
+            return True, "Patient added successfully", record["patient_code"]
             
         except Error as e:
             if conn.in_transaction:
@@ -460,6 +810,53 @@ def add_patient(full_name: str, birthdate: str, gender: str, civil_status: str,
             cursor.close()
             conn.close()
 
+def _record_terms(record: dict) -> dict:
+    """Medical info lists of a validate_patient record (its columns hold JSON text)"""
+    import json
+    return {column: json.loads(record[column]) for column in MEDICAL_TERM_LINKS}
+
+def bulk_insert_patients(records: list) -> tuple[bool, str]:
+    """
+    Insert already validated patient records (see validate_patient) in one transaction with executemany.
+    Every record must carry a patient_code, e.g. from reserve_patient_codes(); the counter is moved
+    past any code the import brought along, so add_patient does not reissue it.
+    Returns: (success: bool, message: str); on failure nothing from the batch is kept
+    """
+    if not records:
+        return True, "Nothing to insert"
+    try:
+        conn = get_connection()
+        if conn is None:
+            return False, "Database connection failed"
+
+        cursor = conn.cursor()
+        try:
+            claim_patient_codes(cursor, [r["patient_code"] for r in records])
+            cursor.executemany(PATIENT_INSERT_SQL, [[r[c] for c in PATIENT_INSERT_COLUMNS] for r in records])
+
+            # executemany does not report every new id; map them back through the unique patient_code
+            codes = [r["patient_code"] for r in records]
+            cursor.execute(
+                f"SELECT id, patient_code FROM patients WHERE patient_code IN ({', '.join(['%s'] * len(codes))})",
+                codes
+            )
+            ids = {code: patient_id for patient_id, code in cursor.fetchall()}
+            _link_medical_terms(cursor, {ids[r["patient_code"]]: _record_terms(r) for r in records})
+            _bump_rollups(cursor, "patients", records)
+            conn.commit()
+            return True, f"Inserted {len(records)} patients"
+        except Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            return False, f"Error inserting patients: {str(e)}"
+    except Error as e:
+        print(f"Error inserting patients: {e}")
+        return False, f"Error inserting patients: {str(e)}"
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
 def get_all_patients():
     try:
         conn = get_connection()
@@ -495,24 +892,9 @@ def get_all_patients():
                 
         patients = cursor.fetchall()
         
-        import json
         # Convert datetime objects to strings and parse JSON fields
         for patient in patients:
-            if 'created_at' in patient and patient['created_at']:
-                patient['created_at'] = patient['created_at'].strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Parse JSON fields
-            for json_field in ['allergies', 'chronic_illnesses', 'current_medications']:
-                if json_field in patient and patient[json_field]:
-                    try:
-                        if isinstance(patient[json_field], str):
-                            patient[json_field] = json.loads(patient[json_field])
-                    except json.JSONDecodeError:
-                        # If JSON parsing fails, set to empty list
-                        patient[json_field] = []
-                else:
-                    # Ensure the field exists in the patient dict
-                    patient[json_field] = []
+            _normalize_patient(patient)
         
         return patients
     except Error as e:
@@ -523,6 +905,714 @@ def get_all_patients():
             cursor.close()
             conn.close()
 
+PATIENT_PAGE_SIZE = 24
+
+def _normalize_patient(patient: dict) -> dict:
+    """Format created_at and decode the JSON medical-info columns of a patient row in place"""
+    import json
+    if 'created_at' in patient and patient['created_at'] and not isinstance(patient['created_at'], str):
+        patient['created_at'] = patient['created_at'].strftime('%Y-%m-%d %H:%M:%S')
+    for json_field in ['allergies', 'chronic_illnesses', 'current_medications']:
+        if json_field in patient and patient[json_field]:
+            try:
+                if isinstance(patient[json_field], str):
+                    patient[json_field] = json.loads(patient[json_field])
+            except json.JSONDecodeError:
+                patient[json_field] = []
+        else:
+            patient[json_field] = []
+    return patient
+
+def encode_patient_cursor(patient: dict) -> str:
+    """Opaque keyset cursor pointing just after the given (already normalized) patient row"""
+    import base64
+    import json
+    raw = json.dumps([patient['created_at'], patient['id']]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_patient_cursor(cursor: str):
+    """Return (created_at, id) from a cursor token, or None if the token is malformed"""
+    import base64
+    import json
+    try:
+        created_at, patient_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(created_at), int(patient_id)
+    except (ValueError, TypeError):
+        return None
+
+# Per-view column lists (table alias p). List screens fetch only what they display;
+# detail modals load the full row with get_patient().
+PATIENT_PROJECTIONS = {
+    # HR patient cards
+    "card": [
+        "p.id", "p.patient_code", "p.full_name", "p.birthdate", "p.gender", "p.phone", "p.status",
+        "p.assigned_doctor", "p.photo_path", "p.created_at", "p.updated_at",
+        "p.allergies", "p.chronic_illnesses", "p.current_medications",
+    ],
+    # Doctor patient lists
+    "summary": [
+        "p.id", "p.patient_code", "p.full_name", "p.gender", "p.phone", "p.status",
+        "p.assigned_doctor", "p.created_at", "p.updated_at",
+    ],
+    "full": ["p.*"],
+}
+
+def _patient_columns(view: str) -> str:
+    if view not in PATIENT_PROJECTIONS:
+        raise ValueError(f"Unknown patient view: {view}")
+    return ", ".join(PATIENT_PROJECTIONS[view])
+
+def _fetch_patient_page(where: list, params: list, cursor: str, page_size: int,
+                        view: str = "full") -> tuple[list, str]:
+    """
+    Run a keyset-paginated patient SELECT with the given WHERE conditions, newest first.
+    view selects the column projection (see PATIENT_PROJECTIONS).
+    Returns: (patients: list, next_cursor: str or None when there are no more rows)
+    """
+    try:
+        conn = get_connection()
+        if conn is None:
+            return [], None
+
+        cursor_obj = conn.cursor(dictionary=True)
+
+        where = list(where)
+        params = list(params)
+        if cursor:
+            position = decode_patient_cursor(cursor)
+            if position is None:
+                return [], None
+            created_at, last_id = position
+            where.append("(p.created_at < %s OR (p.created_at = %s AND p.id < %s))")
+            params.extend([created_at, created_at, last_id])
+
+        # Fetch one extra row to know whether another page exists
+        params.append(page_size + 1)
+        cursor_obj.execute(f"""
+        SELECT 
+            {_patient_columns(view)},
+            CONCAT(d.first_name, ' ', d.last_name) as doctor_name
+        FROM patients p
+        LEFT JOIN doctors d ON p.assigned_doctor = d.user_id
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY p.created_at DESC, p.id DESC
+        LIMIT %s
+        """, params)
+        rows = cursor_obj.fetchall()
+
+        has_more = len(rows) > page_size
+        patients = [_normalize_patient(p) for p in rows[:page_size]]
+        next_cursor = encode_patient_cursor(patients[-1]) if has_more else None
+        return patients, next_cursor
+    except Error as e:
+        print(f"Error getting patients page: {e}")
+        return [], None
+    finally:
+        if conn and conn.is_connected():
+            cursor_obj.close()
+            conn.close()
+
+def get_patients_page(cursor: str = None, page_size: int = PATIENT_PAGE_SIZE,
+                      assigned_doctor: str = None, unassigned: bool = False, view: str = "full") -> tuple[list, str]:
+    """
+    Fetch one page of patients, newest first, using keyset pagination on (created_at, id).
+    Returns: (patients: list, next_cursor: str or None when there are no more rows)
+    """
+    where = []
+    params = []
+    if assigned_doctor:
+        where.append("p.assigned_doctor = %s")
+        params.append(assigned_doctor)
+    elif unassigned:
+        where.append("(p.assigned_doctor IS NULL OR p.assigned_doctor = '')")
+    return _fetch_patient_page(where, params, cursor, page_size, view)
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only ever matches literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _patient_filters(term: str = None, status: str = None, doctor: str = None, visit_type: str = None):
+    """
+    WHERE conditions for the patient search/filter UI (table alias p).
+    Returns: (conditions: list, params: list), or None if status/visit_type is not a valid value
+    """
+    where = []
+    params = []
+
+    term = (term or "").strip()
+    if term:
+        prefix = _escape_like(term) + "%"
+        matches = ["p.full_name LIKE %s", "p.patient_code LIKE %s", "p.phone LIKE %s"]
+        params.extend([prefix, prefix, prefix])
+        digits = phone_digits(term)
+        if len(digits) >= 3:
+            matches.append("p.phone_digits LIKE %s")
+            params.append(digits + "%")
+        if term.isdigit():
+            matches.append("p.id = %s")
+            params.append(int(term))
+        where.append("(" + " OR ".join(matches) + ")")
+
+    if status:
+        if status not in PATIENT_STATUSES:
+            return None
+        where.append("p.status = %s")
+        params.append(status)
+    if doctor:
+        where.append("p.assigned_doctor = %s")
+        params.append(doctor)
+    if visit_type:
+        if visit_type not in VISIT_TYPES:
+            return None
+        where.append("p.visit_type = %s")
+        params.append(visit_type)
+    return where, params
+
+def search_patients(term: str = None, status: str = None, doctor: str = None, visit_type: str = None,
+                    limit: int = PATIENT_PAGE_SIZE, cursor: str = None, view: str = "full") -> tuple[list, str]:
+    """
+    Search patients by name, patient code, phone or numeric id, with optional exact filters.
+    Text matches are prefix matches so they can use the indexes on full_name, patient_code and phone.
+    Returns: (patients: list, next_cursor: str or None when there are no more rows)
+    """
+    filters = _patient_filters(term, status, doctor, visit_type)
+    if filters is None:
+        return [], None
+    where, params = filters
+    return _fetch_patient_page(where, params, cursor, limit, view)
+
+EXPORT_BATCH_SIZE = 500
+
+def _stream_rows(query: str, params, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Yield rows of `query` from an unbuffered (server-side) cursor, `batch_size` at a time,
+    so large exports never hold the whole result set in memory.
+    """
+    conn = get_connection()
+    if conn is None:
+        return
+    cursor = conn.cursor(dictionary=True, buffered=False)
+    finished = False
+    try:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+        finished = True
+    except Error as e:
+        # Re-raise: a silently truncated export would look complete
+        print(f"Error streaming rows: {e}")
+        raise
+    finally:
+        if finished:
+            cursor.close()
+            conn.close()
+        else:
+            # Unread rows are still on the wire; this connection cannot be reused
+            conn.discard()
+
+def iter_patients(term: str = None, status: str = None, doctor: str = None, visit_type: str = None,
+                  batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Stream every patient the HR grid would list for the same input: with a search term, the rows
+    of search_patients_ranked in its order; otherwise the filtered rows, newest first
+    """
+    if term and term.strip():
+        built = _ranked_search_query(term, status, doctor, visit_type)
+        if built is None:
+            return
+        query, params = built
+        for patient in _stream_rows(query, params, batch_size):
+            patient.pop("search_tier")
+            patient.pop("search_score")
+            yield _normalize_patient(patient)
+        return
+
+    filters = _patient_filters(None, status, doctor, visit_type)
+    if filters is None:
+        return
+    where, params = filters
+    query = f"""
+    SELECT 
+        p.*,
+        CONCAT(d.first_name, ' ', d.last_name) as doctor_name
+    FROM patients p
+    LEFT JOIN doctors d ON p.assigned_doctor = d.user_id
+    {"WHERE " + " AND ".join(where) if where else ""}
+    ORDER BY p.created_at DESC, p.id DESC
+    """
+    for patient in _stream_rows(query, params, batch_size):
+        yield _normalize_patient(patient)
+
+def iter_appointments(doctor_id: str = None, status: str = None, batch_size: int = EXPORT_BATCH_SIZE):
+    """Stream appointments with patient and doctor names, newest first"""
+    where = []
+    params = []
+    if doctor_id:
+        where.append("a.doctor_id = %s")
+        params.append(doctor_id)
+    if status:
+        where.append("a.status = %s")
+        params.append(status)
+    query = f"""
+    SELECT a.id, a.patient_id, a.doctor_id, a.appointment_date, a.consultation_type, 
+           a.status, a.notes, a.created_at,
+           p.full_name AS patient_name,
+           CONCAT(d.first_name, ' ', d.last_name) AS doctor_name
+    FROM appointments a
+    JOIN patients p ON a.patient_id = p.id
+    JOIN doctors d ON a.doctor_id = d.user_id
+    {"WHERE " + " AND ".join(where) if where else ""}
+    ORDER BY a.appointment_date DESC
+    """
+    yield from _stream_rows(query, params, batch_size)
+
+def phone_digits(phone: str) -> str:
+    """Digits-only form of a phone number, as stored in patients.phone_digits"""
+    return "".join(ch for ch in (phone or "") if ch.isdigit())
+
+# Ranked search tiers, best first: (name, weight added to a row's relevance). Each tier is one
+# index-served branch (patient_code, phone_digits and full_name B-trees, the FULLTEXT index), and
+# a row is listed under the first tier it matches.
+PATIENT_SEARCH_TIERS = (("code", 100), ("phone", 50), ("name", 20), ("text", 0))
+
+def _ranked_search_query(term: str, status: str = None, doctor: str = None, visit_type: str = None,
+                         columns: str = "p.*", limit: int = None, position: tuple = None):
+    """
+    Ranked patient search as a UNION ALL of one branch per tier, each driven by its own index and,
+    when `limit` is given, capped at limit + 1 rows. Rows come out ordered by (tier, FULLTEXT
+    score DESC, created_at DESC, id DESC); `position` (tier, score, created_at, id) continues
+    after that row. Shared by the paged grid search and the streaming export, so both list the same rows.
+    Returns: (query, params), or None when there is nothing to search or a filter value is invalid
+    """
+    import re
+
+    term = (term or "").strip()
+    filters = _patient_filters(None, status, doctor, visit_type)
+    if not term or filters is None:
+        return None
+    filter_where, filter_params = filters
+
+    # Boolean-mode query: every word required, each as a prefix (operators in the input are dropped)
+    fulltext_query = " ".join(f"+{w}*" for w in re.findall(r"\w+", term))
+    digits = phone_digits(term)
+    predicates = {
+        "code": ("p.patient_code = %s", [term]),
+        "phone": ("p.phone_digits LIKE %s", [digits + "%"]) if len(digits) >= 3 else None,
+        "name": ("p.full_name LIKE %s", [_escape_like(term) + "%"]),
+        "text": ("MATCH(p.full_name, p.address, p.remarks) AGAINST (%s IN BOOLEAN MODE)", [fulltext_query])
+                if fulltext_query else None,
+    }
+
+    branches = []
+    params = []
+    earlier = []
+    for tier, (name, _) in enumerate(PATIENT_SEARCH_TIERS):
+        predicate = predicates[name]
+        if predicate is None:
+            continue
+        sql, sql_params = predicate
+        score, score_params = (sql, sql_params) if name == "text" else ("0", [])
+        if position is None or tier >= position[0]:
+            where = [sql] + [f"({e}) IS NOT TRUE" for e, _ in earlier] + filter_where
+            where_params = sql_params + [p for _, ep in earlier for p in ep] + filter_params
+            if position is not None and tier == position[0]:
+                _, last_score, created_at, last_id = position
+                where.append(f"({score} < %s OR ({score} = %s AND "
+                             "(p.created_at < %s OR (p.created_at = %s AND p.id < %s))))")
+                where_params += score_params + [last_score] + score_params + [last_score,
+                                                                              created_at, created_at, last_id]
+            branches.append(f"""
+            (SELECT p.id, {tier} AS tier, {score} AS score
+             FROM patients p
+             WHERE {" AND ".join(where)}
+             ORDER BY score DESC, p.created_at DESC, p.id DESC
+             {"LIMIT %s" if limit else ""})""")
+            params += score_params + where_params + ([limit + 1] if limit else [])
+        earlier.append(predicate)
+    if not branches:
+        return None
+
+    query = f"""
+    SELECT 
+        {columns},
+        CONCAT(d.first_name, ' ', d.last_name) as doctor_name,
+        hits.tier AS search_tier,
+        hits.score AS search_score
+    FROM ({" UNION ALL ".join(branches)}
+    ) hits
+    JOIN patients p ON p.id = hits.id
+    LEFT JOIN doctors d ON p.assigned_doctor = d.user_id
+    ORDER BY hits.tier, hits.score DESC, p.created_at DESC, p.id DESC
+    {"LIMIT %s" if limit else ""}
+    """
+    return query, params + ([limit + 1] if limit else [])
+
+def _ranked_patient(row: dict) -> dict:
+    """Normalize a ranked search row, replacing its tier and score with a 'relevance' value"""
+    tier, score = row.pop("search_tier"), float(row.pop("search_score") or 0)
+    patient = _normalize_patient(row)
+    patient["relevance"] = PATIENT_SEARCH_TIERS[tier][1] + score
+    patient["search_position"] = (tier, score)
+    return patient
+
+def encode_search_cursor(patient: dict) -> str:
+    """Opaque cursor pointing just after the given ranked search row"""
+    import base64
+    import json
+    tier, score = patient["search_position"]
+    raw = json.dumps([tier, score, patient["created_at"], patient["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+def decode_search_cursor(cursor: str):
+    """Return (tier, score, created_at, id) from a search cursor token, or None if the token is malformed"""
+    import base64
+    import json
+    try:
+        tier, score, created_at, patient_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not 0 <= int(tier) < len(PATIENT_SEARCH_TIERS):
+            return None
+        return int(tier), float(score), str(created_at), int(patient_id)
+    except (ValueError, TypeError):
+        return None
+
+def search_patients_ranked(term: str, status: str = None, doctor: str = None, visit_type: str = None,
+                           limit: int = 50, cursor: str = None, view: str = "full") -> tuple[list, str]:
+    """
+    Ranked patient search for front-desk lookups, best match first: exact patient code, then
+    phone_digits prefix, then full_name prefix, then FULLTEXT relevance over full_name/address/remarks.
+    Each tier is read through its own index and capped, then merged; `cursor` continues the ranking.
+    Returns: (patients with a 'relevance' key, next_cursor: str or None when there are no more rows)
+    """
+    position = None
+    if cursor:
+        position = decode_search_cursor(cursor)
+        if position is None:
+            return [], None
+    built = _ranked_search_query(term, status, doctor, visit_type, columns=_patient_columns(view),
+                                 limit=limit, position=position)
+    if built is None:
+        return [], None
+    query, params = built
+
+    try:
+        conn = get_connection()
+        if conn is None:
+            return [], None
+
+        cursor_obj = conn.cursor(dictionary=True)
+        cursor_obj.execute(query, params)
+        rows = cursor_obj.fetchall()
+
+        has_more = len(rows) > limit
+        patients = [_ranked_patient(p) for p in rows[:limit]]
+        next_cursor = encode_search_cursor(patients[-1]) if has_more else None
+        return patients, next_cursor
+    except Error as e:
+        print(f"Error searching patients: {e}")
+        return [], None
+    finally:
+        if conn and conn.is_connected():
+            cursor_obj.close()
+            conn.close()
+
+def get_patient(patient_id: int) -> dict:
+    """Fetch a single patient (with doctor_name) by primary key, or None"""
+    try:
+        conn = get_connection()
+        if conn is None:
+            return None
+
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+        SELECT 
+            p.*,
+            CONCAT(d.first_name, ' ', d.last_name) as doctor_name
+        FROM patients p
+        LEFT JOIN doctors d ON p.assigned_doctor = d.user_id
+        WHERE p.id = %s
+        """, (patient_id,))
+        patient = cursor.fetchone()
+        return _normalize_patient(patient) if patient else None
+    except Error as e:
+        print(f"Error getting patient: {e}")
+        return None
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+def count_patients() -> int:
+    try:
+        conn = get_connection()
+        if conn is None:
+            return 0
+
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM patients")
+        return cursor.fetchone()[0]
+    except Error as e:
+        print(f"Error counting patients: {e}")
+        return 0
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+DASHBOARD_RECENT_LIMIT = 5
+
+def get_dashboard_stats() -> dict:
+    """
+    All dashboard counters from one aggregate query, so stat cards never fetch whole tables to count them.
+    Returns: {"appointments": {"total", "by_status"}, "patients": {"total", "by_status"},
+              "doctors": {"total", "verified", "pending"}, "hrs": {"total", "verified", "pending"}}
+    """
+    stats = {
+        "appointments": {"total": 0, "by_status": {}},
+        "patients": {"total": 0, "by_status": {}},
+        "doctors": {"total": 0, "verified": 0, "pending": 0},
+        "hrs": {"total": 0, "verified": 0, "pending": 0},
+    }
+    try:
+        conn = get_connection()
+        if conn is None:
+            return stats
+
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute("""
+        SELECT 'appointments' AS dataset, status, COUNT(*) AS total, NULL AS verified
+        FROM appointments GROUP BY status
+        UNION ALL
+        SELECT 'patients', status, COUNT(*), NULL
+        FROM patients GROUP BY status
+        UNION ALL
+        SELECT 'doctors', NULL, COUNT(*), COALESCE(SUM(is_verified = TRUE), 0)
+        FROM doctors
+        UNION ALL
+        SELECT 'hrs', NULL, COUNT(*), COALESCE(SUM(is_verified = TRUE), 0)
+        FROM hrs
+        """)
+        for row in cursor.fetchall():
+            entry = stats[row["dataset"]]
+            total = int(row["total"])
+            entry["total"] += total
+            if row["verified"] is not None:
+                entry["verified"] = int(row["verified"])
+                entry["pending"] = total - entry["verified"]
+            else:
+                entry["by_status"][row["status"]] = total
+        return stats
+    except Error as e:
+        print(f"Error getting dashboard stats: {e}")
+        return stats
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+def get_recent_staff(role: str, limit: int = DASHBOARD_RECENT_LIMIT) -> list:
+    """The `limit` most recently created doctors or HR staff (same columns as get_all_doctors / get_all_hrs)"""
+    table = STAFF_TABLES.get(role)
+    if table not in ("doctors", "hrs"):
+        return []
+    try:
+        conn = get_connection()
+        if conn is None:
+            return []
+
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(f"""
+        SELECT {STAFF_COLUMNS}
+        FROM {table}
+        ORDER BY created_at DESC
+        LIMIT %s
+        """, (limit,))
+        return cursor.fetchall()
+    except Error as e:
+        print(f"Error getting recent {table}: {e}")
+        return []
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+# daily_rollups: rows created per day, per metric (source table), in total ("total", '') and
+# per status / doctor / visit type. Days are creation days; status and assignment changes move
+# the record between buckets of its creation day and deletes (with their cascades) take it out,
+# so a rebuild from the tables gives the same counts.
+ROLLUP_DIMENSIONS = {
+    "appointments": {"status": "status", "doctor": "doctor_id", "visit_type": "consultation_type"},
+    "patients": {"status": "status", "doctor": "assigned_doctor", "visit_type": "visit_type"},
+}
+ROLLUP_TREND_DAYS = 7
+ROLLUP_UPSERT_SQL = """
+INSERT INTO daily_rollups (metric, dimension, value, day, count)
+VALUES (%s, %s, %s, COALESCE(%s, CURDATE()), %s)
+ON DUPLICATE KEY UPDATE count = count + VALUES(count)
+"""
+
+# Trend series shown on the HR dashboard stat cards: name -> (metric, dimension, value)
+DASHBOARD_TRENDS = {
+    "appointments": ("appointments", "total", ""),
+    "patients": ("patients", "total", ""),
+    "pending": ("appointments", "status", "Pending"),
+}
+
+def _bump_rollups(cursor, metric: str, rows: list, delta: int = 1, day=None):
+    """Add `delta` per row to the rollup buckets of newly created rows (dicts with the source columns), on `day` (default today)"""
+    from collections import Counter
+    counts = Counter()
+    for row in rows:
+        counts[("total", "")] += delta
+        for dimension, column in ROLLUP_DIMENSIONS[metric].items():
+            counts[(dimension, row.get(column) or "")] += delta
+    cursor.executemany(ROLLUP_UPSERT_SQL, [(metric, dimension, value, day, count)
+                                           for (dimension, value), count in counts.items()])
+
+def _move_rollups(cursor, metric: str, row_id: int, changes: dict):
+    """
+    Before updating row `row_id` of the `metric` table with `changes` ({column: new value}), move it
+    from its old to its new rollup buckets on its creation day. Locks the row until commit.
+    """
+    dimensions = {column: dimension for dimension, column in ROLLUP_DIMENSIONS[metric].items() if column in changes}
+    if not dimensions:
+        return
+    cursor.execute(
+        f"SELECT DATE(created_at), {', '.join(dimensions)} FROM {metric} WHERE id = %s FOR UPDATE",
+        (row_id,)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return
+    day, old_values = row[0], dict(zip(dimensions, row[1:]))
+    moves = []
+    for column, dimension in dimensions.items():
+        old, new = old_values[column] or "", changes[column] or ""
+        if old != new:
+            moves += [(metric, dimension, old, day, -1), (metric, dimension, new, day, 1)]
+    if moves:
+        cursor.executemany(ROLLUP_UPSERT_SQL, moves)
+
+def _drop_rollups(cursor, metric: str, where: str, params: tuple):
+    """
+    Before deleting the rows of the `metric` table matching `where`, take them out of the rollup
+    buckets of their creation days. Locks the rows until commit.
+    """
+    from collections import defaultdict
+    columns = list(ROLLUP_DIMENSIONS[metric].values())
+    cursor.execute(f"SELECT DATE(created_at), {', '.join(columns)} FROM {metric} WHERE {where} FOR UPDATE", params)
+    by_day = defaultdict(list)
+    for row in cursor.fetchall():
+        by_day[row[0]].append(dict(zip(columns, row[1:])))
+    for day, rows in by_day.items():
+        _bump_rollups(cursor, metric, rows, delta=-1, day=day)
+
+def _drop_doctor_rollups(cursor, user_id: str):
+    """
+    Before deleting doctor `user_id`: drop the appointments that cascade with it from the rollups
+    and move its patients (assigned_doctor becomes NULL) to the unassigned bucket of their day.
+    """
+    from collections import Counter
+    _drop_rollups(cursor, "appointments", "doctor_id = %s", (user_id,))
+    cursor.execute("SELECT DATE(created_at) FROM patients WHERE assigned_doctor = %s FOR UPDATE", (user_id,))
+    days = Counter(day for (day,) in cursor.fetchall())
+    moves = []
+    for day, count in days.items():
+        moves += [("patients", "doctor", user_id, day, -count), ("patients", "doctor", "", day, count)]
+    if moves:
+        cursor.executemany(ROLLUP_UPSERT_SQL, moves)
+
+def rebuild_rollups(since: str = None) -> tuple[bool, str]:
+    """
+    Backfill job: recompute daily_rollups from the patients and appointments tables,
+    for every day or only from `since` (YYYY-MM-DD) onwards, in one transaction.
+    Returns: (success: bool, message: str)
+    """
+    try:
+        conn = get_connection()
+        if conn is None:
+            return False, "Database connection failed"
+
+        cursor = conn.cursor()
+        try:
+            since_filter = "WHERE created_at >= %s" if since else ""
+            params = (since,) if since else ()
+            cursor.execute(f"DELETE FROM daily_rollups {'WHERE day >= %s' if since else ''}", params)
+            for metric, columns in ROLLUP_DIMENSIONS.items():
+                buckets = {"total": "''", **{dimension: f"COALESCE({column}, '')" for dimension, column in columns.items()}}
+                for dimension, expression in buckets.items():
+                    cursor.execute(f"""
+                    INSERT INTO daily_rollups (metric, dimension, value, day, count)
+                    SELECT '{metric}', '{dimension}', {expression}, DATE(created_at), COUNT(*)
+                    FROM {metric}
+                    {since_filter}
+                    GROUP BY {expression}, DATE(created_at)
+                    """, params)
+            cursor.execute("SELECT COUNT(*) FROM daily_rollups")
+            rows = cursor.fetchone()[0]
+            conn.commit()
+            return True, f"Rebuilt daily rollups ({rows} rows)"
+        except Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            print(f"Error rebuilding rollups: {e}")
+            return False, f"Error rebuilding rollups: {str(e)}"
+    except Error as e:
+        print(f"Error rebuilding rollups: {e}")
+        return False, f"Error rebuilding rollups: {str(e)}"
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+def get_rollup_trends(series: dict, days: int = ROLLUP_TREND_DAYS) -> dict:
+    """
+    Percent change of each series ({name: (metric, dimension, value)}) over the last `days` days
+    against the `days` before, from the daily_rollups primary key (2 * days rows per series).
+    Returns: {name: percent rounded to 0.1, or None when the earlier period is empty}
+    """
+    trends = {name: None for name in series}
+    if not series:
+        return trends
+    try:
+        conn = get_connection()
+        if conn is None:
+            return trends
+
+        cursor = conn.cursor(dictionary=True)
+        conditions = " OR ".join(["(metric = %s AND dimension = %s AND value = %s)"] * len(series))
+        params = [days, days]
+        for key in series.values():
+            params.extend(key)
+        params.append(days * 2)
+        cursor.execute(f"""
+        SELECT metric, dimension, value,
+               SUM(IF(day > CURDATE() - INTERVAL %s DAY, count, 0)) AS current,
+               SUM(IF(day <= CURDATE() - INTERVAL %s DAY, count, 0)) AS previous
+        FROM daily_rollups
+        WHERE ({conditions}) AND day > CURDATE() - INTERVAL %s DAY
+        GROUP BY metric, dimension, value
+        """, params)
+        totals = {(row["metric"], row["dimension"], row["value"]): row for row in cursor.fetchall()}
+        for name, key in series.items():
+            row = totals.get(key)
+            if row and row["previous"]:
+                trends[name] = round((int(row["current"]) - int(row["previous"])) * 100 / int(row["previous"]), 1)
+        return trends
+    except Error as e:
+        print(f"Error getting rollup trends: {e}")
+        return trends
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
+def get_dashboard_trends() -> dict:
+    """Trend percentages for the HR dashboard stat cards (see DASHBOARD_TRENDS)"""
+    return get_rollup_trends(DASHBOARD_TRENDS)
+
 def update_patient_status(patient_id: int, new_status: str) -> tuple[bool, str]:
     try:
         conn = get_connection()
@@ -536,6 +1626,7 @@ def update_patient_status(patient_id: int, new_status: str) -> tuple[bool, str]:
             return False, "Invalid status"
         
         # Update patient status
+        _move_rollups(cursor, "patients", patient_id, {"status": new_status})
         cursor.execute("""
         UPDATE patients 
         SET status = %s 
@@ -546,6 +1637,8 @@ def update_patient_status(patient_id: int, new_status: str) -> tuple[bool, str]:
         return True, "Patient status updated successfully"
         
     except Error as e:
+        if conn and conn.is_connected() and conn.in_transaction:
+            conn.rollback()
         print(f"Error updating patient status: {e}")
         return False, f"Error updating patient status: {str(e)}"
     finally:
@@ -584,9 +1677,9 @@ def update_patient(patient_id: str, full_name: str = None, birthdate: str = None
             
             # Convert list fields to JSON strings if provided
             import json
-            allergies_json = json.dumps(allergies) if allergies is not None else None
-            chronic_illnesses_json = json.dumps(chronic_illnesses) if chronic_illnesses is not None else None
-            current_medications_json = json.dumps(current_medications) if current_medications is not None else None
+            allergies_json = json.dumps(medical_list(allergies)) if allergies is not None else None
+            chronic_illnesses_json = json.dumps(medical_list(chronic_illnesses)) if chronic_illnesses is not None else None
+            current_medications_json = json.dumps(medical_list(current_medications)) if current_medications is not None else None
             
             # Convert empty string to None for assigned_doctor
             doctor_id = assigned_doctor if assigned_doctor else None
@@ -597,6 +1690,7 @@ def update_patient(patient_id: str, full_name: str = None, birthdate: str = None
                 'gender': gender,
                 'civil_status': civil_status,
                 'phone': phone,
+                'phone_digits': phone_digits(phone) if phone is not None else None,
                 'address': address,
                 'emergency_contact_name': emergency_contact_name,
                 'emergency_contact_phone': emergency_contact_phone,
@@ -631,7 +1725,19 @@ def update_patient(patient_id: str, full_name: str = None, birthdate: str = None
             WHERE id = %s
             '''
             
+            _move_rollups(cursor, "patients", patient_id,
+                          {c: fields[c] for c in ROLLUP_DIMENSIONS["patients"].values() if fields[c] is not None})
             cursor.execute(query, params)
+
+            # Keep the normalised medical term links in step with the JSON columns
+            changed_terms = {
+                column: medical_list(value)
+                for column, value in (("allergies", allergies), ("chronic_illnesses", chronic_illnesses),
+                                      ("current_medications", current_medications))
+                if value is not None
+            }
+            if changed_terms:
+                _link_medical_terms(cursor, {int(patient_id): changed_terms})
             conn.commit()
             return True, "Patient updated successfully"
             
@@ -658,7 +1764,9 @@ def delete_patient(patient_id: str) -> tuple[bool, str]:
         cursor = conn.cursor()
         
         try:
-            # Delete patient
+            # Delete patient; its appointments cascade, so both leave the rollups in this transaction
+            _drop_rollups(cursor, "appointments", "patient_id = %s", (patient_id,))
+            _drop_rollups(cursor, "patients", "id = %s", (patient_id,))
             cursor.execute("DELETE FROM patients WHERE id = %s", (patient_id,))
             
             if cursor.rowcount == 0:
@@ -681,41 +1789,6 @@ def delete_patient(patient_id: str) -> tuple[bool, str]:
             cursor.close()
             conn.close()
 
-def update_patients_table():
-    try:
-        conn = get_connection()
-        if conn is None:
-            return False, "Database connection failed"
-            
-        cursor = conn.cursor()
-        
-        # Drop the existing email constraint and add a new one
-        try:
-            cursor.execute("""
-            ALTER TABLE patients
-            DROP CONSTRAINT IF EXISTS chk_patient_email,
-            ADD CONSTRAINT chk_patient_email CHECK (
-                email IS NULL OR email LIKE '%@%.%'
-            )
-            """)
-            
-            conn.commit()
-            return True, "Patients table updated successfully"
-            
-        except Error as e:
-            if conn.in_transaction:
-                conn.rollback()
-            print(f"Error updating patients table: {e}")
-            return False, f"Error updating patients table: {str(e)}"
-                
-    except Error as e:
-        print(f"Error updating patients table: {e}")
-        return False, f"Error updating patients table: {str(e)}"
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
-
 def update_hr(hr_data: dict) -> tuple[bool, str]:
     try:
         # Validate email format
@@ -747,6 +1820,7 @@ def update_hr(hr_data: dict) -> tuple[bool, str]:
         ))
         
         conn.commit()
+        invalidate_staff_cache("HR")
         return True, "HR staff updated successfully"
         
     except Error as e:
@@ -814,6 +1888,8 @@ def add_appointment(patient_id: int, doctor_id: str, appointment_date: str,
         
         # Get the ID of the newly inserted appointment
         appointment_id = cursor.lastrowid
+        _bump_rollups(cursor, "appointments",
+                      [{"status": status, "doctor_id": doctor_id, "consultation_type": consultation_type}])
         
         conn.commit()
         return True, "Appointment added successfully", appointment_id
@@ -829,8 +1905,18 @@ def add_appointment(patient_id: int, doctor_id: str, appointment_date: str,
             conn.close()
 
 
-def get_all_appointments():
-    """Get all appointments with patient and doctor information"""
+# Appointment columns per view (table alias a); "list" leaves out notes, fetched by get_appointment()
+APPOINTMENT_PROJECTIONS = {
+    "list": ["a.id", "a.patient_id", "a.doctor_id", "a.appointment_date", "a.consultation_type", "a.status"],
+    "full": ["a.id", "a.patient_id", "a.doctor_id", "a.appointment_date", "a.consultation_type",
+             "a.status", "a.notes", "a.created_at"],
+}
+
+def get_all_appointments(doctor_id: str = None, view: str = "full", limit: int = None):
+    """
+    Get all appointments with patient and doctor information, newest first, optionally only one
+    doctor's and/or only the first `limit` (e.g. DASHBOARD_RECENT_LIMIT for the dashboard's recent list)
+    """
     try:
         conn = get_connection()
         if conn is None:
@@ -839,16 +1925,18 @@ def get_all_appointments():
         cursor = conn.cursor(dictionary=True)
         
         # Get all appointments with patient and doctor names
-        cursor.execute("""
-        SELECT a.id, a.patient_id, a.doctor_id, a.appointment_date, a.consultation_type, 
-               a.status, a.notes, a.created_at,
+        # (a doctor filter is served by idx_appointments_doctor_date)
+        cursor.execute(f"""
+        SELECT {", ".join(APPOINTMENT_PROJECTIONS[view])},
                p.full_name AS patient_name,
                CONCAT(d.first_name, ' ', d.last_name) AS doctor_name
         FROM appointments a
         JOIN patients p ON a.patient_id = p.id
         JOIN doctors d ON a.doctor_id = d.user_id
+        {"WHERE a.doctor_id = %s" if doctor_id else ""}
         ORDER BY a.appointment_date DESC
-        """)
+        {"LIMIT %s" if limit else ""}
+        """, tuple(value for value in (doctor_id, limit) if value))
         
         appointments = cursor.fetchall()
         return True, "Appointments retrieved successfully", appointments
@@ -862,6 +1950,32 @@ def get_all_appointments():
             conn.close()
 
 
+def get_appointment(appointment_id: int) -> dict:
+    """Fetch one appointment with all columns (including notes), or None"""
+    try:
+        conn = get_connection()
+        if conn is None:
+            return None
+
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(f"""
+        SELECT {", ".join(APPOINTMENT_PROJECTIONS["full"])},
+               p.full_name AS patient_name,
+               CONCAT(d.first_name, ' ', d.last_name) AS doctor_name
+        FROM appointments a
+        JOIN patients p ON a.patient_id = p.id
+        JOIN doctors d ON a.doctor_id = d.user_id
+        WHERE a.id = %s
+        """, (appointment_id,))
+        return cursor.fetchone()
+    except Error as e:
+        print(f"Error getting appointment: {e}")
+        return None
+    finally:
+        if conn and conn.is_connected():
+            cursor.close()
+            conn.close()
+
 def update_appointment_status(appointment_id: int, new_status: str):
     """Update the status of an appointment"""
     try:
@@ -872,6 +1986,7 @@ def update_appointment_status(appointment_id: int, new_status: str):
         cursor = conn.cursor()
         
         # Update the appointment status
+        _move_rollups(cursor, "appointments", appointment_id, {"status": new_status})
         cursor.execute("""
         UPDATE appointments
         SET status = %s
@@ -905,6 +2020,7 @@ def delete_appointment(appointment_id: int):
         cursor = conn.cursor()
         
         # Delete the appointment
+        _drop_rollups(cursor, "appointments", "id = %s", (appointment_id,))
         cursor.execute("DELETE FROM appointments WHERE id = %s", (appointment_id,))
         
         if cursor.rowcount == 0:
@@ -922,30 +2038,3 @@ def delete_appointment(appointment_id: int):
         if conn and conn.is_connected():
             cursor.close()
             conn.close()
-
-def clear_numeric_medical_info_fields():
-    import json
-    conn = get_connection()
-    if conn is None:
-        print("Database connection failed")
-        return
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT id, allergies, chronic_illnesses, current_medications FROM patients")
-    for row in cursor.fetchall():
-        updates = {}
-        for field in ["allergies", "chronic_illnesses", "current_medications"]:
-            try:
-                items = json.loads(row[field]) if row[field] else []
-                if any(isinstance(x, int) for x in items):
-                    updates[field] = json.dumps([])
-            except Exception:
-                updates[field] = json.dumps([])
-        if updates:
-            set_clause = ", ".join([f"{k} = %s" for k in updates.keys()])
-            values = list(updates.values()) + [row["id"]]
-            cursor.execute(f"UPDATE patients SET {set_clause} WHERE id = %s", values)
-            print(f"Cleared fields for patient {row['id']}")
-    conn.commit()
-    cursor.close()
-    conn.close()
-    print("Done. All numeric medical info fields have been cleared.")
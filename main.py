@@ -1,6 +1,7 @@
 import flet as ft
 from pages.login import login_ui
 from database import init_db
+from utils.assets import ASSETS_DIR, font_map, asset_file
 
 def main(page: ft.Page):
     init_db()
@@ -12,23 +13,18 @@ def main(page: ft.Page):
     page.bgcolor = ft.Colors.WHITE
     page.padding = 0
     # Set app icon
-    page.window_icon = "assets/icons/app_icon.png"
+    page.window_icon = asset_file("icons/app_icon.png")
 
     # Theme settings
     page.theme = ft.Theme(
         font_family="Poppins",
         use_material3=True,
     )
-    page.fonts = {
-        "Poppins": "https://raw.githubusercontent.com/google/fonts/main/ofl/poppins/Poppins-Regular.ttf",
-        "PoppinsMedium": "https://raw.githubusercontent.com/google/fonts/main/ofl/poppins/Poppins-Medium.ttf",
-        "PoppinsSemiBold": "https://raw.githubusercontent.com/google/fonts/main/ofl/poppins/Poppins-SemiBold.ttf",
-        "Lato": "https://raw.githubusercontent.com/google/fonts/main/ofl/lato/Lato-Regular.ttf",
-        "LatoMedium": "https://raw.githubusercontent.com/google/fonts/main/ofl/lato/Lato-Bold.ttf"
-    }
+    # Bundled, subset and content-hashed fonts (see utils/build_assets.py)
+    page.fonts = font_map()
 
     login_ui(page)
 
 if __name__ == "__main__":
     # Use view=ft.FLET_APP for desktop, or view=None for default browser
-    ft.app(target=main)
\ No newline at end of file
+    ft.app(target=main, assets_dir=ASSETS_DIR)
\ No newline at end of file
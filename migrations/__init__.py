@@ -0,0 +1,12 @@
+"""
+Versioned schema migrations.
+
+Each migration is a module named mNNNN_<description>.py in this package defining
+VERSION (int), DESCRIPTION (str) and upgrade(cursor). Applied versions are recorded
+in the schema_version table, so startup only has to compare one number when the
+database is already current.
+"""
+
+from .runner import MigrationError, run_migrations, current_version, latest_version, discover_migrations
+
+__all__ = ['MigrationError', 'run_migrations', 'current_version', 'latest_version', 'discover_migrations']
@@ -0,0 +1,93 @@
+"""Baseline schema: the tables previously created by database.init_db()."""
+
+VERSION = 1
+DESCRIPTION = "initial schema"
+
+
+def upgrade(cursor):
+    # Create doctors table (minimal example, expand as needed)
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS doctors (
+        user_id VARCHAR(16) PRIMARY KEY,
+        first_name VARCHAR(100),
+        last_name VARCHAR(100)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    """)
+
+    # Create hrs table
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS hrs (
+        user_id VARCHAR(16) PRIMARY KEY,
+        first_name VARCHAR(100) NOT NULL,
+        last_name VARCHAR(100) NOT NULL,
+        email VARCHAR(100) NOT NULL UNIQUE,
+        password VARCHAR(255) NOT NULL,
+        is_verified BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT chk_hr_names CHECK (LENGTH(first_name) >= 2 AND LENGTH(last_name) >= 2),
+        CONSTRAINT chk_hr_email CHECK (email LIKE '%@nexacare.med'),
+        CONSTRAINT chk_hr_password CHECK (LENGTH(password) >= 8)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    """)
+
+    # Create patients table
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS patients (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        patient_code VARCHAR(20) UNIQUE,
+        full_name VARCHAR(100) NOT NULL,
+        birthdate DATE NOT NULL,
+        gender ENUM('Male', 'Female', 'Other', 'Prefer not to say') NOT NULL,
+        civil_status ENUM('Single', 'Married', 'Separated', 'Divorced', 'Widowed', 'Other') NOT NULL,
+        phone VARCHAR(20) NOT NULL,
+        address TEXT NOT NULL,
+        emergency_contact_name VARCHAR(100) NOT NULL,
+        emergency_contact_phone VARCHAR(20) NOT NULL,
+        visit_type ENUM('New Patient', 'Follow-up', 'Walk-in') NOT NULL DEFAULT 'New Patient',
+        assigned_doctor VARCHAR(16),
+        visit_date DATETIME,
+        insurance_provider VARCHAR(100),
+        referral_source ENUM('Walk-in', 'Friend', 'Facebook', 'Other'),
+        allergies JSON,
+        chronic_illnesses JSON,
+        current_medications JSON,
+        remarks TEXT,
+        status ENUM('Pending', 'Scheduled', 'Completed', 'Cancelled', 'No Show') NOT NULL DEFAULT 'Pending',
+        photo_path VARCHAR(255),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT chk_patient_name CHECK (LENGTH(full_name) >= 2),
+        CONSTRAINT chk_patient_phone CHECK (LENGTH(phone) >= 7),
+        CONSTRAINT fk_patient_doctor FOREIGN KEY (assigned_doctor) REFERENCES doctors(user_id) ON DELETE SET NULL ON UPDATE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    """)
+
+    # Create appointments table with ON DELETE CASCADE
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS appointments (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        patient_id INT NOT NULL,
+        doctor_id VARCHAR(16) NOT NULL,
+        appointment_date DATETIME NOT NULL,
+        consultation_type VARCHAR(50) NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'Scheduled',
+        notes TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (patient_id) REFERENCES patients(id) ON DELETE CASCADE ON UPDATE CASCADE,
+        FOREIGN KEY (doctor_id) REFERENCES doctors(user_id) ON DELETE CASCADE ON UPDATE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    """)
+
+    # Create admins table
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS admins (
+        user_id VARCHAR(16) PRIMARY KEY,
+        first_name VARCHAR(100) NOT NULL,
+        last_name VARCHAR(100) NOT NULL,
+        email VARCHAR(100) NOT NULL UNIQUE,
+        password VARCHAR(255) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CONSTRAINT chk_admin_names CHECK (LENGTH(first_name) >= 2 AND LENGTH(last_name) >= 2),
+        CONSTRAINT chk_admin_email CHECK (email LIKE '%@nexacare.med'),
+        CONSTRAINT chk_admin_password CHECK (LENGTH(password) >= 8)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    """)
@@ -0,0 +1,19 @@
+"""Indexes backing keyset pagination and patient search, plus the phone_digits column."""
+
+VERSION = 2
+DESCRIPTION = "patient pagination and search indexes"
+
+
+def upgrade(cursor):
+    # Keyset pagination index for patient listings (newest first)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_patients_created ON patients (created_at, id)")
+
+    # Prefix-search indexes used by search_patients
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_patients_full_name ON patients (full_name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_patients_phone ON patients (phone)")
+
+    # Digits-only phone for prefix lookups and a FULLTEXT index for ranked text search
+    cursor.execute("ALTER TABLE patients ADD COLUMN IF NOT EXISTS phone_digits VARCHAR(20) AFTER phone")
+    cursor.execute("UPDATE patients SET phone_digits = REGEXP_REPLACE(phone, '[^0-9]', '') WHERE phone_digits IS NULL")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_patients_phone_digits ON patients (phone_digits)")
+    cursor.execute("CREATE FULLTEXT INDEX IF NOT EXISTS ft_patients_text ON patients (full_name, address, remarks)")
@@ -0,0 +1,33 @@
+"""
+Reset allergies / chronic_illnesses / current_medications lists that hold numbers or
+invalid JSON. Replaces the one-off database.clear_numeric_medical_info_fields() script.
+"""
+import json
+
+VERSION = 3
+DESCRIPTION = "clear numeric medical info fields"
+
+MEDICAL_INFO_FIELDS = ["allergies", "chronic_illnesses", "current_medications"]
+
+
+def upgrade(cursor):
+    cursor.execute("SELECT id, allergies, chronic_illnesses, current_medications FROM patients")
+    updates = []
+    for patient_id, *values in cursor.fetchall():
+        cleared = []
+        for field, value in zip(MEDICAL_INFO_FIELDS, values):
+            try:
+                items = json.loads(value) if value else []
+                if any(isinstance(x, int) for x in items):
+                    cleared.append(field)
+            except (ValueError, TypeError):
+                cleared.append(field)
+        if cleared:
+            updates.append((patient_id, cleared))
+
+    for patient_id, cleared in updates:
+        set_clause = ", ".join(f"{field} = %s" for field in cleared)
+        cursor.execute(
+            f"UPDATE patients SET {set_clause} WHERE id = %s",
+            [json.dumps([])] * len(cleared) + [patient_id]
+        )
@@ -0,0 +1,15 @@
+"""Secondary indexes for the doctor schedule, dashboard and status-filtered patient queries."""
+
+VERSION = 4
+DESCRIPTION = "appointment and patient secondary indexes"
+
+
+def upgrade(cursor):
+    # A doctor's appointments, newest first (doctor dashboard, schedule)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_appointments_doctor_date ON appointments (doctor_id, appointment_date)")
+    # Date-ordered and date-range appointment listings
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_appointments_date ON appointments (appointment_date)")
+    # Status filter on the patients grid, paged by created_at
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_patients_status_created ON patients (status, created_at)")
+    # A doctor's patients by status
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_patients_doctor_status ON patients (assigned_doctor, status)")
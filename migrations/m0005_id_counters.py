@@ -0,0 +1,20 @@
+"""Counter table for atomic ID allocation, seeded with the highest existing patient code."""
+
+VERSION = 5
+DESCRIPTION = "id counters"
+
+
+def upgrade(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS id_counters (
+        name VARCHAR(32) PRIMARY KEY,
+        value BIGINT UNSIGNED NOT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    """)
+
+    # Continue numbering after the existing NXCP#### codes
+    cursor.execute("""
+    INSERT IGNORE INTO id_counters (name, value)
+    SELECT 'patient_code', COALESCE(MAX(CAST(SUBSTRING(patient_code, 5) AS UNSIGNED)), 0)
+    FROM patients
+    """)
@@ -0,0 +1,86 @@
+"""
+Normalised medical info: a term dictionary plus patient_allergies / patient_conditions /
+patient_medications link tables, backfilled from the patients JSON columns.
+"""
+import json
+
+VERSION = 6
+DESCRIPTION = "medical term tables"
+
+# JSON column -> (medical_terms.kind, link table)
+LINK_TABLES = {
+    "allergies": ("allergy", "patient_allergies"),
+    "chronic_illnesses": ("condition", "patient_conditions"),
+    "current_medications": ("medication", "patient_medications"),
+}
+
+
+def upgrade(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS medical_terms (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        kind ENUM('allergy', 'condition', 'medication') NOT NULL,
+        name VARCHAR(100) NOT NULL,
+        normalized_name VARCHAR(100) NOT NULL,
+        UNIQUE KEY uq_medical_terms_kind_name (kind, normalized_name)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    """)
+
+    for kind, table in LINK_TABLES.values():
+        # PK serves patient -> terms, the secondary index serves term -> patients
+        cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            patient_id INT NOT NULL,
+            term_id INT NOT NULL,
+            PRIMARY KEY (patient_id, term_id),
+            KEY idx_{table}_term (term_id, patient_id),
+            FOREIGN KEY (patient_id) REFERENCES patients(id) ON DELETE CASCADE,
+            FOREIGN KEY (term_id) REFERENCES medical_terms(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+        """)
+
+    backfill(cursor)
+
+
+def _normalize(name: str) -> str:
+    return " ".join(name.split()).lower()[:100]
+
+
+def backfill(cursor):
+    cursor.execute("SELECT id, allergies, chronic_illnesses, current_medications FROM patients")
+    rows = cursor.fetchall()
+
+    terms = {}   # (kind, normalized) -> display name
+    links = []   # (table, patient_id, kind, normalized)
+    for patient_id, *values in rows:
+        for column, value in zip(LINK_TABLES, values):
+            kind, table = LINK_TABLES[column]
+            try:
+                items = json.loads(value) if value else []
+            except (ValueError, TypeError):
+                continue
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                # Same rule as the UI: numbers are not medical terms
+                if not isinstance(item, str) or not item.strip() or item.strip().isdigit():
+                    continue
+                normalized = _normalize(item)
+                terms.setdefault((kind, normalized), " ".join(item.split())[:100])
+                links.append((table, patient_id, kind, normalized))
+
+    if not terms:
+        return
+
+    cursor.executemany(
+        "INSERT IGNORE INTO medical_terms (kind, name, normalized_name) VALUES (%s, %s, %s)",
+        [(kind, name, normalized) for (kind, normalized), name in terms.items()]
+    )
+    cursor.execute("SELECT id, kind, normalized_name FROM medical_terms")
+    term_ids = {(kind, normalized): term_id for term_id, kind, normalized in cursor.fetchall()}
+
+    for kind, table in LINK_TABLES.values():
+        pairs = [(patient_id, term_ids[(k, normalized)])
+                 for t, patient_id, k, normalized in links if t == table]
+        if pairs:
+            cursor.executemany(f"INSERT IGNORE INTO {table} (patient_id, term_id) VALUES (%s, %s)", pairs)
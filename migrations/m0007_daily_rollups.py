@@ -0,0 +1,42 @@
+"""
+Daily rollup table: per-day counts of new patients and appointments, in total and per status,
+doctor and visit type, backfilled from the existing rows. Kept current by database.py writes.
+"""
+
+VERSION = 7
+DESCRIPTION = "daily rollups"
+
+# metric (source table) -> {dimension: source column}; snapshot of database.ROLLUP_DIMENSIONS
+DIMENSIONS = {
+    "appointments": {"status": "status", "doctor": "doctor_id", "visit_type": "consultation_type"},
+    "patients": {"status": "status", "doctor": "assigned_doctor", "visit_type": "visit_type"},
+}
+
+
+def upgrade(cursor):
+    # The primary key serves every read: one metric/dimension/value over a range of days
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS daily_rollups (
+        metric ENUM('appointments', 'patients') NOT NULL,
+        dimension ENUM('total', 'status', 'doctor', 'visit_type') NOT NULL,
+        value VARCHAR(100) NOT NULL DEFAULT '',
+        day DATE NOT NULL,
+        count INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (metric, dimension, value, day)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    """)
+
+    backfill(cursor)
+
+
+def backfill(cursor):
+    for metric, columns in DIMENSIONS.items():
+        buckets = {"total": "''", **{dimension: f"COALESCE({column}, '')" for dimension, column in columns.items()}}
+        for dimension, expression in buckets.items():
+            cursor.execute(f"""
+            INSERT INTO daily_rollups (metric, dimension, value, day, count)
+            SELECT '{metric}', '{dimension}', {expression}, DATE(created_at), COUNT(*)
+            FROM {metric}
+            GROUP BY {expression}, DATE(created_at)
+            ON DUPLICATE KEY UPDATE count = VALUES(count)
+            """)
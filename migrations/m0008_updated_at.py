@@ -0,0 +1,17 @@
+"""updated_at change watermark on staff, patients and appointments, indexed for change probes and delta reads."""
+
+VERSION = 8
+DESCRIPTION = "updated_at watermarks"
+
+TABLES = ("doctors", "hrs", "patients", "appointments")
+
+
+def upgrade(cursor):
+    for table in TABLES:
+        cursor.execute(f"""
+        ALTER TABLE {table} ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP(6) NOT NULL
+            DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)
+        """)
+        # Microseconds: a second write in the same second as the last probe still moves the watermark
+        # MAX(updated_at) is read from the end of this index; delta reads are a range scan on it
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_updated ON {table} (updated_at)")
@@ -0,0 +1,15 @@
+"""Microsecond updated_at on databases that applied m0008 while it still created a one-second column."""
+
+VERSION = 9
+DESCRIPTION = "microsecond updated_at watermarks"
+
+TABLES = ("doctors", "hrs", "patients", "appointments")
+
+
+def upgrade(cursor):
+    for table in TABLES:
+        # Idempotent: a database created with the current m0008 already has TIMESTAMP(6)
+        cursor.execute(f"""
+        ALTER TABLE {table} MODIFY COLUMN updated_at TIMESTAMP(6) NOT NULL
+            DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)
+        """)
@@ -0,0 +1,20 @@
+"""Seed the staff ID counters from the IDs already issued, so allocation never has to scan the staff tables."""
+
+VERSION = 10
+DESCRIPTION = "staff id counters"
+
+# table -> role letter of its user_ids (YYYY + letter + number, e.g. 2026D0007); see database.STAFF_ID_PREFIXES
+STAFF_TABLES = {"doctors": "D", "hrs": "H", "admins": "A"}
+
+
+def upgrade(cursor):
+    for table, letter in STAFF_TABLES.items():
+        # One counter per role and year: staff_<YYYY><letter> holds the highest number issued so far
+        cursor.execute(f"""
+        INSERT INTO id_counters (name, value)
+        SELECT CONCAT('staff_', LEFT(user_id, 5)), MAX(CAST(SUBSTRING(user_id, 6) AS UNSIGNED))
+        FROM {table}
+        WHERE user_id REGEXP '^[0-9]{{4}}{letter}[0-9]+$'
+        GROUP BY LEFT(user_id, 5)
+        ON DUPLICATE KEY UPDATE value = GREATEST(value, VALUES(value))
+        """)
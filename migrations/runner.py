@@ -0,0 +1,127 @@
+import importlib
+import os
+import pkgutil
+import re
+
+from mysql.connector import Error
+
+# MySQL/MariaDB error code for "table doesn't exist"
+ER_NO_SUCH_TABLE = 1146
+
+# Advisory lock held while migrations are applied, so two app instances starting
+# at the same time cannot run the same script twice
+MIGRATION_LOCK = "nexacare_schema_migration"
+MIGRATION_LOCK_TIMEOUT = 60
+
+_MODULE_PATTERN = re.compile(r"^m(\d{4})_\w+$")
+_migrations = None
+
+
+class MigrationError(Exception):
+    """Raised when the migration scripts are inconsistent or one of them fails."""
+
+
+def discover_migrations() -> list:
+    """
+    Import every mNNNN_*.py module in this package, ordered by VERSION.
+    The result is cached; migration modules are only imported once per process.
+    """
+    global _migrations
+    if _migrations is not None:
+        return _migrations
+
+    found = []
+    for module_info in pkgutil.iter_modules([os.path.dirname(__file__)]):
+        match = _MODULE_PATTERN.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{__package__}.{module_info.name}")
+        if getattr(module, "VERSION", None) != int(match.group(1)):
+            raise MigrationError(f"{module_info.name}: VERSION does not match the file name")
+        if not callable(getattr(module, "upgrade", None)):
+            raise MigrationError(f"{module_info.name}: missing upgrade(cursor)")
+        found.append(module)
+
+    found.sort(key=lambda m: m.VERSION)
+    versions = [m.VERSION for m in found]
+    if len(versions) != len(set(versions)):
+        raise MigrationError("Duplicate migration versions found")
+
+    _migrations = found
+    return _migrations
+
+
+def latest_version() -> int:
+    """Highest migration version shipped with the application (0 if there are none)"""
+    migrations = discover_migrations()
+    return migrations[-1].VERSION if migrations else 0
+
+
+def current_version(cursor) -> int:
+    """Highest version recorded in schema_version, or 0 if the table does not exist yet"""
+    try:
+        cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    except Error as e:
+        if e.errno == ER_NO_SUCH_TABLE:
+            return 0
+        raise
+    return cursor.fetchone()[0]
+
+
+def _ensure_version_table(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INT PRIMARY KEY,
+        description VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+    """)
+
+
+def run_migrations(conn) -> tuple[int, list]:
+    """
+    Bring the schema up to latest_version().
+
+    Fast path: a single SELECT when the database is already current. Otherwise the pending
+    scripts run in VERSION order under an advisory lock, each one recorded in schema_version
+    as soon as it succeeds. DDL commits implicitly in MariaDB, so scripts must be idempotent
+    (IF NOT EXISTS / IF EXISTS) to be safely re-run after a failure part-way through.
+
+    Returns: (schema version after the run, list of versions applied by this call)
+    """
+    target = latest_version()
+    cursor = conn.cursor()
+    try:
+        if current_version(cursor) >= target:
+            return target, []
+
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (MIGRATION_LOCK, MIGRATION_LOCK_TIMEOUT))
+        if cursor.fetchone()[0] != 1:
+            raise MigrationError("Timed out waiting for another process to finish migrating")
+        try:
+            _ensure_version_table(cursor)
+            # Another process may have migrated while we waited for the lock
+            version = current_version(cursor)
+            applied = []
+            for migration in discover_migrations():
+                if migration.VERSION <= version:
+                    continue
+                print(f"Applying migration {migration.VERSION:04d}: {migration.DESCRIPTION}")
+                try:
+                    migration.upgrade(cursor)
+                    cursor.execute(
+                        "INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+                        (migration.VERSION, migration.DESCRIPTION)
+                    )
+                    conn.commit()
+                except Error as e:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    raise MigrationError(f"Migration {migration.VERSION:04d} failed: {e}") from e
+                applied.append(migration.VERSION)
+            return target, applied
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+            cursor.fetchone()
+    finally:
+        cursor.close()
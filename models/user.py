@@ -1,4 +1,5 @@
-from database import get_connection, generate_user_id
+import database
+from database import get_connection, next_staff_id, invalidate_staff_cache, _drop_doctor_rollups
 from mysql.connector import Error
 
 def get_user(email_or_id: str, password: str, role: str) -> dict:
@@ -27,53 +28,36 @@ def get_user(email_or_id: str, password: str, role: str) -> dict:
             cursor.close()
             conn.close()
 
-def get_all_doctors() -> list:
-    """Fetch all doctors from the database"""
+def user_exists(email_or_id: str, role: str) -> bool:
+    """Whether an account with this email or ID exists for the role (used to explain a failed sign-in)"""
     try:
         conn = get_connection()
         if conn is None:
-            return []
-            
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-        SELECT user_id, first_name, last_name, email, is_verified
-        FROM doctors
-        ORDER BY created_at DESC
-        """)
-        doctors = cursor.fetchall()
-        return doctors
-        
+            return False
+
+        table = "doctors" if role == "Doctor" else ("hrs" if role == "HR" else "admins")
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT 1 FROM {table} WHERE email = %s OR user_id = %s LIMIT 1",
+            (email_or_id, email_or_id)
+        )
+        return cursor.fetchone() is not None
+
     except Error as e:
-        print(f"Error getting doctors: {e}")
-        return []
+        print(f"Error checking user: {e}")
+        return False
     finally:
         if conn and conn.is_connected():
             cursor.close()
             conn.close()
 
+def get_all_doctors() -> list:
+    """Fetch all doctors from the database (served from the reference cache)"""
+    return database.get_all_doctors()
+
 def get_all_hrs() -> list:
-    """Fetch all HR staff from the database"""
-    try:
-        conn = get_connection()
-        if conn is None:
-            return []
-            
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-        SELECT user_id, first_name, last_name, email, is_verified
-        FROM hrs
-        ORDER BY created_at DESC
-        """)
-        hrs = cursor.fetchall()
-        return hrs
-        
-    except Error as e:
-        print(f"Error getting HR staff: {e}")
-        return []
-    finally:
-        if conn and conn.is_connected():
-            cursor.close()
-            conn.close()
+    """Fetch all HR staff from the database (served from the reference cache)"""
+    return database.get_all_hrs()
 
 def create_user(first_name: str, last_name: str, email: str, password: str, role: str) -> tuple[bool, str, str]:
     """
@@ -103,9 +87,8 @@ def create_user(first_name: str, last_name: str, email: str, password: str, role
         if role not in ['Doctor', 'HR', 'Admin']:
             return False, "Invalid role selected", None
 
-        user_id = generate_user_id(role)
-        if not user_id:
-            return False, "Failed to generate user ID", None
+        # Allocate the ID in the same transaction as the insert
+        user_id = next_staff_id(cursor, role)
             
         # Insert new user into the correct table
         cursor.execute(f"""
@@ -114,9 +97,12 @@ def create_user(first_name: str, last_name: str, email: str, password: str, role
         """, (user_id, first_name, last_name, email, password))
         
         conn.commit()
+        invalidate_staff_cache(role)
         return True, "Account created successfully", user_id
         
     except Error as e:
+        if conn and conn.in_transaction:
+            conn.rollback()
         print(f"Error creating user: {e}")
         error_message = str(e)
         
@@ -152,6 +138,7 @@ def verify_doctor(user_id: str) -> tuple[bool, str]:
         """, (user_id,))
         
         conn.commit()
+        invalidate_staff_cache("Doctor")
         return True, "Doctor verified successfully"
         
     except Error as e:
@@ -170,13 +157,15 @@ def delete_doctor(user_id: str) -> tuple[bool, str]:
             
         cursor = conn.cursor()
         
-        # Delete doctor from database
+        # Delete doctor from database; its appointments cascade and its patients become unassigned
+        _drop_doctor_rollups(cursor, user_id)
         cursor.execute("""
         DELETE FROM doctors 
         WHERE user_id = %s
         """, (user_id,))
         
         conn.commit()
+        invalidate_staff_cache("Doctor")
         return True, "Doctor deleted successfully"
         
     except Error as e:
@@ -221,6 +210,7 @@ def update_doctor(user_id: str, first_name: str, last_name: str, email: str) ->
         """, (first_name, last_name, email, user_id))
         
         conn.commit()
+        invalidate_staff_cache("Doctor")
         return True, "Doctor information updated successfully"
         
     except Error as e:
@@ -255,6 +245,7 @@ def verify_hr(user_id: str) -> tuple[bool, str]:
         """, (user_id,))
         
         conn.commit()
+        invalidate_staff_cache("HR")
         return True, "HR staff verified successfully"
         
     except Error as e:
@@ -280,6 +271,7 @@ def delete_hr(user_id: str) -> tuple[bool, str]:
         """, (user_id,))
         
         conn.commit()
+        invalidate_staff_cache("HR")
         return True, "HR staff deleted successfully"
         
     except Error as e:
@@ -324,6 +316,7 @@ def update_hr(user_id: str, first_name: str, last_name: str, email: str) -> tupl
         """, (first_name, last_name, email, user_id))
         
         conn.commit()
+        invalidate_staff_cache("HR")
         return True, "HR staff information updated successfully"
         
     except Error as e:
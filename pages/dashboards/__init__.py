@@ -1,7 +1,52 @@
-# empty file
+# Role dashboards are imported on demand: hr.py and admin.py are large and pull in the data
+# layer, so importing them only for the role that signs in keeps the login screen fast.
 
-from .dr import dashboard_ui as doctor
-from .hr import dashboard_ui as hr
-from .admin import dashboard_ui as admin
+import importlib
+import threading
 
-__all__ = ['doctor', 'hr', 'admin']
+# role -> module providing dashboard_ui(page, user)
+DASHBOARD_MODULES = {
+    "Doctor": "pages.dashboards.dr",
+    "HR": "pages.dashboards.hr",
+    "Admin": "pages.dashboards.admin",
+}
+
+# Import the dashboards in the background once the login screen is up (see warm_up)
+WARM_UP_DASHBOARDS = True
+
+# Former eager exports, resolved lazily by __getattr__
+_LEGACY_NAMES = {"doctor": "Doctor", "hr": "HR", "admin": "Admin"}
+
+
+def load_dashboard(role: str):
+    """Import (once) and return the dashboard_ui function for a role"""
+    return importlib.import_module(DASHBOARD_MODULES[role]).dashboard_ui
+
+
+def warm_up(roles=None):
+    """
+    Import dashboards on a background thread so the first sign-in does not pay for it.
+    Does nothing when WARM_UP_DASHBOARDS is off. Returns the thread, or None.
+    """
+    if not WARM_UP_DASHBOARDS:
+        return None
+
+    def run():
+        for role in roles or DASHBOARD_MODULES:
+            try:
+                load_dashboard(role)
+            except Exception as e:
+                print(f"Error warming up {role} dashboard: {e}")
+
+    thread = threading.Thread(target=run, name="nexacare-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def __getattr__(name):
+    if name in _LEGACY_NAMES:
+        return load_dashboard(_LEGACY_NAMES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['load_dashboard', 'warm_up', 'doctor', 'hr', 'admin']
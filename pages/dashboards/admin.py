@@ -4,7 +4,11 @@ import time
 sys.path.append("../")
 from utils.navigation import navigate_to_login, create_sidebar
 from models.user import get_all_doctors, get_all_hrs, verify_doctor, delete_doctor, update_doctor, verify_hr, delete_hr, update_hr
-from database import create_user  # Import create_user from database instead
+from database import create_user, get_dashboard_stats, get_recent_staff, get_staff_changes, get_staff_ids, get_change_probe, invalidate_staff_cache  # Import create_user from database instead
+from utils.prefetch import prefetched
+from utils.refresher import get_refresher, stop_refresher
+from utils.reconcile import reconcile_grid, publish_update
+from utils.async_db import SearchController
 
 # Define admin theme colors
 ADMIN_BLACK = "#1A1A1A"  # Deep black for text and buttons
@@ -326,17 +330,14 @@ def create_dashboard_content(page: ft.Page, user: dict, add_doctor_modal: ft.Con
         padding=20,
     )
 
-    # Get all doctors and HR staff
-    all_doctors = get_all_doctors()
-    all_hrs = get_all_hrs()
-    
-    # Calculate statistics
-    total_doctors = len(all_doctors)
-    total_hrs = len(all_hrs)
-    verified_doctors = len([d for d in all_doctors if d.get('is_verified', False)])
-    verified_hrs = len([h for h in all_hrs if h.get('is_verified', False)])
-    pending_doctors = len([d for d in all_doctors if not d.get('is_verified', False)])
-    pending_hrs = len([h for h in all_hrs if not h.get('is_verified', False)])
+    # Staff counters from one aggregate query (prefetched at sign-in)
+    stats = prefetched(page, "stats", get_dashboard_stats)
+    total_doctors = stats["doctors"]["total"]
+    total_hrs = stats["hrs"]["total"]
+    verified_doctors = stats["doctors"]["verified"]
+    verified_hrs = stats["hrs"]["verified"]
+    pending_doctors = stats["doctors"]["pending"]
+    pending_hrs = stats["hrs"]["pending"]
 
     # Overview Cards
     def create_stat_card(title, value, subtitle, icon, color):
@@ -429,7 +430,7 @@ def create_dashboard_content(page: ft.Page, user: dict, add_doctor_modal: ft.Con
     )
 
     # Create doctors grid with simple cards
-    doctor_cards = [create_dashboard_doctor_card(doctor, page, dialog_modal, handle_menu_selection, main_content) for doctor in get_all_doctors()[:5]]
+    doctor_cards = [create_dashboard_doctor_card(doctor, page, dialog_modal, handle_menu_selection, main_content) for doctor in prefetched(page, "recent_doctors", get_recent_staff, "Doctor")]
     if not doctor_cards:
         doctor_cards = [ft.Container(width=280, height=220, opacity=0)]  # Invisible placeholder
     doctors_grid = ft.Row(
@@ -462,7 +463,7 @@ def create_dashboard_content(page: ft.Page, user: dict, add_doctor_modal: ft.Con
     )
 
     # Create HR grid with simple cards
-    hr_cards = [create_dashboard_hr_card(hr, page, dialog_modal, handle_menu_selection, main_content) for hr in get_all_hrs()[:5]]
+    hr_cards = [create_dashboard_hr_card(hr, page, dialog_modal, handle_menu_selection, main_content) for hr in prefetched(page, "recent_hrs", get_recent_staff, "HR")]
     if not hr_cards:
         hr_cards = [ft.Container(width=280, height=220, opacity=0)]  # Invisible placeholder
     hrs_grid = ft.Row(
@@ -506,11 +507,10 @@ def update_doctors_grid(page: ft.Page, doctors_grid: ft.Row, dialog_modal: ft.Co
     # Get fresh data from database
     doctors = get_all_doctors()
     
-    # Create new cards with updated data
-    doctors_grid.controls = [create_doctor_card(doctor, page, dialog_modal, doctors_grid, success_text) for doctor in doctors]
-    
-    # Update the page to reflect changes
-    page.update()
+    # Rebuild only the cards whose rows changed
+    stats = reconcile_grid(doctors_grid, doctors, key=lambda row: row['user_id'],
+                           build=lambda row: create_doctor_card(row, page, dialog_modal, doctors_grid, success_text))
+    publish_update(page, "doctors grid", stats)
 
 def handle_verify_doctor(doctor: dict, page: ft.Page, dialog_modal: ft.Container, doctors_grid: ft.Row, success_text: ft.Text):
     """Handle doctor verification"""
@@ -1308,7 +1308,8 @@ def handle_delete_doctor(doctor: dict, page: ft.Page, dialog_modal: ft.Container
             doctors = [d for d in doctors if d['user_id'] != doctor['user_id']]
             
             # Update the UI to reflect the change
-            doctors_grid.controls = [create_doctor_card(d, page, dialog_modal, doctors_grid, success_text) for d in doctors]
+            reconcile_grid(doctors_grid, doctors, key=lambda row: row['user_id'],
+                           build=lambda row: create_doctor_card(row, page, dialog_modal, doctors_grid, success_text))
             
             # Show success message
             success_dialog = ft.Container(
@@ -1555,6 +1556,34 @@ def create_doctor_card(doctor: dict, page: ft.Page, dialog_modal: ft.Container,
         ),
     )
 
+def load_staff_rows(role: str, table: str):
+    """
+    Uncached {user_id: row} of every doctor/HR and the change probe it is current as of. The probe
+    is taken first, so anything written while the rows are read shows up on the next poll.
+    """
+    baseline = get_change_probe(table)
+    return {row['user_id']: row for row in get_staff_changes(role, None)}, baseline
+
+def merge_staff_changes(rows: dict, role: str, since) -> dict:
+    """
+    Apply doctor/HR rows changed since the `since` watermark to {user_id: row}, new rows first,
+    and drop rows whose user_id is gone. Falls back to a full reload if an id is still unaccounted for.
+    """
+    changed = get_staff_changes(role, since)
+    # The change may come from another session, so this process's cached list is stale too
+    invalidate_staff_cache(role)
+    merged = {row['user_id']: row for row in changed if row['user_id'] not in rows}
+    merged.update(rows)
+    merged.update((row['user_id'], row) for row in changed)
+    # Compare id sets rather than counts: a delete and an insert in one interval leave the count unchanged
+    ids = get_staff_ids(role)
+    if ids is None:
+        return merged
+    merged = {user_id: row for user_id, row in merged.items() if user_id in ids}
+    if merged.keys() != ids:
+        merged = {row['user_id']: row for row in get_staff_changes(role, None)}
+    return merged
+
 def create_doctors_tab(page: ft.Page, user: dict, add_doctor_modal: ft.Container, doctors_grid: ft.Row, show_add_doctor_form, dialog_modal: ft.Container, success_text: ft.Text) -> ft.Container:
     """Create a comprehensive doctors tab with detailed information and management features"""
     
@@ -1601,9 +1630,12 @@ def create_doctors_tab(page: ft.Page, user: dict, add_doctor_modal: ft.Container
                     border_radius=6,
     )
 
-    def filter_doctors():
-        # Get all doctors
-        all_doctors = get_all_doctors()
+    # Rows shown by this tab, kept current by the session refresher from the baseline probe on
+    doctor_rows, doctor_baseline = load_staff_rows("Doctor", "doctors")
+    doctor_state = {"rows": doctor_rows}
+
+    def matching_doctors():
+        all_doctors = list(doctor_state["rows"].values())
         
         # Apply search filter
         search_term = search_field.value.lower() if search_field.value else ""
@@ -1624,43 +1656,52 @@ def create_doctors_tab(page: ft.Page, user: dict, add_doctor_modal: ft.Container
                 if doctor.get('is_verified', False) == is_verified
             ]
         
-        # Update the grid with filtered doctors or show no results message
-        if filtered_doctors:
-            doctors_grid.controls = [create_doctor_card(doctor, page, dialog_modal, doctors_grid, success_text) for doctor in filtered_doctors]
-        else:
-            doctors_grid.controls = [
-                ft.Container(
-                    content=ft.Column(
-                        controls=[
-                            ft.Icon(
-                                ft.Icons.SEARCH_OFF,
-                                size=48,
-                                color=ADMIN_GRAY_MEDIUM,
-                            ),
-                            ft.Text(
-                                "No doctors found",
-                                size=20,
-                                weight=ft.FontWeight.BOLD,
-                                color=ADMIN_WHITE,
-                            ),
-                            ft.Text(
-                                "Try adjusting your search or filter criteria",
-                                size=14,
-                                color=ADMIN_GRAY_MEDIUM,
-                            ),
-                        ],
-                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                        spacing=10,
-                    ),
-                    alignment=ft.alignment.center,
-                    padding=40,
-                )
-            ]
-        page.update()
+        return filtered_doctors
+
+    def show_doctors(filtered_doctors):
+        # Reuse unchanged cards; show a no results message when nothing matches
+        def no_results():
+            return ft.Container(
+                content=ft.Column(
+                    controls=[
+                        ft.Icon(
+                            ft.Icons.SEARCH_OFF,
+                            size=48,
+                            color=ADMIN_GRAY_MEDIUM,
+                        ),
+                        ft.Text(
+                            "No doctors found",
+                            size=20,
+                            weight=ft.FontWeight.BOLD,
+                            color=ADMIN_WHITE,
+                        ),
+                        ft.Text(
+                            "Try adjusting your search or filter criteria",
+                            size=14,
+                            color=ADMIN_GRAY_MEDIUM,
+                        ),
+                    ],
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                    spacing=10,
+                ),
+                alignment=ft.alignment.center,
+                padding=40,
+            )
+
+        stats = reconcile_grid(doctors_grid, filtered_doctors, key=lambda row: row['user_id'],
+                               build=lambda row: create_doctor_card(row, page, dialog_modal, doctors_grid, success_text),
+                               empty=no_results)
+        publish_update(page, "doctors grid", stats)
+
+    def filter_doctors():
+        show_doctors(matching_doctors())
+
+    # Typing re-filters once input pauses; the status dropdown applies at once
+    doctor_search = SearchController(matching_doctors, show_doctors)
 
     # Add event handlers for search and filter
-    search_field.on_change = lambda _: filter_doctors()
-    status_dropdown.on_change = lambda _: filter_doctors()
+    search_field.on_change = lambda _: doctor_search.changed()
+    status_dropdown.on_change = lambda _: doctor_search.submit()
 
     search_bar = ft.Container(
         content=ft.Row(
@@ -1694,15 +1735,12 @@ def create_doctors_tab(page: ft.Page, user: dict, add_doctor_modal: ft.Container
     # Initial load of doctors
     filter_doctors()
 
-    # Set up auto-refresh timer
-    def auto_refresh():
-        while True:
-            time.sleep(5)  # Refresh every 5 seconds
-            filter_doctors()
+    # Poll for changes while this tab is open; only changed rows are fetched
+    def apply_changes(since, probe):
+        doctor_state["rows"] = merge_staff_changes(doctor_state["rows"], "Doctor", since)
+        filter_doctors()
 
-    # Start auto-refresh in a separate thread
-    import threading
-    threading.Thread(target=auto_refresh, daemon=True).start()
+    get_refresher(page).watch("doctors", apply_changes, doctor_baseline)
 
     # Main content container
     return ft.Container(
@@ -1765,9 +1803,12 @@ def create_hr_tab(page: ft.Page, user: dict, add_hr_modal: ft.Container, hrs_gri
                     border_radius=6,
     )
 
-    def filter_hrs():
-        # Get all HR staff
-        all_hrs = get_all_hrs()
+    # Rows shown by this tab, kept current by the session refresher from the baseline probe on
+    hr_rows, hr_baseline = load_staff_rows("HR", "hrs")
+    hr_state = {"rows": hr_rows}
+
+    def matching_hrs():
+        all_hrs = list(hr_state["rows"].values())
         
         # Apply search filter
         search_term = search_field.value.lower() if search_field.value else ""
@@ -1788,56 +1829,62 @@ def create_hr_tab(page: ft.Page, user: dict, add_hr_modal: ft.Container, hrs_gri
                 if hr.get('is_verified', False) == is_verified
             ]
         
-        # Update the grid with filtered HR staff or show no results message
-        if filtered_hrs:
-            hrs_grid.controls = [create_hr_card(hr, page, dialog_modal, hrs_grid, success_text) for hr in filtered_hrs]
-        else:
-            hrs_grid.controls = [
-                ft.Container(
-                    content=ft.Column(
-                        controls=[
-                            ft.Icon(
-                                ft.Icons.SEARCH_OFF,
-                                size=48,
-                                color=ADMIN_GRAY_MEDIUM,
-                            ),
-                            ft.Text(
-                                "No HR staff found",
-                                size=20,
-                                weight=ft.FontWeight.BOLD,
-                                color=ADMIN_WHITE,
-                            ),
-                            ft.Text(
-                                "Try adjusting your search or filter criteria",
-                                size=14,
-                                color=ADMIN_GRAY_MEDIUM,
-                            ),
-                        ],
-                        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                        spacing=10,
-                    ),
-                    alignment=ft.alignment.center,
-                    padding=40,
-                )
-            ]
-        page.update()
+        return filtered_hrs
+
+    def show_hrs(filtered_hrs):
+        # Reuse unchanged cards; show a no results message when nothing matches
+        def no_results():
+            return ft.Container(
+                content=ft.Column(
+                    controls=[
+                        ft.Icon(
+                            ft.Icons.SEARCH_OFF,
+                            size=48,
+                            color=ADMIN_GRAY_MEDIUM,
+                        ),
+                        ft.Text(
+                            "No HR staff found",
+                            size=20,
+                            weight=ft.FontWeight.BOLD,
+                            color=ADMIN_WHITE,
+                        ),
+                        ft.Text(
+                            "Try adjusting your search or filter criteria",
+                            size=14,
+                            color=ADMIN_GRAY_MEDIUM,
+                        ),
+                    ],
+                    horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                    spacing=10,
+                ),
+                alignment=ft.alignment.center,
+                padding=40,
+            )
+
+        stats = reconcile_grid(hrs_grid, filtered_hrs, key=lambda row: row['user_id'],
+                               build=lambda row: create_hr_card(row, page, dialog_modal, hrs_grid, success_text),
+                               empty=no_results)
+        publish_update(page, "HR grid", stats)
+
+    def filter_hrs():
+        show_hrs(matching_hrs())
+
+    # Typing re-filters once input pauses; the status dropdown applies at once
+    hr_search = SearchController(matching_hrs, show_hrs)
 
     # Add event handlers for search and filter
-    search_field.on_change = lambda _: filter_hrs()
-    status_dropdown.on_change = lambda _: filter_hrs()
+    search_field.on_change = lambda _: hr_search.changed()
+    status_dropdown.on_change = lambda _: hr_search.submit()
 
     # Initial load of HR staff
     filter_hrs()
 
-    # Set up auto-refresh timer
-    def auto_refresh():
-        while True:
-            time.sleep(5)  # Refresh every 5 seconds
-            filter_hrs()
+    # Poll for changes while this tab is open; only changed rows are fetched
+    def apply_changes(since, probe):
+        hr_state["rows"] = merge_staff_changes(hr_state["rows"], "HR", since)
+        filter_hrs()
 
-    # Start auto-refresh in a separate thread
-    import threading
-    threading.Thread(target=auto_refresh, daemon=True).start()
+    get_refresher(page).watch("hrs", apply_changes, hr_baseline)
 
     # Return the HR tab content container
     return ft.Container(
@@ -2837,7 +2884,8 @@ def handle_delete_hr(hr: dict, page: ft.Page, dialog_modal: ft.Container, hrs_gr
             hrs = [h for h in hrs if h['user_id'] != hr['user_id']]
             
             # Update the UI to reflect the change
-            hrs_grid.controls = [create_hr_card(h, page, dialog_modal, hrs_grid, success_text) for h in hrs]
+            reconcile_grid(hrs_grid, hrs, key=lambda row: row['user_id'],
+                           build=lambda row: create_hr_card(row, page, dialog_modal, hrs_grid, success_text))
             
             # Show success message
             success_dialog = ft.Container(
@@ -2955,11 +3003,10 @@ def update_hrs_grid(page: ft.Page, hrs_grid: ft.Row, dialog_modal: ft.Container,
     # Get fresh data from database
     hrs = get_all_hrs()
     
-    # Create new cards with updated data
-    hrs_grid.controls = [create_hr_card(hr, page, dialog_modal, hrs_grid, success_text) for hr in hrs]
-    
-    # Update the page to reflect changes
-    page.update()
+    # Rebuild only the cards whose rows changed
+    stats = reconcile_grid(hrs_grid, hrs, key=lambda row: row['user_id'],
+                           build=lambda row: create_hr_card(row, page, dialog_modal, hrs_grid, success_text))
+    publish_update(page, "HR grid", stats)
 
 def dashboard_ui(page: ft.Page, user: dict):
     page.clean()
@@ -3664,6 +3711,7 @@ def dashboard_ui(page: ft.Page, user: dict):
     def handle_menu_selection(title: str, e, main_content: ft.Container):
         """Handle menu item selection"""
         current_selection.current = title
+        stop_refresher(page)  # the tab being left stops polling
         if title == "Doctors":
             main_content.content = create_doctors_tab(page, user, add_doctor_modal, doctors_grid, show_add_doctor_form, dialog_modal, success_text)
         elif title == "HRs":
@@ -3685,6 +3733,7 @@ def dashboard_ui(page: ft.Page, user: dict):
     # Update handle_menu_selection to properly pass main_content
     def handle_menu_selection(title: str, e, main_content: ft.Container):
         current_selection.current = title
+        stop_refresher(page)  # the tab being left stops polling
         if title == "Doctors":
             main_content.content = create_doctors_tab(page, user, add_doctor_modal, doctors_grid, show_add_doctor_form, dialog_modal, success_text)
         elif title == "HRs":
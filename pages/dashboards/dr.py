@@ -2,7 +2,8 @@ import flet as ft
 import sys
 sys.path.append("../")
 from utils.navigation import navigate_to_login, create_sidebar
-from database import get_all_appointments, get_all_patients, update_appointment_status, update_patient
+from database import get_all_appointments, get_appointment, get_patients_page, update_appointment_status, update_patient
+from utils.prefetch import prefetched
 
 def dashboard_ui(page, user):
     page.clean()
@@ -82,18 +83,18 @@ def dashboard_ui(page, user):
 
     # --- Appointments Tab ---
     def appointments_tab():
-        success, msg, appointments = get_all_appointments()
-        if not success or appointments is None:
+        success, msg, doctor_appointments = prefetched(page, "appointments", get_all_appointments,
+                                                       doctor_id=str(user["user_id"]), view="list")
+        if not success or doctor_appointments is None:
             return ft.Text("Failed to load appointments.", color=ft.Colors.RED)
-        # Filter for this doctor
-        doctor_appointments = [a for a in appointments if str(a.get("doctor_id")) == str(user["user_id"])]
         def mark_complete(apt):
             update_appointment_status(apt["id"], "Completed")
             page.snack_bar = ft.SnackBar(content=ft.Text("Appointment marked as completed."))
             page.snack_bar.open = True
             refresh()
         def view_details(apt):
-            # Simple modal for now
+            # The list leaves out notes; fetch the full appointment when the modal opens
+            apt = get_appointment(apt["id"]) or apt
             dialog_modal.content = ft.Container(
                 width=400,
                 bgcolor=ft.Colors.WHITE,
@@ -134,11 +135,8 @@ def dashboard_ui(page, user):
 
     # --- Patients Tab ---
     def patients_tab():
-        patients = get_all_patients()
         # Show patients assigned to this doctor or unassigned
         my_id = str(user["user_id"])
-        assigned = [p for p in patients if str(p.get("assigned_doctor", "")) == my_id]
-        unassigned = [p for p in patients if not p.get("assigned_doctor")]  # None or empty
         def take_over_patient(patient):
             update_patient(patient["id"], assigned_doctor=my_id)
             page.snack_bar = ft.SnackBar(content=ft.Text("You are now assigned to this patient."))
@@ -179,12 +177,30 @@ def dashboard_ui(page, user):
                     padding=15
                 )
             )
+        def paged_section(show_take_over, dataset, **filters):
+            # Cards are appended one page at a time; "Load more" follows the keyset cursor
+            cards = ft.Column(spacing=10)
+            state = {"cursor": None}
+            load_more = ft.TextButton("Load more", visible=False)
+            def load_page(e=None):
+                if e is None:
+                    # First page comes from the sign-in prefetch when there is one
+                    rows, state["cursor"] = prefetched(page, dataset, get_patients_page, view="summary", **filters)
+                else:
+                    rows, state["cursor"] = get_patients_page(cursor=state["cursor"], view="summary", **filters)
+                cards.controls.extend(patient_card(p, show_take_over) for p in rows)
+                load_more.visible = state["cursor"] is not None
+                if e is not None:
+                    refresh()
+            load_more.on_click = load_page
+            load_page()
+            return ft.Column([cards, load_more], spacing=10)
         return ft.Column([
             ft.Text("Assigned Patients", size=16, weight=ft.FontWeight.BOLD),
-            *(patient_card(p, False) for p in assigned),
+            paged_section(False, "assigned_patients", assigned_doctor=my_id),
             ft.Container(height=20),
             ft.Text("Unassigned Patients", size=16, weight=ft.FontWeight.BOLD),
-            *(patient_card(p, True) for p in unassigned),
+            paged_section(True, "unassigned_patients", unassigned=True),
         ], spacing=10)
 
     # Tab control
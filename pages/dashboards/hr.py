@@ -4,7 +4,12 @@ sys.path.append("../")
 from utils.navigation import navigate_to_login, create_sidebar
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
-from database import get_all_patients, add_patient, update_patient_status, delete_patient, update_patient, get_all_doctors, add_appointment, get_all_appointments
+from utils.export import export_patients, export_appointments
+from utils.async_db import run_async, LatestOnly, SearchController, loading_placeholder
+from utils.prefetch import prefetched
+from utils.reconcile import reconcile_grid, publish_update
+from utils.cache import LRUCache
+from database import get_all_patients, add_patient, update_patient_status, delete_patient, update_patient, get_all_doctors, add_appointment, get_all_appointments, get_patient, search_patients, search_patients_ranked, get_enum_values, get_dashboard_stats, get_dashboard_trends, DASHBOARD_RECENT_LIMIT, PATIENT_STATUSES, VISIT_TYPES
 from models.user import get_all_doctors
 
 visit_date_picker = None
@@ -53,26 +58,34 @@ def calculate_age_from_birthdate(birthdate_str):
     except Exception:
         return None
 
-def create_patient_card(patient, show_patient_details, handle_edit_patient, handle_delete_patient):
+# Derived display values of patient cards, keyed by patient_card_key so an edited row, a renamed
+# doctor or a new day (ages) recomputes; bounded so long sessions do not grow it without limit
+PATIENT_CARD_CACHE_SIZE = 500
+_patient_display_models = LRUCache(PATIENT_CARD_CACHE_SIZE)
+
+def patient_card_key(patient):
+    """
+    Cache key of a patient's card: (id, updated_at, doctor_name, today). The joined doctor_name is
+    part of it because renaming a doctor does not touch patients.updated_at. None if the row has no updated_at.
+    """
+    if patient.get('updated_at') is None:
+        return None
+    return (patient.get('id'), patient.get('updated_at'), patient.get('doctor_name'), datetime.today().date())
+
+def patient_display_model(patient):
+    """Status colour, doctor/consultation lines, medical info strings and age text shown on a patient card"""
+    key = patient_card_key(patient)
+    if key is None:
+        return _build_patient_display_model(patient)
+    return _patient_display_models.get(key, lambda: _build_patient_display_model(patient))
+
+def _build_patient_display_model(patient):
     status_color = status_colors.get(patient.get('status', 'Pending'), HR_GRAY)
     doctor_info = patient.get('doctor_name', 'Awaiting Doctor Assignment')
     if patient.get('doctor_id') or patient.get('doctor_name'):
         consultation_info = 'Accepted by doctor'
     else:
         consultation_info = 'To be determined by doctor'
-    avatar_content = (
-        ft.Container(
-            content=ft.Image(
-                src=patient.get('photo_path'),
-                width=60,
-                height=60,
-                fit=ft.ImageFit.COVER,
-            ),
-            border_radius=30,
-            clip_behavior=ft.ClipBehavior.HARD_EDGE,
-            border=ft.border.all(2, HR_PRIMARY),
-        ) if patient.get('photo_path') else ft.Text(patient.get('full_name', 'P')[0].upper(), size=24)
-    )
     chronic_illnesses = ', '.join(filter_words_only(patient.get('chronic_illnesses', ''))) or "None"
     allergies = ', '.join(filter_words_only(patient.get('allergies', ''))) or "None"
     current_medications = ', '.join(filter_words_only(patient.get('current_medications', ''))) or "None"
@@ -88,6 +101,38 @@ def create_patient_card(patient, show_patient_details, handle_edit_patient, hand
         elif not isinstance(age, int):
             age = None
     age_display = f"{age} years" if isinstance(age, int) and age > 0 else "N/A"
+    return {
+        "status_color": status_color,
+        "doctor_info": doctor_info,
+        "consultation_info": consultation_info,
+        "chronic_illnesses": chronic_illnesses,
+        "allergies": allergies,
+        "current_medications": current_medications,
+        "age_display": age_display,
+    }
+
+def create_patient_card(patient, show_patient_details, handle_edit_patient, handle_delete_patient):
+    model = patient_display_model(patient)
+    status_color = model["status_color"]
+    doctor_info = model["doctor_info"]
+    consultation_info = model["consultation_info"]
+    chronic_illnesses = model["chronic_illnesses"]
+    allergies = model["allergies"]
+    current_medications = model["current_medications"]
+    age_display = model["age_display"]
+    avatar_content = (
+        ft.Container(
+            content=ft.Image(
+                src=patient.get('photo_path'),
+                width=60,
+                height=60,
+                fit=ft.ImageFit.COVER,
+            ),
+            border_radius=30,
+            clip_behavior=ft.ClipBehavior.HARD_EDGE,
+            border=ft.border.all(2, HR_PRIMARY),
+        ) if patient.get('photo_path') else ft.Text(patient.get('full_name', 'P')[0].upper(), size=24)
+    )
     return ft.Container(
         content=ft.Column(
             controls=[
@@ -383,6 +428,10 @@ def _find_control_by_attr_recursive(control, attr):
                 return result
     return None
 
+# Patient grid layout: cards per row, and how close (px) to the end of the list the next page is fetched
+PATIENT_GRID_COLUMNS = 3
+PATIENT_SCROLL_PREFETCH = 600
+
 # --- Stat Card ---
 def create_stat_card(title, value, icon, color, trend=None):
     return ft.Container(
@@ -405,6 +454,26 @@ def create_stat_card(title, value, icon, color, trend=None):
         ),
     )
 
+# --- Schedule table ---
+APPOINTMENT_STATUS_COLORS = {
+    "Scheduled": HR_SUCCESS,
+    "Completed": HR_INFO,
+    "Pending": HR_WARNING,
+    "Cancelled": HR_ERROR,
+    "No Show": HR_ERROR
+}
+
+def appointment_date_parts(apt):
+    """(date, time) display strings for an appointment's appointment_date"""
+    value = apt.get("appointment_date")
+    if not value:
+        return "", ""
+    try:
+        date_obj = value if isinstance(value, datetime) else datetime.strptime(str(value), "%Y-%m-%d %H:%M:%S")
+        return date_obj.strftime("%Y-%m-%d"), date_obj.strftime("%I:%M %p")
+    except (ValueError, TypeError):
+        return str(value)[:10], ""
+
 # --- Appointment Timeline Item ---
 def create_appointment_timeline_item(apt, selected=False, on_select=None):
     status_color = HR_SUCCESS if apt.get('status') == 'completed' else (HR_WARNING if apt.get('status') == 'pending' else HR_ERROR)
@@ -548,9 +617,6 @@ def create_patients_tab(page, user):
     )
     container.content.controls.append(content_container)
     
-    # Get patients from database
-    patients = get_all_patients()
-    
     # Get verified doctors from database
     verified_doctors = [d for d in get_all_doctors() if d.get('is_verified', False)]
     doctors = [
@@ -578,47 +644,12 @@ def create_patients_tab(page, user):
     filter_state = {
         "status": None,
         "doctor": None,
-        "consultation_type": None
+        "visit_type": None
     }
 
     def apply_filters():
-        # Get all patients
-        all_patients = get_all_patients()
-        
-        # Apply search filter
-        search_term = search_field.value.lower() if search_field.value else ""
-        filtered_patients = [
-            p for p in all_patients
-            if (search_term in p['full_name'].lower() or 
-                search_term in p.get('last_name', '').lower() or 
-                search_term in str(p['id']).lower() or
-                search_term in p.get('phone', '').lower())
-        ]
-        
-        # Apply status filter
-        if filter_state["status"]:
-            filtered_patients = [
-                p for p in filtered_patients
-                if p['status'] == filter_state["status"]
-            ]
-            
-        # Apply doctor filter
-        if filter_state["doctor"]:
-            filtered_patients = [
-                p for p in filtered_patients
-                if p.get('doctor_id') == filter_state["doctor"]
-            ]
-            
-        # Apply consultation type filter
-        if filter_state["consultation_type"]:
-            filtered_patients = [
-                p for p in filtered_patients
-                if p.get('consultation_type') == filter_state["consultation_type"]
-            ]
-            
-        # Update the grid
-        patients_grid.controls = [create_patient_card(p) for p in filtered_patients]
-        page.update()
+        # Filter changes search at once; typing goes through the debounce in filter_patients
+        patient_search.submit(search_field.value, current_filters())
 
     def show_filter_modal(e):
         # Create filter modal content
@@ -637,11 +668,7 @@ def create_patients_tab(page, user):
                     value=filter_state["status"],
                     options=[
                         ft.dropdown.Option("All"),
-                        ft.dropdown.Option("Scheduled"),
-                        ft.dropdown.Option("Pending"),
-                        ft.dropdown.Option("Completed"),
-                        ft.dropdown.Option("Cancelled"),
-                        ft.dropdown.Option("No Show"),
+                        *[ft.dropdown.Option(v) for v in get_enum_values("patients", "status") or PATIENT_STATUSES]
                     ],
                     width=360,
                     border_color=HR_BORDER,
@@ -667,26 +694,20 @@ def create_patients_tab(page, user):
                     on_change=lambda e: filter_state.update({"doctor": e.control.value if e.control.value != "All" else None})
                 ),
                 ft.Container(height=10),
-                # Consultation type filter
+                # Visit type filter
                 ft.Dropdown(
-                    label="Consultation Type",
-                    value=filter_state["consultation_type"],
+                    label="Visit Type",
+                    value=filter_state["visit_type"],
                     options=[
                         ft.dropdown.Option("All"),
-                        ft.dropdown.Option("General Checkup"),
-                        ft.dropdown.Option("Follow-up"),
-                        ft.dropdown.Option("Emergency"),
-                        ft.dropdown.Option("Specialist Consultation"),
-                        ft.dropdown.Option("Lab Test"),
-                        ft.dropdown.Option("Vaccination"),
-                        ft.dropdown.Option("Other"),
+                        *[ft.dropdown.Option(v) for v in get_enum_values("patients", "visit_type") or VISIT_TYPES]
                     ],
                     width=360,
                     border_color=HR_BORDER,
                     focused_border_color=HR_PRIMARY,
                     text_style=ft.TextStyle(color=HR_TEXT),
                     label_style=ft.TextStyle(color=HR_TEXT),
-                    on_change=lambda e: filter_state.update({"consultation_type": e.control.value if e.control.value != "All" else None})
+                    on_change=lambda e: filter_state.update({"visit_type": e.control.value if e.control.value != "All" else None})
                 ),
                 ft.Container(height=20),
                 # Action buttons
@@ -709,7 +730,7 @@ def create_patients_tab(page, user):
                                 padding=ft.padding.symmetric(horizontal=24, vertical=12),
                             ),
                             on_click=lambda e: (
-                                filter_state.update({"status": None, "doctor": None, "consultation_type": None}),
+                                filter_state.update({"status": None, "doctor": None, "visit_type": None}),
                                 setattr(filter_modal.current, "visible", False),
                                 apply_filters()
                             )
@@ -740,6 +761,8 @@ def create_patients_tab(page, user):
         return str(x)
 
     def show_patient_details(patient):
+        # Cards only carry the listed columns; load the full record for the modal
+        patient = get_patient(patient['id']) or patient
         # Get doctor and consultation info
         doctor_info = patient.get('doctor_name', 'Awaiting Doctor Assignment')
         # Show consultation status based on doctor assignment
@@ -921,11 +944,113 @@ def create_patients_tab(page, user):
         patient_details_modal.current.visible = True
         page.update()
 
-    def refresh_patients():
-        patients = get_all_patients()
-        patients_grid.controls = [create_patient_card(p) for p in patients]
+    # Keyset pagination state: rows loaded so far and the cursor for the next page
+    patient_page_state = {"cursor": None, "loaded": [], "loading": False}
+
+    # Built cards of this tab (their buttons call this tab's handlers), keyed like the display models;
+    # filtering back and forth over the same patients reuses them instead of rebuilding
+    patient_cards = LRUCache(PATIENT_CARD_CACHE_SIZE)
+
+    def patient_grid_item(p):
+        def build():
+            return ft.Container(
+                content=create_patient_card(p, show_patient_details, handle_edit_patient, handle_delete_patient),
+                width=280,
+                margin=ft.margin.only(bottom=15, right=10)
+            )
+        key = patient_card_key(p)
+        return build() if key is None else patient_cards.get(key, build)
+
+    def fetch_patient_rows(term, filters, cursor):
+        if term and term.strip():
+            # Text search shows the best matches first instead of paging by date; its cursor continues the ranking
+            return search_patients_ranked(term, cursor=cursor, view="card", **filters)
+        return search_patients(cursor=cursor, view="card", **filters)
+
+    def current_filters():
+        return {
+            "status": filter_state["status"],
+            "doctor": filter_state["doctor"],
+            "visit_type": filter_state["visit_type"],
+        }
+
+    def patient_grid_row(chunk):
+        return ft.Row([patient_grid_item(p) for p in chunk], spacing=10, width=900)
+
+    def show_patient_rows(result, reset=False):
+        page_rows, next_cursor = result
+        if reset:
+            patient_page_state["loaded"] = []
+        patient_page_state["cursor"] = next_cursor
+        patient_page_state["loaded"].extend(page_rows)
+        loaded = patient_page_state["loaded"]
+        chunks = [loaded[i:i + PATIENT_GRID_COLUMNS] for i in range(0, len(loaded), PATIENT_GRID_COLUMNS)]
+        # One list item per row of cards; rows whose patients (id, updated_at and doctor) are unchanged are reused
+        stats = reconcile_grid(patients_grid, chunks, key=lambda chunk: tuple(p['id'] for p in chunk),
+                               version=lambda chunk: tuple((p.get('updated_at'), p.get('doctor_name')) for p in chunk),
+                               build=patient_grid_row)
+        patients_grid.controls.append(load_more_indicator)
+        return stats
+
+    def load_patient_page(reset=False):
+        cursor = None if reset else patient_page_state["cursor"]
+        return show_patient_rows(fetch_patient_rows(search_field.value, current_filters(), cursor), reset)
+
+    # Only the newest search or page load is rendered; slower, older ones are dropped
+    patient_searches = LatestOnly()
+
+    def dim_patients(term, filters):
+        # Search text and filters are evaluated by the database in the background. The current
+        # cards stay mounted (dimmed) so results that are already on screen are not re-sent.
+        patients_grid.opacity = 0.4
+        patient_page_state["loading"] = False
+        page.update()
+
+    def show_search_results(result):
+        patients_grid.opacity = 1
+        publish_update(page, "patients grid", show_patient_rows(result, reset=True))
+
+    def search_failed(ex):
+        # Undo dim_patients so the previous results stay usable, and say why nothing changed
+        print(f"Error searching patients: {ex}")
+        patients_grid.opacity = 1
+        page.snack_bar = ft.SnackBar(content=ft.Text(f"Search failed: {ex}"))
+        page.snack_bar.open = True
         page.update()
 
+    patient_search = SearchController(lambda term, filters: fetch_patient_rows(term, filters, None),
+                                      show_search_results, on_start=dim_patients, on_error=search_failed,
+                                      runner=patient_searches)
+
+    def load_next_patient_page():
+        # Next keyset page, fetched in the background when the list is scrolled near its end
+        patient_page_state["loading"] = True
+        load_more_indicator.visible = True
+        page.update()
+
+        def show_page(result):
+            patient_page_state["loading"] = False
+            load_more_indicator.visible = False
+            publish_update(page, "patients grid", show_patient_rows(result))
+
+        def page_failed(ex):
+            print(f"Error loading patients: {ex}")
+            patient_page_state["loading"] = False
+            load_more_indicator.visible = False
+            page.update()
+
+        patient_searches.run(fetch_patient_rows, search_field.value, current_filters(), patient_page_state["cursor"],
+                             on_success=show_page, on_error=page_failed)
+
+    def handle_patients_scroll(e):
+        if patient_page_state["cursor"] is None or patient_page_state["loading"]:
+            return
+        if e.max_scroll_extent - e.pixels <= PATIENT_SCROLL_PREFETCH:
+            load_next_patient_page()
+
+    def refresh_patients():
+        publish_update(page, "patients grid", load_patient_page(reset=True))
+
     def handle_delete_patient(patient_id):
         def confirm_delete(e):
             try:
@@ -981,6 +1106,7 @@ def create_patients_tab(page, user):
         page.update()
 
     def handle_edit_patient(patient):
+        patient = get_patient(patient['id']) or patient
         # Local state for edit form
         edit_form_state = {
             "full_name": patient.get("full_name", ""),
@@ -2397,16 +2523,7 @@ def create_patients_tab(page, user):
 
     # --- Top bar with search, filters, download, and add button ---
     def filter_patients(e):
-        search_term = search_field.value.lower() if search_field.value else ""
-        filtered_patients = [
-            p for p in patients
-            if search_term in p['full_name'].lower() or 
-               search_term in p.get('last_name', '').lower() or 
-               search_term in str(p['id']).lower() or
-               search_term in p.get('phone', '').lower()
-        ]
-        patients_grid.controls = [create_patient_card(p, show_patient_details, handle_edit_patient, handle_delete_patient) for p in filtered_patients]
-        page.update()
+        patient_search.changed(search_field.value, current_filters())
 
     search_field = ft.TextField(
         hint_text="Search here",
@@ -2419,7 +2536,8 @@ def create_patients_tab(page, user):
         focused_border_color=HR_PRIMARY,
         hint_style=ft.TextStyle(color=HR_TEXT),
         text_style=ft.TextStyle(color=HR_TEXT),
-        on_change=filter_patients
+        on_change=filter_patients,
+        on_submit=lambda e: apply_filters(),
     )
     filter_btn = ft.IconButton(
         icon=ft.Icons.FILTER_LIST,
@@ -2427,7 +2545,44 @@ def create_patients_tab(page, user):
         tooltip="Filters",
         on_click=show_filter_modal
     )
-    download_btn = ft.IconButton(icon=ft.Icons.DOWNLOAD, icon_color=HR_PRIMARY, tooltip="Download", on_click=lambda _: None)
+    def show_export_message(message):
+        page.snack_bar = ft.SnackBar(content=ft.Text(message))
+        page.snack_bar.open = True
+        page.update()
+
+    def handle_export_result(e):
+        if not e.path:
+            return
+        # Streaming the export holds a pooled connection until the file is written: run it off the UI
+        show_export_message("Exporting patients...")
+        run_async(
+            export_patients,
+            e.path,
+            term=search_field.value,
+            status=filter_state["status"],
+            doctor=filter_state["doctor"],
+            visit_type=filter_state["visit_type"],
+            on_success=lambda result: show_export_message(f"Exported {result[0]} patients in {result[1]:.1f}s"),
+            on_error=lambda ex: show_export_message(f"Export failed: {ex}"),
+        )
+
+    # One picker per page, like the schedule export; each build of the tab points it at its own handler
+    if not hasattr(page, "patient_export_picker"):
+        page.patient_export_picker = ft.FilePicker()
+        page.overlay.append(page.patient_export_picker)
+    page.patient_export_picker.on_result = handle_export_result
+
+    # Exports everything matching the current search and filters, not just the loaded page
+    download_btn = ft.IconButton(
+        icon=ft.Icons.DOWNLOAD,
+        icon_color=HR_PRIMARY,
+        tooltip="Download",
+        on_click=lambda _: page.patient_export_picker.save_file(
+            dialog_title="Export patients",
+            file_name="patients.csv",
+            allowed_extensions=["csv", "jsonl"],
+        )
+    )
     def show_add_patient_modal(e=None):
         add_patient_modal.current.visible = True
         page.update()
@@ -2448,24 +2603,27 @@ def create_patients_tab(page, user):
         add_btn
     ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
 
-    # Fetch patients from database
-    patients = get_all_patients()
-    
-    # Create patients grid with 3 cards per row
-    patients_grid = ft.Row(
-        controls=[
-            ft.Container(
-                content=create_patient_card(p, show_patient_details, handle_edit_patient, handle_delete_patient),
-                width=280,  # Reduced from 300
-                margin=ft.margin.only(bottom=15, right=10)  # Fixed margins for spacing
-            ) for p in patients
-        ],
-        wrap=True,
-        spacing=10,      # Fixed horizontal spacing
-        run_spacing=15,  # Fixed vertical spacing
-        width=900,  # Reduced from 1000 to fit better with smaller cards
+    # Patients list with 3 cards per row. ListView only lays out the rows in view, and rows
+    # are only built for pages loaded so far; the next page is fetched when scrolling nears the end.
+    patients_grid = ft.ListView(
+        controls=[],
+        spacing=15,
+        expand=True,
+        on_scroll_interval=100,
+        on_scroll=handle_patients_scroll,
+    )
+
+    load_more_indicator = ft.Container(
+        content=ft.ProgressRing(width=20, height=20, stroke_width=2, color=HR_PRIMARY),
+        alignment=ft.alignment.center,
+        width=900,
+        padding=10,
+        visible=False,
     )
 
+    # Fetch the first page of patients from database
+    load_patient_page()
+
     # --- Available doctors ---
     def doctor_avatar(d):
         return ft.Column([
@@ -2481,16 +2639,23 @@ def create_patients_tab(page, user):
         for d in verified_doctors
     ]
 
-    # Doctor search functionality
-    def filter_doctors(e):
-        search_term = doctor_search_field.value.lower() if doctor_search_field.value else ""
-        filtered_doctors = [
+    # Doctor search functionality (debounced; the list is rebuilt once typing pauses)
+    def matching_doctors(term):
+        search_term = term.lower() if term else ""
+        return [
             d for d in doctors
             if search_term in d['name'].lower() or search_term in d['department'].lower()
         ]
+
+    def show_doctors(filtered_doctors):
         doctors_row.controls = [doctor_avatar(d) for d in filtered_doctors]
         page.update()
 
+    doctor_search = SearchController(matching_doctors, show_doctors)
+
+    def filter_doctors(e):
+        doctor_search.changed(doctor_search_field.value)
+
     doctor_search_field = ft.TextField(
         hint_text="Search here",
         prefix_icon=ft.Icons.SEARCH,
@@ -2534,9 +2699,7 @@ def create_patients_tab(page, user):
                 content=ft.Row([
                     # Patients grid with 3 columns
                     ft.Container(
-                        content=ft.Column([
-                            patients_grid
-                        ], scroll=ft.ScrollMode.AUTO, expand=True),
+                        content=patients_grid,
                         expand=True,
                         alignment=ft.alignment.top_left,
                     ),
@@ -2634,9 +2797,6 @@ def create_header(title, user):
     )
 
 def dashboard_ui(page, user):
-    # Get verified doctors from database
-    doctors = get_all_doctors()
-    
     page.clean()
     page.title = "NexaCare Dashboard"
     page.bgcolor = HR_SECONDARY
@@ -2767,21 +2927,17 @@ def dashboard_ui(page, user):
     def create_dashboard_ui_content(page, user):
         print("[DEBUG] Entered create_dashboard_ui_content")
         try:
-            from database import get_all_appointments, get_all_patients
+            from database import get_all_appointments
             import datetime
-            print("[DEBUG] Fetching appointments and patients...")
-            success, msg, appointments_data = get_all_appointments()
-            patients_data = get_all_patients()
-            print(f"[DEBUG] Appointments fetch success: {success}, count: {len(appointments_data) if appointments_data else 0}")
-            print(f"[DEBUG] Patients count: {len(patients_data) if patients_data else 0}")
+            print("[DEBUG] Fetching dashboard stats and recent appointments...")
+            # Counters come from one aggregate query; only the 5 most recent appointments are fetched
+            stats = prefetched(page, "stats", get_dashboard_stats)
+            trends = prefetched(page, "trends", get_dashboard_trends)
+            success, msg, recent_appointments = prefetched(page, "recent_appointments", get_all_appointments,
+                                                           limit=DASHBOARD_RECENT_LIMIT)
+            print(f"[DEBUG] Appointments total: {stats['appointments']['total']}, patients total: {stats['patients']['total']}")
             if not success:
-                appointments_data = []
-            # Sort and get 5 most recent appointments
-            recent_appointments = sorted(
-                appointments_data,
-                key=lambda apt: str(apt.get("appointment_date", "")),
-                reverse=True
-            )[:5]
+                recent_appointments = []
             print(f"[DEBUG] Recent appointments count: {len(recent_appointments)}")
             # State for selected appointment
             selected_apt = page.session.get('dashboard_selected_apt')
@@ -2814,12 +2970,8 @@ def dashboard_ui(page, user):
                         padding=30,
                         expand=True,
                     )
-                # Find the patient by patient_id
-                patient = None
-                for p in patients_data:
-                    if str(p.get('id')) == str(apt.get('patient_id')):
-                        patient = p
-                        break
+                # Look up the patient by patient_id
+                patient = get_patient(apt.get('patient_id'))
                 if not patient:
                     return ft.Container(
                         content=ft.Text("Patient details not found.", color=HR_ERROR, size=16),
@@ -2962,9 +3114,9 @@ def dashboard_ui(page, user):
             print("[DEBUG] Dashboard content loaded successfully")
             # Info cards row (always define before use)
             info_cards = ft.Row([
-                create_stat_card("Appointments", str(len(appointments_data)), ft.Icons.CALENDAR_MONTH, HR_PRIMARY, 12.5),
-                create_stat_card("New Patients", str(len(patients_data)), ft.Icons.PERSON_ADD, HR_INFO, 8.3),
-                create_stat_card("Follow Up", str(len([a for a in appointments_data if a.get("status") == "Pending"])), ft.Icons.UPDATE, HR_WARNING, -2.1),
+                create_stat_card("Appointments", str(stats["appointments"]["total"]), ft.Icons.CALENDAR_MONTH, HR_PRIMARY, trends["appointments"]),
+                create_stat_card("New Patients", str(stats["patients"]["total"]), ft.Icons.PERSON_ADD, HR_INFO, trends["patients"]),
+                create_stat_card("Follow Up", str(stats["appointments"]["by_status"].get("Pending", 0)), ft.Icons.UPDATE, HR_WARNING, trends["pending"]),
             ], spacing=16)
             return ft.Column([
                 header,
@@ -3114,26 +3266,44 @@ def dashboard_ui(page, user):
                 return
             # Combine date and time
             appointment_datetime = f"{appointment_form_state['date']} {appointment_form_state['time']}"
-            # Call backend
-            success, msg, _ = add_appointment(
+
+            def on_saved(result):
+                success, msg, _ = result
+                save_button.disabled = False
+                save_button.text = "Save Appointment"
+                if success:
+                    page.snack_bar = ft.SnackBar(content=ft.Text("Appointment added successfully!"))
+                    page.snack_bar.open = True
+                    page.update()
+                    close_dialog()
+                    # Refresh only the schedule tab
+                    handle_menu_selection("Schedule")
+                else:
+                    page.snack_bar = ft.SnackBar(content=ft.Text(f"Error: {msg}"))
+                    page.snack_bar.open = True
+                    page.update()
+
+            # Call backend without blocking the dialog; the button stays disabled until it answers
+            save_button.disabled = True
+            save_button.text = "Saving..."
+            page.update()
+            run_async(
+                add_appointment,
                 int(appointment_form_state["patient_id"]),
                 appointment_form_state["doctor_id"],
                 appointment_datetime,
                 appointment_form_state["type"],
                 appointment_form_state["status"],
-                appointment_form_state["notes"]
+                appointment_form_state["notes"],
+                on_success=on_saved,
+                on_error=lambda ex: on_saved((False, str(ex), None)),
             )
-            if success:
-                page.snack_bar = ft.SnackBar(content=ft.Text("Appointment added successfully!"))
-                page.snack_bar.open = True
-                page.update()
-                close_dialog()
-                # Refresh only the schedule tab
-                handle_menu_selection("Schedule")
-            else:
-                page.snack_bar = ft.SnackBar(content=ft.Text(f"Error: {msg}"))
-                page.snack_bar.open = True
-                page.update()
+
+        save_button = ft.ElevatedButton(
+            "Save Appointment",
+            on_click=save_appointment,
+            style=ft.ButtonStyle(bgcolor=HR_PRIMARY, color=HR_WHITE),
+        )
 
         # Build dialog content
         dialog_content = ft.Container(
@@ -3168,11 +3338,7 @@ def dashboard_ui(page, user):
                         style=ft.ButtonStyle(bgcolor=HR_WHITE, color=HR_TEXT),
                     ),
                     ft.Container(width=10),
-                    ft.ElevatedButton(
-                        "Save Appointment",
-                        on_click=save_appointment,
-                        style=ft.ButtonStyle(bgcolor=HR_PRIMARY, color=HR_WHITE),
-                    ),
+                    save_button,
                 ], alignment=ft.MainAxisAlignment.END),
             ], spacing=10),
         )
@@ -3180,21 +3346,78 @@ def dashboard_ui(page, user):
         dialog_modal.visible = True
         page.update()
     
-    # Sidebar menu selection handler
+    # Sidebar menu selection handler: show a placeholder at once, build the tab in the background
+    menu_loads = LatestOnly()
+
     def handle_menu_selection(title, e=None):
         current_selection.current = title
+        main_content.content = loading_placeholder(f"Loading {title}...", HR_PRIMARY)
+        page.update()
+
+        def show_content(content):
+            main_content.content = content
+            page.update()
+
+        menu_loads.run(build_menu_content, title, on_success=show_content)
+
+    def build_menu_content(title):
+        content = None
         if title == "Dashboard":
-            main_content.content = create_dashboard_ui_content(page, user)
+            content = create_dashboard_ui_content(page, user)
         elif title == "Patients":
-            main_content.content = create_patients_tab(page, user)
+            content = create_patients_tab(page, user)
         elif title == "Schedule":
+            # The tab's view model outlives a rebuild: the fetched appointments, one DataRow per id and
+            # the details panel. Selecting a row restyles two rows and refills the panel, nothing else.
             if not hasattr(page, "schedule_tab_state"):
                 page.schedule_tab_state = {"selected_appointment": None}
-            selected_appointment = page.schedule_tab_state.get("selected_appointment")
+            schedule = page.schedule_tab_state
+
+            def style_schedule_row(row, selected):
+                row.selected = selected
+                row.color = HR_PRIMARY + "1A" if selected else None
+
+            def fill_schedule_details(apt):
+                details = schedule["details"]
+                if apt is None:
+                    details.content = ft.Text("Select an appointment to see its details.", size=12, color=HR_TEXT)
+                    return
+                date_str, time_str = appointment_date_parts(apt)
+                details.content = ft.Column([
+                    ft.Text("Appointment Details", size=16, weight=ft.FontWeight.BOLD, color=HR_TEXT),
+                    ft.Divider(height=10, color=HR_BORDER),
+                    ft.Row([
+                        ft.CircleAvatar(
+                            content=ft.Text((apt.get("patient_name") or "?")[0].upper(), color=HR_WHITE, size=18),
+                            bgcolor=HR_PRIMARY,
+                            radius=20,
+                        ),
+                        ft.Text(apt.get("patient_name", "Unknown"), size=14, weight=ft.FontWeight.W_500, color=HR_TEXT),
+                    ], spacing=10),
+                    ft.Text(f"Doctor: {apt.get('doctor_name', '')}", size=12, color=HR_TEXT),
+                    ft.Text(f"Date: {date_str} {time_str}", size=12, color=HR_TEXT),
+                    ft.Text(f"Consultation: {apt.get('consultation_type') or 'N/A'}", size=12, color=HR_TEXT),
+                    ft.Container(
+                        content=ft.Text(apt.get("status", ""), color=ft.Colors.WHITE, size=12),
+                        bgcolor=APPOINTMENT_STATUS_COLORS.get(apt.get("status", "Scheduled"), HR_TEXT),
+                        padding=ft.padding.symmetric(horizontal=8, vertical=4),
+                        border_radius=12,
+                    ),
+                ], spacing=10)
 
             def handle_row_click(e, apt):
-                page.schedule_tab_state["selected_appointment"] = apt
-                handle_menu_selection("Schedule")
+                previous = schedule["selected_appointment"]
+                if previous and previous["id"] == apt["id"]:
+                    return
+                schedule["selected_appointment"] = apt
+                changed = [schedule["details"]]
+                for item, selected in ((previous, False), (apt, True)):
+                    row = schedule["rows"].get(item["id"]) if item else None
+                    if row is not None:
+                        style_schedule_row(row, selected)
+                        changed.append(row)
+                fill_schedule_details(apt)
+                page.update(*changed)
 
             # Define search/filter/download controls locally
             search_field = ft.TextField(
@@ -3214,67 +3437,64 @@ def dashboard_ui(page, user):
                 icon_color=HR_PRIMARY,
                 tooltip="Filters",
             )
+            def show_schedule_export_message(message):
+                page.snack_bar = ft.SnackBar(content=ft.Text(message))
+                page.snack_bar.open = True
+                page.update()
+
+            def handle_schedule_export_result(e):
+                if not e.path:
+                    return
+                show_schedule_export_message("Exporting appointments...")
+                run_async(
+                    export_appointments,
+                    e.path,
+                    on_success=lambda result: show_schedule_export_message(
+                        f"Exported {result[0]} appointments in {result[1]:.1f}s"),
+                    on_error=lambda ex: show_schedule_export_message(f"Export failed: {ex}"),
+                )
+
+            if not hasattr(page, "schedule_export_picker"):
+                page.schedule_export_picker = ft.FilePicker()
+                page.overlay.append(page.schedule_export_picker)
+            page.schedule_export_picker.on_result = handle_schedule_export_result
             download_btn = ft.IconButton(
                 icon=ft.Icons.DOWNLOAD,
                 icon_color=HR_PRIMARY,
                 tooltip="Download",
+                on_click=lambda _: page.schedule_export_picker.save_file(
+                    dialog_title="Export appointments",
+                    file_name="appointments.csv",
+                    allowed_extensions=["csv", "jsonl"],
+                )
             )
 
-            # Fetch appointments
-            from database import get_all_appointments
-            success, msg, appointments_data = get_all_appointments()
+            # Fetch appointments (only the columns the table shows)
+            success, msg, appointments_data = get_all_appointments(view="list")
             if not success:
                 appointments_data = []
+            schedule["appointments"] = appointments_data
 
-            # Build table rows
-            table_rows = []
-            for apt in appointments_data:
-                status_color = {
-                    "Scheduled": HR_SUCCESS,
-                    "Completed": HR_INFO,
-                    "Pending": HR_WARNING,
-                    "Cancelled": HR_ERROR,
-                    "No Show": HR_ERROR
-                }.get(apt.get("status", "Scheduled"), HR_TEXT)
-                date_str = ""
-                if apt.get("appointment_date"):
-                    try:
-                        date_obj = datetime.strptime(str(apt["appointment_date"]), "%Y-%m-%d %H:%M:%S")
-                        date_str = date_obj.strftime("%Y-%m-%d")
-                    except (ValueError, TypeError):
-                        date_str = str(apt["appointment_date"])[:10]
-                is_selected = selected_appointment and selected_appointment["id"] == apt["id"]
-                row_bgcolor = HR_PRIMARY + "1A" if is_selected else HR_WHITE
-                row = ft.DataRow(
+            def build_schedule_row(apt):
+                date_str, time_str = appointment_date_parts(apt)
+                return ft.DataRow(
                     cells=[
-                        ft.DataCell(ft.Container(
-                            ft.Row([
-                                ft.CircleAvatar(
-                                    content=ft.Text(apt.get("patient_name", "")[0] if apt.get("patient_name") else "?"),
-                                    radius=15,
-                                    bgcolor=HR_PRIMARY,
-                                    color=HR_WHITE
-                                ),
-                                ft.Text(apt.get("patient_name", "Unknown"))
-                            ], spacing=10),
-                            bgcolor=row_bgcolor
-                        )),
-                        ft.DataCell(ft.Container(ft.Text(date_str), bgcolor=row_bgcolor)),
-                        ft.DataCell(ft.Container(ft.Text(apt.get("doctor_name", "")), bgcolor=row_bgcolor)),
-                        ft.DataCell(ft.Container(ft.Text(apt.get("consultation_type", "")), bgcolor=row_bgcolor)),
-                        ft.DataCell(ft.Container(
+                        ft.DataCell(ft.Text(apt["patient_name"])),
+                        ft.DataCell(ft.Text(date_str)),
+                        ft.DataCell(ft.Text(apt["doctor_name"])),
+                        ft.DataCell(ft.Text(time_str)),
+                        ft.DataCell(
                             ft.Container(
                                 content=ft.Text(
-                                    apt.get("status", ""),
+                                    apt["status"],
                                     color=ft.Colors.WHITE,
-                                    weight=ft.FontWeight.W_500
+                                    size=12,
                                 ),
-                                padding=ft.padding.symmetric(horizontal=10, vertical=5),
-                                border_radius=15,
-                                bgcolor=status_color
-                            ),
-                            bgcolor=row_bgcolor
-                        )),
+                                bgcolor=APPOINTMENT_STATUS_COLORS.get(apt.get("status", "Scheduled"), HR_TEXT),
+                                padding=ft.padding.symmetric(horizontal=8, vertical=4),
+                                border_radius=12,
+                            )
+                        ),
                         ft.DataCell(
                             ft.IconButton(
                                 icon=ft.Icons.DELETE_OUTLINE,
@@ -3287,16 +3507,24 @@ def dashboard_ui(page, user):
                     on_select_changed=lambda e, apt=apt: handle_row_click(e, apt),
                     data=apt,
                 )
-                table_rows.append(row)
-
-            # Define status colors for the schedule tab
-            status_colors = {
-                "Scheduled": HR_SUCCESS,
-                "Completed": HR_INFO,
-                "Pending": HR_WARNING,
-                "Cancelled": HR_ERROR,
-                "No Show": HR_ERROR
-            }
+
+            # Keep the selection across a refetch when the appointment is still listed
+            selected = schedule["selected_appointment"]
+            schedule["rows"] = {apt["id"]: build_schedule_row(apt) for apt in appointments_data}
+            if selected is not None:
+                selected = next((apt for apt in appointments_data if apt["id"] == selected["id"]), None)
+                schedule["selected_appointment"] = selected
+                if selected is not None:
+                    style_schedule_row(schedule["rows"][selected["id"]], True)
+            schedule["details"] = ft.Container(
+                width=320,
+                bgcolor=HR_WHITE,
+                border_radius=12,
+                border=ft.border.all(1, HR_BORDER),
+                padding=20,
+            )
+            fill_schedule_details(selected)
+
             appointments_table = ft.DataTable(
                 columns=[
                     ft.DataColumn(ft.Text("Patient")),
@@ -3306,38 +3534,8 @@ def dashboard_ui(page, user):
                     ft.DataColumn(ft.Text("Status")),
                     ft.DataColumn(ft.Text("Actions")),
                 ],
-                rows=[
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(ft.Text(apt["patient_name"])),
-                            ft.DataCell(ft.Text((datetime.strptime(str(apt["appointment_date"]), "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d") if apt.get("appointment_date") else ""))),
-                            ft.DataCell(ft.Text(apt["doctor_name"])),
-                            ft.DataCell(ft.Text((datetime.strptime(str(apt["appointment_date"]), "%Y-%m-%d %H:%M:%S").strftime("%I:%M %p") if apt.get("appointment_date") else ""))),
-                            ft.DataCell(
-                                ft.Container(
-                                    content=ft.Text(
-                                        apt["status"],
-                                        color=ft.Colors.WHITE,
-                                        size=12,
-                                    ),
-                                    bgcolor=status_colors.get(apt.get("status", "Scheduled"), HR_TEXT),
-                                    padding=ft.padding.symmetric(horizontal=8, vertical=4),
-                                    border_radius=12,
-                                )
-                            ),
-                            ft.DataCell(
-                                ft.IconButton(
-                                    icon=ft.Icons.DELETE_OUTLINE,
-                                    icon_color=HR_ERROR,
-                                    tooltip="Delete Appointment",
-                                    on_click=lambda e, apt=apt: show_schedule_delete_modal(e.page, apt['id'], apt['patient_name'], handle_menu_selection)
-                                )
-                            ),
-                        ]
-                    )
-                    for apt in appointments_data
-                ],
-                width=1400,
+                rows=list(schedule["rows"].values()),
+                expand=True,
             )
 
             # Top bar for Schedule tab
@@ -3372,18 +3570,21 @@ def dashboard_ui(page, user):
             ], alignment=ft.MainAxisAlignment.END)
 
             # Main layout for Schedule tab
-            main_content.content = ft.Container(
+            content = ft.Container(
                 expand=True,
                 bgcolor=HR_SECONDARY,
                 content=ft.Column([
                     create_header("Schedule", user),
                     top_bar,
-                    ft.Container(content=appointments_table, expand=True),
+                    ft.Row([
+                        ft.Column([appointments_table], scroll=ft.ScrollMode.AUTO, expand=True),
+                        ft.Container(content=schedule["details"], padding=ft.padding.only(left=10, right=10)),
+                    ], expand=True, vertical_alignment=ft.CrossAxisAlignment.START),
                     ft.Container(content=pagination, padding=ft.padding.only(top=10)),
                 ], spacing=0),
             )
         elif title == "Settings":
-            main_content.content = ft.Container(
+            content = ft.Container(
                 content=ft.Column([
                     create_header("Settings", user),
                     ft.Container(
@@ -3394,7 +3595,7 @@ def dashboard_ui(page, user):
                 expand=True,
                 bgcolor=HR_SECONDARY,
             )
-        page.update()
+        return content
 
     # Logout handler
     def handle_logout(e):
@@ -1,7 +1,12 @@
+import time
+
 import flet as ft
-from pages.dashboards import doctor, hr, admin
-# hr, doctor, admin are already dashboard_ui functions, not modules
-from models.user import get_user
+from pages.dashboards import load_dashboard, warm_up
+# Dashboards are imported on demand for the role that signs in
+from models.user import get_user, user_exists
+from utils.assets import asset_url
+from utils.async_db import run_async
+from utils.prefetch import start_prefetch, report_time_to_dashboard
 
 # Define color constants
 PRIMARY_BLUE = "#2A70FF"
@@ -126,7 +131,7 @@ def create_admin_login_ui(page: ft.Page, return_to_main):
         user = get_user(email, password, "Admin")
         if user:
             page.clean()
-            admin(page, user)
+            load_dashboard("Admin")(page, user)
         else:
             error_text.value = "Invalid credentials"
             error_text.visible = True
@@ -262,6 +267,8 @@ def login_ui(page: ft.Page):
             update_role_selection()
         return handle_click
 
+    sign_in_state = {"pending": False}
+
     def on_sign_in(e):
         print("[DEBUG] Sign in button clicked")
         email = email_field.current.value if email_field.current else ""
@@ -285,54 +292,65 @@ def login_ui(page: ft.Page):
             password_error_text.visible = True
             page.update()
             return
-        user = get_user(email, password, current_role)
-        print(f"[DEBUG] get_user returned: {user}")
-        if not user:
-            # Check if email/id exists for more specific error
-            from database import get_connection
-            conn = get_connection()
-            table = "doctors" if current_role == "Doctor" else ("hrs" if current_role == "HR" else "admins")
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute(
-                f"SELECT * FROM {table} WHERE email = %s OR user_id = %s",
-                (email, email)
-            )
-            exists = cursor.fetchone()
-            print(f"[DEBUG] User exists in table: {exists}")
-            cursor.close()
-            conn.close()
-            if not exists:
-                email_error_text.value = "Email or ID not found"
+        if sign_in_state["pending"]:
+            return
+        sign_in_state["pending"] = True
+        role = current_role
+        started = time.perf_counter()
+        login_status_text.value = "Signing in..."
+        login_status_text.visible = True
+        page.update()
+
+        def check_credentials():
+            user = get_user(email, password, role)
+            if user and (role not in ("Doctor", "HR") or user.get("is_verified", False)):
+                # Load the dashboard's data concurrently while the UI switches over
+                start_prefetch(page, role, user, started)
+                load_dashboard(role)  # import the dashboard module off the UI thread
+            # Only look the account up when the password check failed, for a more specific error
+            exists = user is not None or user_exists(email, role)
+            return user, exists
+
+        def on_checked(result):
+            sign_in_state["pending"] = False
+            user, exists = result
+            print(f"[DEBUG] get_user returned: {user}")
+            if not user:
+                login_status_text.visible = False
+                print(f"[DEBUG] User exists in table: {exists}")
+                if not exists:
+                    email_error_text.value = "Email or ID not found"
+                    email_error_text.visible = True
+                else:
+                    password_error_text.value = "Incorrect password"
+                    password_error_text.visible = True
+                page.update()
+                return
+            # --- Verification check for HR and Doctor ---
+            if role in ("Doctor", "HR") and not user.get("is_verified", False):
+                login_status_text.visible = False
+                email_error_text.value = "Your account has not been verified by the admin yet."
                 email_error_text.visible = True
-            else:
-                password_error_text.value = "Incorrect password"
-                password_error_text.visible = True
+                page.update()
+                return
+            # Show login status and then open dashboard
+            name = f"{user.get('first_name', '')} {user.get('last_name', '')}".strip()
+            user_id = user.get('user_id', '')
+            login_status_text.value = f"Logging in as {name} (ID: {user_id})... Redirecting to dashboard."
             page.update()
-            return
-        # --- Verification check for HR and Doctor ---
-        if current_role in ("Doctor", "HR") and not user.get("is_verified", False):
-            email_error_text.value = "Your account has not been verified by the admin yet."
+            page.clean()
+            print(f"[DEBUG] Redirecting to {role} dashboard")
+            load_dashboard(role)(page, user)
+            report_time_to_dashboard(page)
+
+        def on_failed(ex):
+            sign_in_state["pending"] = False
+            login_status_text.visible = False
+            email_error_text.value = "Could not reach the database. Please try again."
             email_error_text.visible = True
             page.update()
-            return
-        # Show login status and then open dashboard
-        name = f"{user.get('first_name', '')} {user.get('last_name', '')}".strip()
-        user_id = user.get('user_id', '')
-        login_status_text.value = f"Logging in as {name} (ID: {user_id})... Redirecting to dashboard."
-        login_status_text.visible = True
-        page.update()
-        import time
-        time.sleep(0.5)  # Short pause for user to see the message
-        page.clean()
-        if current_role == "Doctor":
-            print("[DEBUG] Redirecting to doctor dashboard")
-            doctor(page, user)  # Call the function directly
-        elif current_role == "HR":
-            print("[DEBUG] Redirecting to HR dashboard")
-            hr(page, user)      # Call the function directly
-        elif current_role == "Admin":
-            print("[DEBUG] Redirecting to admin dashboard")
-            admin(page, user)   # Call the function directly
+
+        run_async(check_credentials, on_success=on_checked, on_error=on_failed)
 
     def go_to_signup(e):
         from pages.signup import signup_ui
@@ -348,7 +366,7 @@ def login_ui(page: ft.Page):
 
     left_panel = ft.Container(
         content=ft.Image(
-            src="assets/gifs/left_section_login.gif",
+            src=asset_url("gifs/left_section_login.gif"),
             width=340,
             height=500,
             fit=ft.ImageFit.CONTAIN,
@@ -534,3 +552,6 @@ def login_ui(page: ft.Page):
     )
 
     update_role_selection()
+
+    # The login screen is up; import the dashboards in the background while the user types
+    warm_up()
@@ -0,0 +1,76 @@
+"""
+Patient codes brought along by an import must move the counter, so add_patient never reissues them.
+Runs against the database configured for the app and is skipped when it is not reachable.
+"""
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+from database import (
+    PATIENT_CODE_COUNTER, PATIENT_CODE_PATTERN, add_patient, bulk_insert_patients, delete_patient, format_patient_code,
+    get_connection, validate_patient,
+)
+
+PATIENT_FIELDS = {
+    "full_name": "Import Test Patient",
+    "birthdate": "1990-01-01",
+    "gender": "Other",
+    "civil_status": "Single",
+    "phone": "09170000000",
+}
+
+
+@pytest.fixture
+def conn():
+    connection = get_connection()
+    if connection is None:
+        pytest.skip("database not reachable")
+    yield connection
+    connection.close()
+
+
+def counter_value(conn) -> int:
+    cursor = conn.cursor()
+    cursor.execute("SELECT value FROM id_counters WHERE name = %s", (PATIENT_CODE_COUNTER,))
+    row = cursor.fetchone()
+    cursor.close()
+    conn.commit()
+    return row[0] if row else 0
+
+
+def delete_by_code(conn, code: str) -> None:
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM patients WHERE patient_code = %s", (code,))
+    row = cursor.fetchone()
+    cursor.close()
+    conn.commit()
+    if row:
+        delete_patient(row[0])
+
+
+def test_add_patient_after_import_of_explicit_code(conn):
+    # NXCP0005 on a fresh database; past whatever the counter already handed out otherwise
+    imported_code = format_patient_code(max(5, counter_value(conn) + 5))
+    valid, message, record = validate_patient(patient_id=imported_code, **PATIENT_FIELDS)
+    assert valid, message
+
+    added_code = None
+    try:
+        success, message = bulk_insert_patients([record])
+        assert success, message
+        assert counter_value(conn) >= int(imported_code[4:])
+
+        success, message, added_code = add_patient(**PATIENT_FIELDS)
+        assert success, message
+        assert int(added_code[4:]) > int(imported_code[4:])
+    finally:
+        delete_by_code(conn, imported_code)
+        if added_code:
+            delete_by_code(conn, added_code)
+
+
+def test_import_rejects_codes_outside_the_pattern():
+    valid, message, record = validate_patient(patient_id="P-0005", **PATIENT_FIELDS)
+    assert not valid
+    assert record is None
+    assert PATIENT_CODE_PATTERN.match(format_patient_code(5))
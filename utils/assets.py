@@ -0,0 +1,68 @@
+"""
+Bundled fonts and icons served from the local assets directory.
+
+Fonts used to be loaded from raw.githubusercontent.com, so every client downloaded them
+before text could render, and offline clinic machines stalled or fell back. They now ship in
+assets/fonts, subset to the glyphs the app uses and named by content hash, so a changed file
+is never served from a stale cache. assets/manifest.json maps each font family and logical
+asset name ("icons/app_icon.png") to its hashed file or versioned path; `python -m
+utils.build_assets` writes it.
+
+Startup never touches the network: a family missing from the manifest is left out of
+page.fonts, so text set in it renders in the default font until `python -m utils.build_assets
+--fetch` has bundled it.
+"""
+import json
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(ROOT, "assets")
+MANIFEST_PATH = os.path.join(ASSETS_DIR, "manifest.json")
+
+# family -> upstream file, downloaded by `build_assets --fetch` only; never loaded at runtime
+FONT_SOURCES = {
+    "Poppins": "https://raw.githubusercontent.com/google/fonts/main/ofl/poppins/Poppins-Regular.ttf",
+    "PoppinsMedium": "https://raw.githubusercontent.com/google/fonts/main/ofl/poppins/Poppins-Medium.ttf",
+    "PoppinsSemiBold": "https://raw.githubusercontent.com/google/fonts/main/ofl/poppins/Poppins-SemiBold.ttf",
+    "Lato": "https://raw.githubusercontent.com/google/fonts/main/ofl/lato/Lato-Regular.ttf",
+    "LatoMedium": "https://raw.githubusercontent.com/google/fonts/main/ofl/lato/Lato-Bold.ttf",
+}
+
+_manifest = None
+
+
+def load_manifest(reload: bool = False) -> dict:
+    """The asset manifest ({"fonts": {family: path}, "assets": {name: path}}), read once per process"""
+    global _manifest
+    if _manifest is None or reload:
+        try:
+            with open(MANIFEST_PATH, encoding="utf-8") as f:
+                _manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading asset manifest: {e}")
+            _manifest = {}
+        _manifest.setdefault("fonts", {})
+        _manifest.setdefault("assets", {})
+    return _manifest
+
+
+def font_map() -> dict:
+    """page.fonts: family -> bundled file (relative to the assets directory); unbundled families use the default font"""
+    fonts = {}
+    for family, path in load_manifest()["fonts"].items():
+        if os.path.isfile(os.path.join(ASSETS_DIR, path)):
+            fonts[family] = "/" + path
+    missing = sorted(FONT_SOURCES.keys() - fonts.keys())
+    if missing:
+        print(f"[ASSETS] fonts not bundled, using the default font for: {', '.join(missing)}")
+    return fonts
+
+
+def asset_url(name: str) -> str:
+    """src for a bundled asset (e.g. an ft.Image), versioned by its content hash when it is in the manifest"""
+    return "/" + load_manifest()["assets"].get(name, name)
+
+
+def asset_file(name: str) -> str:
+    """Filesystem path of a bundled asset, for settings that take a local file (page.window_icon)"""
+    return os.path.join(ASSETS_DIR, load_manifest()["assets"].get(name, name).split("?", 1)[0])
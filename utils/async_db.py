@@ -0,0 +1,177 @@
+"""
+Run blocking database calls off the UI event handlers.
+
+Work is queued on a bounded thread pool sized to the connection pool, so a burst of clicks
+cannot open more concurrent queries than there are pooled connections. Results are handed
+to callbacks on the worker thread; Flet controls may be updated from there and published
+with page.update().
+"""
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import flet as ft
+
+from database import POOL_CONFIG
+
+# Quiet period (seconds) before a search field's input is sent to the database
+SEARCH_DEBOUNCE = 0.3
+
+# One worker per pooled connection: more workers would only wait inside get_connection()
+_executor = ThreadPoolExecutor(max_workers=POOL_CONFIG["size"], thread_name_prefix="nexacare-db")
+
+
+def _report(exc):
+    print(f"Error in background task: {exc}")
+    traceback.print_exception(type(exc), exc, exc.__traceback__)
+
+
+def run_async(fn, *args, on_success=None, on_error=None, **kwargs):
+    """
+    Run fn(*args, **kwargs) on the worker pool and return its Future.
+    on_success(result) or on_error(exception) is called from the worker thread when it finishes;
+    without on_error the exception is printed.
+    """
+    future = _executor.submit(fn, *args, **kwargs)
+
+    def done(f):
+        if f.cancelled():
+            return
+        try:
+            result = f.result()
+        except Exception as e:
+            (on_error or _report)(e)
+            return
+        if on_success is None:
+            return
+        try:
+            on_success(result)
+        except Exception as e:
+            _report(e)
+
+    future.add_done_callback(done)
+    return future
+
+
+class LatestOnly:
+    """
+    Runs calls through run_async but only delivers the outcome of the most recent one.
+    Used where a newer request makes older ones irrelevant (search results, tab switches).
+    """
+
+    def __init__(self):
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._future = None
+
+    def run(self, fn, *args, on_success=None, on_error=None, **kwargs):
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            # A superseded call that has not started yet never reaches the database
+            if self._future is not None:
+                self._future.cancel()
+
+        def current_only(callback):
+            if callback is None:
+                return None
+
+            def deliver(value):
+                if generation == self._generation:
+                    callback(value)
+            return deliver
+
+        future = run_async(fn, *args, on_success=current_only(on_success),
+                           on_error=current_only(on_error), **kwargs)
+        with self._lock:
+            if generation == self._generation:
+                self._future = future
+        return future
+
+    def cancel(self):
+        """Drop the outcome of every call made so far (and skip it if it has not started)"""
+        with self._lock:
+            self._generation += 1
+            if self._future is not None:
+                self._future.cancel()
+                self._future = None
+
+
+class SearchController:
+    """
+    Debounced search shared by the search fields: changed() waits until input has been quiet for
+    `delay` seconds before running search(*args) on the worker pool, so typing a name costs one
+    query instead of one per keystroke. submit() runs at once (Enter, filter dialogs). Stale calls
+    are cancelled or dropped and only the newest result reaches on_results(result).
+
+    Args:
+        search: Function run in the background with the arguments given to changed()/submit()
+        on_results: Called with the result of the latest search
+        delay: Quiet period in seconds
+        on_start: Called (with the same arguments) just before a search is sent, e.g. to dim results
+        runner: LatestOnly to share with other loads of the same view (e.g. paging)
+    """
+
+    def __init__(self, search, on_results, delay=SEARCH_DEBOUNCE, on_start=None, on_error=None, runner=None):
+        self.search = search
+        self.on_results = on_results
+        self.delay = delay
+        self.on_start = on_start
+        self.on_error = on_error
+        self.runner = runner or LatestOnly()
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def changed(self, *args):
+        timer = threading.Timer(self.delay, self._fire, args)
+        timer.daemon = True
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = timer
+        timer.start()
+
+    def _fire(self, *args):
+        # A timer that already fired may lose the race with a newer changed(); only the newest one searches
+        with self._lock:
+            if self._timer is not threading.current_thread():
+                return
+            self._timer = None
+        self._run(*args)
+
+    def submit(self, *args):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+        return self._run(*args)
+
+    def _run(self, *args):
+        if self.on_start is not None:
+            self.on_start(*args)
+        return self.runner.run(self.search, *args, on_success=self.on_results, on_error=self.on_error)
+
+    def cancel(self):
+        """Forget pending input and any search in flight"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+        self.runner.cancel()
+
+
+def loading_placeholder(message="Loading...", color=None):
+    """Centered progress indicator shown while a background load is running"""
+    return ft.Container(
+        content=ft.Row(
+            [
+                ft.ProgressRing(width=20, height=20, stroke_width=2, color=color),
+                ft.Text(message, size=14, color=color),
+            ],
+            spacing=10,
+            alignment=ft.MainAxisAlignment.CENTER,
+        ),
+        alignment=ft.alignment.center,
+        padding=30,
+        expand=True,
+    )
@@ -0,0 +1,147 @@
+"""
+Build the bundled fonts and icons and write assets/manifest.json.
+
+    python -m utils.build_assets [--fetch] [--text "extra glyphs"]
+
+Font sources are read from assets/fonts/src (one <Family>.ttf per entry of FONT_SOURCES);
+--fetch downloads any that are missing. The sources are build inputs and are not committed,
+only the hashed output is. Each font is subset to the glyphs the app can show (every string
+literal in the source tree, plus the Latin ranges patient and staff names use) when fontTools
+is installed (pip install -r requirements-build.txt), and copied whole otherwise. Fonts are written under a
+content-hashed name and stale hashed copies are removed; icons stay where they are and the
+manifest versions them with their hash (icons/app_icon.png?v=<hash>).
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import tokenize
+import urllib.request
+
+from utils.assets import ASSETS_DIR, MANIFEST_PATH, FONT_SOURCES, ROOT
+
+try:
+    from fontTools import subset
+except ImportError:
+    subset = None
+
+FONT_SRC_DIR = os.path.join(ASSETS_DIR, "fonts", "src")
+FONT_DIR = os.path.join(ASSETS_DIR, "fonts")
+ICON_DIR = os.path.join(ASSETS_DIR, "icons")
+SOURCE_DIRS = ("pages", "models", "utils")
+# Basic Latin, Latin-1 Supplement and Latin Extended-A: names and addresses come from the database
+BASE_RANGES = ((0x20, 0x7E), (0xA0, 0xFF), (0x100, 0x17F))
+HASH_LENGTH = 10
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def source_files():
+    yield os.path.join(ROOT, "main.py")
+    yield os.path.join(ROOT, "database.py")
+    for folder in SOURCE_DIRS:
+        for dirpath, _, filenames in os.walk(os.path.join(ROOT, folder)):
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    yield os.path.join(dirpath, filename)
+
+
+def used_text(extra: str = "") -> str:
+    """Every character that can appear in the UI: string literals of the app plus BASE_RANGES"""
+    chars = {chr(code) for start, end in BASE_RANGES for code in range(start, end + 1)}
+    chars.update(extra)
+    for path in source_files():
+        with open(path, "rb") as f:
+            tokens = tokenize.tokenize(io.BytesIO(f.read()).readline)
+            for token in tokens:
+                if token.type == tokenize.STRING:
+                    chars.update(token.string)
+    return "".join(sorted(c for c in chars if c.isprintable()))
+
+
+def fetch_sources() -> None:
+    os.makedirs(FONT_SRC_DIR, exist_ok=True)
+    for family, url in FONT_SOURCES.items():
+        path = os.path.join(FONT_SRC_DIR, f"{family}.ttf")
+        if os.path.isfile(path):
+            continue
+        print(f"Fetching {family} from {url}")
+        with urllib.request.urlopen(url, timeout=30) as response, open(path, "wb") as f:
+            shutil.copyfileobj(response, f)
+
+
+def subset_font(path: str, text: str) -> bytes:
+    if subset is None:
+        with open(path, "rb") as f:
+            return f.read()
+    options = subset.Options()
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    options.notdef_outline = True
+    font = subset.load_font(path, options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    buffer = io.BytesIO()
+    subset.save_font(font, buffer, options)
+    return buffer.getvalue()
+
+
+def write_hashed(folder: str, stem: str, extension: str, data: bytes) -> str:
+    """Write `data` as <stem>.<hash><extension> in `folder`, drop older hashed copies; return the path relative to assets/"""
+    name = f"{stem}.{content_hash(data)}{extension}"
+    for existing in os.listdir(folder):
+        base, ext = os.path.splitext(existing)
+        if ext == extension and base.rsplit(".", 1)[0] == stem and "." in base and existing != name:
+            os.remove(os.path.join(folder, existing))
+    with open(os.path.join(folder, name), "wb") as f:
+        f.write(data)
+    return os.path.relpath(os.path.join(folder, name), ASSETS_DIR).replace(os.sep, "/")
+
+
+def build_fonts(text: str) -> dict:
+    fonts = {}
+    for family in FONT_SOURCES:
+        source = os.path.join(FONT_SRC_DIR, f"{family}.ttf")
+        if not os.path.isfile(source):
+            print(f"  {family}: no source in {FONT_SRC_DIR} (run with --fetch), skipped")
+            continue
+        data = subset_font(source, text)
+        fonts[family] = write_hashed(FONT_DIR, family, ".ttf", data)
+        print(f"  {family}: {os.path.getsize(source) // 1024} KB -> {len(data) // 1024} KB  {fonts[family]}")
+    return fonts
+
+
+def build_icons() -> dict:
+    assets = {}
+    for filename in sorted(os.listdir(ICON_DIR)):
+        with open(os.path.join(ICON_DIR, filename), "rb") as f:
+            assets[f"icons/{filename}"] = f"icons/{filename}?v={content_hash(f.read())}"
+    return assets
+
+
+def build(fetch: bool = False, extra_text: str = "") -> dict:
+    if fetch:
+        fetch_sources()
+    if subset is None:
+        print("fontTools is not installed; fonts are bundled whole (pip install -r requirements-build.txt to subset them)")
+    text = used_text(extra_text)
+    print(f"Building fonts for {len(text)} glyphs")
+    manifest = {"fonts": build_fonts(text), "assets": build_icons()}
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Wrote {os.path.relpath(MANIFEST_PATH, ROOT)}: {len(manifest['fonts'])} fonts, {len(manifest['assets'])} assets")
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Subset and hash the bundled fonts and icons, and write the asset manifest")
+    parser.add_argument("--fetch", action="store_true", help="download font sources missing from assets/fonts/src")
+    parser.add_argument("--text", default="", help="extra characters to keep in the font subsets")
+    args = parser.parse_args()
+    build(args.fetch, args.text)
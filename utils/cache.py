@@ -0,0 +1,117 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Small in-process read-through cache for reference data (doctors, HR staff, enum values).
+
+    Entries expire after `ttl` seconds and can be dropped early with invalidate() when the
+    underlying rows change. Values are deep-copied on the way out so callers can modify
+    the lists they get without corrupting the cached copy.
+
+    Args:
+        ttl: Seconds an entry stays fresh
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._entries = {}  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped by invalidate() so in-flight loads cannot store stale data
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, key, loader, cache_empty=False):
+        """
+        Return the cached value for `key`, calling `loader()` on a miss or after expiry.
+        Empty results are not cached unless `cache_empty` is set, since the loaders in
+        database.py return [] on connection errors.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._stats["hits"] += 1
+                return copy.deepcopy(entry[0])
+            self._stats["misses"] += 1
+            generation = self._generation
+
+        # Load outside the lock so a slow query does not block hits on other keys
+        value = loader()
+        if value or cache_empty:
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[key] = (value, time.monotonic() + self.ttl)
+        return copy.deepcopy(value)
+
+    def invalidate(self, *keys):
+        """Drop the given keys, or every entry when called without arguments."""
+        with self._lock:
+            if keys:
+                for key in keys:
+                    self._entries.pop(key, None)
+            else:
+                self._entries.clear()
+            self._generation += 1
+            self._stats["invalidations"] += 1
+
+    def stats(self):
+        """Return hit/miss/invalidation counters, the hit ratio and the number of cached keys."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["entries"] = len(self._entries)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = snapshot["hits"] / lookups if lookups else 0.0
+        return snapshot
+
+
+class LRUCache:
+    """
+    Count-bounded memo for derived values and built controls (e.g. rendered patient cards).
+
+    Keys should include a row version such as updated_at, so a changed row simply misses.
+    When more than `max_entries` keys are stored the least recently used one is dropped.
+    Values are returned as stored (not copied), so they must not be modified by callers.
+
+    Args:
+        max_entries: Maximum number of cached keys
+    """
+
+    def __init__(self, max_entries=500):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key, loader):
+        """Return the value for `key`, calling `loader()` and storing its result on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._entries[key]
+            self._stats["misses"] += 1
+
+        value = loader()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss/eviction counters, the hit ratio and the number of cached keys."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["entries"] = len(self._entries)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = snapshot["hits"] / lookups if lookups else 0.0
+        return snapshot
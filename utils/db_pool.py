@@ -0,0 +1,218 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection could be checked out within the pool timeout."""
+
+
+class PooledConnection:
+    """
+    Thin proxy around a raw connection borrowed from a ConnectionPool.
+    Calling close() hands the connection back to the pool instead of closing
+    the socket, so existing `finally: conn.close()` blocks keep working.
+    """
+
+    def __init__(self, pool, raw, overflow):
+        self._pool = pool
+        self._raw = raw
+        self._overflow = overflow
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def is_connected(self):
+        if self._released:
+            return False
+        if self._raw.is_connected():
+            return True
+        # Dead socket: callers skip close() in that case, so give the slot back here
+        self._released = True
+        self._pool.release(self._raw, self._overflow, healthy=False)
+        return False
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        self._pool.release(self._raw, self._overflow)
+
+    def discard(self):
+        """Give the slot back but close the socket, e.g. after abandoning an unread result set."""
+        if self._released:
+            return
+        self._released = True
+        self._pool.release(self._raw, self._overflow, healthy=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Bounded connection pool with overflow, idle timeout and checkout health checks.
+
+    Args:
+        connect: Zero-argument callable that opens a new raw connection
+        size: Number of connections kept open between checkouts
+        max_overflow: Extra connections allowed when all pooled ones are busy
+        idle_timeout: Seconds an idle connection may sit in the pool before it is discarded
+        health_check_after: Idle seconds after which a connection is pinged on checkout
+        timeout: Seconds to wait for a free connection before giving up
+    """
+
+    def __init__(self, connect, size=5, max_overflow=5, idle_timeout=300,
+                 health_check_after=30, timeout=10):
+        self._connect = connect
+        self.size = size
+        self.max_overflow = max_overflow
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.timeout = timeout
+
+        self._idle = deque()  # (raw_connection, returned_at)
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._open = 0  # pooled connections currently open (idle + in use)
+        self._overflow_open = 0
+
+        self._stats = {
+            "checkouts": 0,
+            "in_use": 0,
+            "peak_in_use": 0,
+            "created": 0,
+            "discarded": 0,
+            "failed_health_checks": 0,
+            "timeouts": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+        }
+
+    def acquire(self):
+        """Borrow a connection, blocking up to `timeout` seconds when the pool is exhausted."""
+        started = time.monotonic()
+        deadline = started + self.timeout
+        with self._available:
+            while True:
+                raw = self._take_idle()
+                if raw is not None:
+                    overflow = False
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    raw, overflow = None, False
+                    break
+                if self._overflow_open < self.max_overflow:
+                    self._overflow_open += 1
+                    raw, overflow = None, True
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        f"No database connection available after {self.timeout}s "
+                        f"(size={self.size}, overflow={self.max_overflow})"
+                    )
+                self._available.wait(remaining)
+
+        if raw is None:
+            try:
+                raw = self._connect()
+            except Exception:
+                self._forget(overflow)
+                raise
+            with self._lock:
+                self._stats["created"] += 1
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["in_use"] += 1
+            self._stats["peak_in_use"] = max(self._stats["peak_in_use"], self._stats["in_use"])
+            self._stats["wait_time_total"] += waited
+            self._stats["wait_time_max"] = max(self._stats["wait_time_max"], waited)
+        return PooledConnection(self, raw, overflow)
+
+    def _take_idle(self):
+        """Pop the most recently used healthy idle connection. Caller holds the lock."""
+        now = time.monotonic()
+        while self._idle:
+            raw, returned_at = self._idle.pop()
+            idle_for = now - returned_at
+            if idle_for > self.idle_timeout:
+                self._discard(raw)
+                self._open -= 1
+                continue
+            if idle_for > self.health_check_after and not self._is_healthy(raw):
+                self._stats["failed_health_checks"] += 1
+                self._discard(raw)
+                self._open -= 1
+                continue
+            return raw
+        return None
+
+    def _is_healthy(self, raw):
+        try:
+            return raw.is_connected()
+        except Exception:
+            return False
+
+    def release(self, raw, overflow=False, healthy=True):
+        """Return a connection to the pool, ending any transaction left open by the borrower."""
+        if healthy:
+            try:
+                if raw.in_transaction:
+                    raw.rollback()
+            except Exception:
+                healthy = False
+
+        with self._available:
+            self._stats["in_use"] -= 1
+            if overflow or not healthy:
+                self._discard(raw)
+                if overflow:
+                    self._overflow_open -= 1
+                else:
+                    self._open -= 1
+            else:
+                self._idle.append((raw, time.monotonic()))
+            self._available.notify()
+
+    def _forget(self, overflow):
+        with self._available:
+            if overflow:
+                self._overflow_open -= 1
+            else:
+                self._open -= 1
+            self._available.notify()
+
+    def _discard(self, raw):
+        self._stats["discarded"] += 1
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def stats(self):
+        """Return a snapshot of pool counters, including average checkout wait."""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["idle"] = len(self._idle)
+            snapshot["open"] = self._open + self._overflow_open
+            snapshot["overflow_in_use"] = self._overflow_open
+        checkouts = snapshot["checkouts"]
+        snapshot["wait_time_avg"] = snapshot["wait_time_total"] / checkouts if checkouts else 0.0
+        return snapshot
+
+    def dispose(self):
+        """Close every idle connection. Borrowed connections are closed when they are returned."""
+        with self._lock:
+            while self._idle:
+                raw, _ = self._idle.pop()
+                self._discard(raw)
+                self._open -= 1
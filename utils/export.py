@@ -0,0 +1,91 @@
+"""
+Streaming CSV / JSON Lines export of patients and appointments.
+
+    python -m utils.export patients patients.csv [--term ...] [--status ...] [--doctor ...] [--visit-type ...]
+    python -m utils.export appointments schedule.jsonl [--doctor ...] [--status ...]
+
+Rows are read from an unbuffered server-side cursor and written as they arrive, so memory
+use stays flat regardless of table size. The format follows the file extension.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+
+from database import iter_patients, iter_appointments
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def export_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported export type: {extension or path} (use .csv or .jsonl)")
+    return FORMATS[extension]
+
+
+def _csv_value(value):
+    # Lists (allergies, medications...) are written comma-separated, which the importer reads back
+    if isinstance(value, list):
+        return ", ".join(str(v) for v in value)
+    return value
+
+
+def write_rows(rows, path: str) -> int:
+    """Write an iterable of dicts to `path` as CSV or JSON Lines. Returns the number of rows written."""
+    fmt = export_format(path)
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if fmt == "jsonl":
+            for row in rows:
+                f.write(json.dumps(row, default=str) + "\n")
+                count += 1
+        else:
+            writer = None
+            for row in rows:
+                if writer is None:
+                    # Header comes from the first row; every row of one query has the same keys
+                    writer = csv.DictWriter(f, fieldnames=list(row.keys()))
+                    writer.writeheader()
+                writer.writerow({k: _csv_value(v) for k, v in row.items()})
+                count += 1
+    return count
+
+
+def export_patients(path: str, term: str = None, status: str = None, doctor: str = None,
+                    visit_type: str = None) -> tuple[int, float]:
+    """
+    Export the patients the HR grid lists for the given search/filters (see database.iter_patients).
+    Returns: (rows written, seconds taken)
+    """
+    started = time.perf_counter()
+    count = write_rows(iter_patients(term=term, status=status, doctor=doctor, visit_type=visit_type), path)
+    return count, time.perf_counter() - started
+
+
+def export_appointments(path: str, doctor_id: str = None, status: str = None) -> tuple[int, float]:
+    """
+    Export appointments, optionally for one doctor and/or status.
+    Returns: (rows written, seconds taken)
+    """
+    started = time.perf_counter()
+    count = write_rows(iter_appointments(doctor_id=doctor_id, status=status), path)
+    return count, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export patients or appointments to CSV or JSON Lines")
+    parser.add_argument("dataset", choices=["patients", "appointments"])
+    parser.add_argument("path", help="output file (.csv, .jsonl or .ndjson)")
+    parser.add_argument("--term", help="patients: name / code / phone prefix")
+    parser.add_argument("--status")
+    parser.add_argument("--doctor", help="doctor user_id")
+    parser.add_argument("--visit-type", help="patients: New Patient, Follow-up or Walk-in")
+    args = parser.parse_args()
+
+    if args.dataset == "patients":
+        count, seconds = export_patients(args.path, args.term, args.status, args.doctor, args.visit_type)
+    else:
+        count, seconds = export_appointments(args.path, args.doctor, args.status)
+    print(f"Exported {count} {args.dataset} to {args.path} in {seconds:.2f}s")
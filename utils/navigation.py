@@ -10,6 +10,8 @@ def navigate_to_login(page: 'ft.Page'):
     This function will be imported by the dashboard modules.
     """
     from pages.login import login_ui
+    from utils.refresher import stop_refresher
+    stop_refresher(page)
     page.clean()
     login_ui(page)
 
@@ -0,0 +1,157 @@
+"""
+Bulk patient import from CSV or JSON Lines.
+
+    python -m utils.patient_import patients.csv [--batch-size 500] [--rejects rejects.csv]
+
+Rows are validated with the same rules as database.add_patient, inserted with executemany
+in chunks of --batch-size (one transaction per chunk), and patient codes are reserved a
+block at a time. Rejected rows are reported with their line number and reason.
+"""
+import argparse
+import csv
+import inspect
+import json
+import os
+import time
+
+from database import validate_patient, bulk_insert_patients, reserve_patient_codes
+
+DEFAULT_BATCH_SIZE = 500
+
+# Columns accepted in an import file: the arguments of validate_patient, plus patient_code
+IMPORT_FIELDS = set(inspect.signature(validate_patient).parameters)
+FIELD_ALIASES = {"patient_code": "patient_id"}
+
+
+def read_rows(path: str):
+    """Yield (line_number, row dict) from a .csv or .jsonl/.ndjson file"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if extension == ".csv":
+            # Header is line 1, so data rows start at line 2
+            for line_number, row in enumerate(csv.DictReader(f), start=2):
+                yield line_number, row
+        elif extension in (".jsonl", ".ndjson"):
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, e
+                    continue
+                yield line_number, row if isinstance(row, dict) else ValueError("Expected a JSON object")
+        else:
+            raise ValueError(f"Unsupported file type: {extension or path} (use .csv or .jsonl)")
+
+
+def to_patient_fields(row: dict) -> dict:
+    """Map a raw import row onto validate_patient keyword arguments; blank values become None"""
+    fields = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        name = FIELD_ALIASES.get(key.strip(), key.strip())
+        if name not in IMPORT_FIELDS:
+            continue
+        if isinstance(value, str):
+            value = value.strip() or None
+        fields[name] = value
+    # Keep validate_patient's defaults for omitted optional enums
+    for name in ("visit_type", "status"):
+        if fields.get(name) is None:
+            fields.pop(name, None)
+    return fields
+
+
+def _insert_chunk(chunk: list, report: dict):
+    """Insert [(line_number, record)] in one transaction; on failure retry row by row to isolate bad rows"""
+    missing_codes = [record for _, record in chunk if not record["patient_code"]]
+    if missing_codes:
+        codes = reserve_patient_codes(len(missing_codes))
+        if len(codes) != len(missing_codes):
+            report["rejected"].extend((line, "Could not reserve patient codes") for line, _ in chunk)
+            return
+        for record, code in zip(missing_codes, codes):
+            record["patient_code"] = code
+
+    success, message = bulk_insert_patients([record for _, record in chunk])
+    if success:
+        report["imported"] += len(chunk)
+        return
+
+    report["batches_retried"] += 1
+    for line_number, record in chunk:
+        success, message = bulk_insert_patients([record])
+        if success:
+            report["imported"] += 1
+        else:
+            report["rejected"].append((line_number, message))
+
+
+def import_patients(rows, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """
+    Validate and insert patients from an iterable of (line_number, row dict) pairs.
+    Returns: report dict with total, imported, rejected [(line, reason)], batches,
+             batches_retried, seconds and rows_per_second
+    """
+    report = {"total": 0, "imported": 0, "rejected": [], "batches": 0, "batches_retried": 0}
+    started = time.perf_counter()
+    chunk = []
+    for line_number, row in rows:
+        report["total"] += 1
+        if isinstance(row, Exception):
+            report["rejected"].append((line_number, f"Unreadable row: {row}"))
+            continue
+        try:
+            valid, message, record = validate_patient(**to_patient_fields(row))
+        except TypeError as e:
+            # A required column is missing entirely
+            valid, message = False, str(e)
+        if not valid:
+            report["rejected"].append((line_number, message))
+            continue
+        chunk.append((line_number, record))
+        if len(chunk) >= batch_size:
+            _insert_chunk(chunk, report)
+            report["batches"] += 1
+            chunk = []
+    if chunk:
+        _insert_chunk(chunk, report)
+        report["batches"] += 1
+
+    report["seconds"] = time.perf_counter() - started
+    report["rows_per_second"] = report["imported"] / report["seconds"] if report["seconds"] else 0.0
+    return report
+
+
+def import_file(path: str, batch_size: int = DEFAULT_BATCH_SIZE) -> dict:
+    """Import a .csv or .jsonl file; see import_patients for the report format"""
+    return import_patients(read_rows(path), batch_size)
+
+
+def write_rejects(path: str, rejected: list):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["line", "reason"])
+        writer.writerows(rejected)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import patients from CSV or JSON Lines")
+    parser.add_argument("path", help="input file (.csv, .jsonl or .ndjson)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"rows per transaction (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--rejects", help="write rejected rows (line, reason) to this CSV file")
+    args = parser.parse_args()
+
+    report = import_file(args.path, args.batch_size)
+    print(f"Read {report['total']} rows: {report['imported']} imported, {len(report['rejected'])} rejected "
+          f"in {report['seconds']:.2f}s ({report['rows_per_second']:.0f} rows/s, {report['batches']} batches)")
+    for line_number, reason in report["rejected"][:20]:
+        print(f"  line {line_number}: {reason}")
+    if len(report["rejected"]) > 20:
+        print(f"  ... {len(report['rejected']) - 20} more")
+    if args.rejects:
+        write_rejects(args.rejects, report["rejected"])
+        print(f"Rejected rows written to {args.rejects}")
@@ -0,0 +1,101 @@
+"""
+Prefetch a role's dashboard datasets while the dashboard is being built.
+
+As soon as sign-in succeeds, login.py starts every query the first dashboard screen needs
+on the worker pool (each on its own pooled connection) and attaches the handle to the page.
+The dashboards then read those results with prefetched() instead of querying one after the
+other; anything not prefetched, or anything read a second time, falls back to a normal query.
+"""
+import time
+
+from database import (get_all_appointments, get_patients_page, get_dashboard_stats, get_dashboard_trends,
+                      get_recent_staff, DASHBOARD_RECENT_LIMIT)
+from utils.async_db import run_async
+
+# role -> {dataset name: loader(user)}. Names are what the dashboards pass to prefetched().
+DASHBOARD_DATASETS = {
+    "HR": {
+        "stats": lambda user: get_dashboard_stats(),
+        "trends": lambda user: get_dashboard_trends(),
+        "recent_appointments": lambda user: get_all_appointments(limit=DASHBOARD_RECENT_LIMIT),
+    },
+    "Doctor": {
+        "appointments": lambda user: get_all_appointments(doctor_id=str(user["user_id"]), view="list"),
+        "assigned_patients": lambda user: get_patients_page(assigned_doctor=str(user["user_id"]), view="summary"),
+        "unassigned_patients": lambda user: get_patients_page(unassigned=True, view="summary"),
+    },
+    "Admin": {
+        "stats": lambda user: get_dashboard_stats(),
+        "recent_doctors": lambda user: get_recent_staff("Doctor"),
+        "recent_hrs": lambda user: get_recent_staff("HR"),
+    },
+}
+
+
+class DashboardPrefetch:
+    """Futures for one sign-in's dashboard datasets, plus the timings reported once the dashboard is up"""
+
+    def __init__(self, role, user, started=None):
+        self.role = role
+        self.started = started if started is not None else time.perf_counter()
+        self.timings = {}
+        self._futures = {}
+        for name, loader in DASHBOARD_DATASETS.get(role, {}).items():
+            self._futures[name] = run_async(self._timed, name, loader, user)
+
+    def _timed(self, name, loader, user):
+        started = time.perf_counter()
+        try:
+            return loader(user)
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    def take(self, name, loader, *args, **kwargs):
+        """
+        Return the prefetched result for `name` (waiting for it if still running) and forget it,
+        so a later refresh queries again. Falls back to loader(*args, **kwargs) if the dataset was
+        not prefetched, failed, or has not started yet.
+        """
+        future = self._futures.pop(name, None)
+        # A queued task is run inline rather than waited on: the caller may itself be a pool worker
+        if future is not None and not future.cancel():
+            try:
+                return future.result()
+            except Exception as e:
+                print(f"Error prefetching {name}: {e}")
+        return loader(*args, **kwargs)
+
+    def report(self):
+        """Time from sign-in to now, and how long each dataset took to load"""
+        return {
+            "role": self.role,
+            "time_to_dashboard": time.perf_counter() - self.started,
+            "datasets": dict(self.timings),
+        }
+
+
+def start_prefetch(page, role, user, started=None):
+    """Start loading the role's dashboard datasets and attach the handle to the page"""
+    page.dashboard_prefetch = DashboardPrefetch(role, user, started)
+    return page.dashboard_prefetch
+
+
+def prefetched(page, name, loader, *args, **kwargs):
+    """Dashboard-side accessor: the prefetched dataset if there is one, otherwise loader(*args, **kwargs)"""
+    prefetch = getattr(page, "dashboard_prefetch", None)
+    if prefetch is None:
+        return loader(*args, **kwargs)
+    return prefetch.take(name, loader, *args, **kwargs)
+
+
+def report_time_to_dashboard(page):
+    """Print and return the time-to-first-dashboard for the current sign-in, then drop the prefetch handle"""
+    prefetch = getattr(page, "dashboard_prefetch", None)
+    if prefetch is None:
+        return None
+    page.dashboard_prefetch = None
+    report = prefetch.report()
+    datasets = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in sorted(report["datasets"].items()))
+    print(f"[PERF] {report['role']} dashboard ready {report['time_to_dashboard'] * 1000:.0f}ms after sign-in"
+          f" (prefetched: {datasets or 'none'})")
+    return report
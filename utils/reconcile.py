@@ -0,0 +1,80 @@
+"""
+Keyed reconciliation for card grids.
+
+Refreshing a grid by assigning a freshly built list of cards makes page.update() re-send every
+card to the client. reconcile_grid() instead remembers, per grid, the card built for each
+record key together with the row version (updated_at) it was built from. On the next refresh
+unchanged records keep their existing control, which Flet does not re-send; only new or
+changed records are built, and records that disappeared are dropped from the list.
+
+Each call returns counters (kept / added / changed / removed, and how many controls had to
+be built and sent), and publish_update() adds how long page.update() took, so the cost of
+every refresh can be read from the log.
+"""
+import time
+
+import flet as ft
+
+
+def count_controls(control) -> int:
+    """Number of controls in a control tree (a proxy for its serialised size)"""
+    if control is None:
+        return 0
+    total = 1
+    content = getattr(control, "content", None)
+    if isinstance(content, ft.Control):
+        total += count_controls(content)
+    for child in getattr(control, "controls", None) or []:
+        total += count_controls(child)
+    return total
+
+
+def row_version(row: dict):
+    """Default row version: the updated_at watermark, falling back to the whole row"""
+    version = row.get("updated_at")
+    return version if version is not None else tuple(sorted((k, str(v)) for k, v in row.items()))
+
+
+def reconcile_grid(grid, rows, key, build, version=row_version, empty=None) -> dict:
+    """
+    Make grid.controls show one card per row, in order, reusing cards whose key and version
+    are unchanged. `build(row)` creates a card, `empty()` the placeholder for no rows.
+    Returns: {"kept", "added", "changed", "removed", "controls_sent"}
+    """
+    previous = getattr(grid, "keyed_cards", None) or {}
+    cards = {}
+    controls = []
+    stats = {"kept": 0, "added": 0, "changed": 0, "removed": 0, "controls_sent": 0}
+    for row in rows:
+        row_key, row_ver = key(row), version(row)
+        if row_key in cards:
+            continue
+        entry = previous.get(row_key)
+        if entry is not None and entry[0] == row_ver:
+            card = entry[1]
+            stats["kept"] += 1
+        else:
+            card = build(row)
+            stats["changed" if entry is not None else "added"] += 1
+            stats["controls_sent"] += count_controls(card)
+        cards[row_key] = (row_ver, card)
+        controls.append(card)
+    stats["removed"] = len(previous.keys() - cards.keys())
+
+    if not controls and empty is not None:
+        placeholder = empty()
+        stats["controls_sent"] += count_controls(placeholder)
+        controls = [placeholder]
+    grid.keyed_cards = cards
+    grid.controls = controls
+    return stats
+
+
+def publish_update(page, label: str, stats: dict) -> dict:
+    """page.update() after a reconcile, logging its counters and how long the update took"""
+    started = time.perf_counter()
+    page.update()
+    stats["seconds"] = time.perf_counter() - started
+    print(f"[PERF] {label}: {stats['added']} added, {stats['changed']} changed, {stats['removed']} removed, "
+          f"{stats['kept']} kept; {stats['controls_sent']} controls sent, update {stats['seconds'] * 1000:.0f}ms")
+    return stats
@@ -0,0 +1,73 @@
+"""
+Change-watermark polling shared by every screen of a session.
+
+A session has one ChangeRefresher (page.change_refresher) watching at most one table at a time.
+Every `interval` seconds it runs database.get_change_probe(); only when MAX(updated_at) or
+COUNT(*) moved does it call the screen back with the previous watermark, so the screen can
+fetch just the rows changed since then. Opening another screen replaces the watch and
+leaving it calls stop(), so no polling outlives the tab that asked for it.
+"""
+import threading
+
+from database import get_change_probe
+
+REFRESH_INTERVAL = 5  # seconds between change probes
+
+
+class ChangeRefresher:
+    def __init__(self, interval=REFRESH_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stop_event = None
+
+    def watch(self, table, on_change, baseline=None):
+        """
+        Poll `table` until stop() or the next watch(), calling on_change(since, probe) from the
+        polling thread whenever it changed. `since` is the previous MAX(updated_at) and `probe`
+        the new (MAX(updated_at), COUNT(*)). `baseline` is the probe taken before the screen read
+        its rows (probe first, then read, so nothing written in between is missed); without it
+        the first poll probes when the thread starts.
+        """
+        stop_event = threading.Event()
+        with self._lock:
+            if self._stop_event is not None:
+                self._stop_event.set()
+            self._stop_event = stop_event
+        threading.Thread(target=self._poll, args=(table, on_change, stop_event, baseline),
+                         name=f"nexacare-refresh-{table}", daemon=True).start()
+
+    def stop(self):
+        with self._lock:
+            if self._stop_event is not None:
+                self._stop_event.set()
+                self._stop_event = None
+
+    def _poll(self, table, on_change, stop_event, baseline=None):
+        last = baseline if baseline is not None else get_change_probe(table)
+        while not stop_event.wait(self.interval):
+            probe = get_change_probe(table)
+            if stop_event.is_set():
+                break
+            if probe is None or probe == last:
+                continue
+            since = last[0] if last else None
+            last = probe
+            try:
+                on_change(since, probe)
+            except Exception as e:
+                print(f"Error refreshing {table}: {e}")
+
+
+def get_refresher(page) -> ChangeRefresher:
+    """The session's refresher, created on first use"""
+    refresher = getattr(page, "change_refresher", None)
+    if refresher is None:
+        refresher = page.change_refresher = ChangeRefresher()
+    return refresher
+
+
+def stop_refresher(page):
+    """Stop polling for this session, if anything is being watched"""
+    refresher = getattr(page, "change_refresher", None)
+    if refresher is not None:
+        refresher.stop()
@@ -0,0 +1,24 @@
+"""
+Backfill job for the daily_rollups summary table.
+
+    python -m utils.rollups [--since YYYY-MM-DD]
+
+Normal writes keep the rollups current; run this after bulk changes made outside the app
+(manual SQL, restores) or to repair history. Without --since every day is rebuilt.
+"""
+import argparse
+import time
+
+from database import rebuild_rollups, get_rollup_trends, DASHBOARD_TRENDS
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the daily rollup table from patients and appointments")
+    parser.add_argument("--since", help="only rebuild days from this date (YYYY-MM-DD) onwards")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    success, message = rebuild_rollups(args.since)
+    print(f"{message} in {time.perf_counter() - started:.2f}s")
+    if success:
+        for name, trend in get_rollup_trends(DASHBOARD_TRENDS).items():
+            print(f"  {name}: {'n/a' if trend is None else f'{trend:+.1f}%'}")